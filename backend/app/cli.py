@@ -0,0 +1,394 @@
+"""
+Bulk Analysis CLI
+Analyzes a directory, zip or tar archive of resumes offline and streams the results to JSONL or Parquet
+
+Usage (from backend/):
+    python -m app.cli analyze resumes/ -o results.jsonl [--workers 8] [--batch-size 100] [--top-k 3]
+    python -m app.cli analyze archive.tar.gz -o results.parquet
+    python -m app.cli analyze resumes/ -o results.jsonl --index   # also store them for /match
+
+Rerunning an interrupted command resumes after the last checkpoint.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from app.models.schemas import BatchItemResult
+from app.services.metrics import timed, collect_observations, record_observations, STAGE_SECONDS
+from app.services.pdf_extractor import FileSource
+from app.services.pipeline import prepare_resume as extract_and_parse, classify_resumes, resume_index_item
+from app.config import MODEL_TRAIN_IF_MISSING
+from app.ml.classifier import load_classifier, ModelNotAvailableError
+from app.ml.matcher import add_resumes, get_match_index, MatchIndexNotAvailableError
+
+
+RESUME_FILE_TYPES = ('.pdf', '.docx', '.txt')
+# Resumes submitted to the pool but not yet written, per worker
+PENDING_PER_WORKER = 4
+
+
+# Input
+
+def iter_resume_files(path: str, skip: int = 0) -> Iterator[Tuple[int, str, str, FileSource]]:
+    """
+    Yield every PDF/DOCX/TXT resume of a directory, zip or tar archive in a stable order
+
+    Directory files are passed as paths and archive members are read one at a
+    time, so memory use does not depend on the size of the input.
+
+    Args:
+        path: Directory, zip archive or tar archive (optionally compressed)
+        skip: Number of leading resumes to skip without reading them (already processed)
+
+    Yields:
+        (index, source, lowercased file name, content as bytes or a path)
+    """
+    if os.path.isdir(path):
+        index = 0
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if not name.lower().endswith(RESUME_FILE_TYPES):
+                    continue
+                if index >= skip:
+                    file_path = os.path.join(root, name)
+                    yield index, os.path.relpath(file_path, path), name.lower(), file_path
+                index += 1
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            members = [
+                info for info in archive.infolist()
+                if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+                and info.filename.lower().endswith(RESUME_FILE_TYPES)
+            ]
+            for index, info in enumerate(members[skip:], start=skip):
+                yield index, info.filename, info.filename.lower(), archive.read(info)
+    elif tarfile.is_tarfile(path):
+        # Streaming mode: members are read in archive order without seeking back
+        with tarfile.open(path, "r|*") as archive:
+            index = 0
+            for member in archive:
+                if not member.isfile() or not member.name.lower().endswith(RESUME_FILE_TYPES):
+                    continue
+                if index >= skip:
+                    yield index, member.name, member.name.lower(), archive.extractfile(member).read()
+                index += 1
+    else:
+        raise ValueError(f"Input must be a directory, zip or tar archive: {path}")
+
+
+# Worker
+
+def prepare_resume(filename: str, content: FileSource) -> Tuple[Optional[str], Optional[dict], Optional[str], List[tuple]]:
+    """
+    Extract and parse one resume (runs on a worker process)
+
+    Errors are returned rather than raised so one bad file never stops the run.
+
+    Returns:
+        (text, parsed_data, error, metric observations)
+    """
+    try:
+        (text, parsed_data), observations = collect_observations(extract_and_parse, filename, content)
+        return text, parsed_data, None, observations
+    except Exception as e:
+        return None, None, f"Failed to analyze resume: {str(e)}", getattr(e, "metric_observations", [])
+
+
+# Output
+
+PARQUET_COLUMNS = [
+    ("index", "int64"), ("source", "string"), ("error", "string"),
+    ("name", "string"), ("email", "string"), ("phone", "string"),
+    ("skills", "list<string>"), ("education", "list<string>"),
+    ("experience_years", "float64"), ("relevant_experience_years", "float64"),
+    ("other_experience_years", "float64"), ("experience_level", "string"),
+    ("classification", "string"), ("confidence", "float64"),
+    # Nested lists of dicts are stored as JSON strings
+    ("experience_breakdown", "json"), ("top_categories", "json"),
+]
+
+
+class JsonlResultWriter:
+    """One BatchItemResult JSON object per line; the position is the file size in bytes"""
+
+    def __init__(self, path: str, position: int = 0):
+        self._file = open(path, 'r+b' if position else 'wb')
+        # Drop anything written after the last checkpoint
+        self._file.truncate(position)
+        self._file.seek(position)
+
+    def write(self, rows: List[dict]) -> int:
+        for row in rows:
+            self._file.write((json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetResultWriter:
+    """A directory of part files, one per batch; the position is the number of parts"""
+
+    def __init__(self, path: str, position: int = 0):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet output needs pyarrow (pip install pyarrow)")
+        self._pa, self._pq = pa, pq
+        types = {
+            "int64": pa.int64(), "float64": pa.float64(), "string": pa.string(),
+            "json": pa.string(), "list<string>": pa.list_(pa.string()),
+        }
+        self._schema = pa.schema([(name, types[kind]) for name, kind in PARQUET_COLUMNS])
+        self._path = path
+        self._position = position
+
+        os.makedirs(path, exist_ok=True)
+        # Drop parts written after the last checkpoint
+        for name in os.listdir(path):
+            if name.startswith("part-") and name.endswith(".parquet") and int(name[5:-8]) >= position:
+                os.remove(os.path.join(path, name))
+
+    def write(self, rows: List[dict]) -> int:
+        columns = {name: [] for name, _ in PARQUET_COLUMNS}
+        for row in rows:
+            result = row["result"] or {}
+            for name, kind in PARQUET_COLUMNS:
+                value = row[name] if name in ("index", "source", "error") else result.get(name)
+                if kind == "json" and value is not None:
+                    value = json.dumps(value, ensure_ascii=False)
+                columns[name].append(value)
+        table = self._pa.table(columns, schema=self._schema)
+
+        part_path = os.path.join(self._path, f"part-{self._position:05d}.parquet")
+        self._pq.write_table(table, part_path + ".tmp")
+        os.replace(part_path + ".tmp", part_path)
+        self._position += 1
+        return self._position
+
+    def close(self):
+        pass
+
+
+RESULT_WRITERS = {
+    "jsonl": JsonlResultWriter,
+    "parquet": ParquetResultWriter,
+}
+
+
+# Checkpoints
+
+def load_checkpoint(path: str, input_path: str, output_format: str) -> Optional[dict]:
+    """Read a checkpoint left by an interrupted run of the same command, if any"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("input") != input_path or checkpoint.get("format") != output_format:
+        raise ValueError(
+            f"Checkpoint {path} belongs to a different run "
+            f"({checkpoint.get('input')} -> {checkpoint.get('format')}); use --restart to discard it"
+        )
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    """Replace the checkpoint atomically so a crash never leaves a partial file"""
+    with open(path + ".tmp", "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+# Pipeline
+
+def classify_batch(batch: List[tuple], top_k: int, index_resumes: bool = False) -> List[dict]:
+    """Classify the parsed resumes of a batch in one model call and build output rows (and store them for matching)"""
+    ok = [item for item in batch if item[4] is None]
+    with timed("classify"):
+        responses = classify_resumes([item[2] for item in ok], [item[3] for item in ok], top_k)
+    classified = dict(zip((item[0] for item in ok), responses))
+
+    rows = []
+    analyzed = []
+    for index, source, text, parsed_data, error in batch:
+        if error is not None:
+            item = BatchItemResult(index=index, source=source, error=error)
+        else:
+            response = classified[index]
+            analyzed.append(resume_index_item(text, response))
+            item = BatchItemResult(index=index, source=source, result=response)
+        rows.append(jsonable_encoder(item))
+    if index_resumes and analyzed:
+        with timed("match.index"):
+            add_resumes(analyzed)
+    return rows
+
+
+def analyze_directory(
+    input_path: str,
+    output_path: str,
+    output_format: str = "jsonl",
+    workers: int = 0,
+    batch_size: int = 100,
+    top_k: int = 0,
+    checkpoint_path: Optional[str] = None,
+    restart: bool = False,
+    index_resumes: bool = False
+) -> dict:
+    """
+    Analyze every resume of a directory or archive and stream the results to a file
+
+    Extraction and parsing run on a process pool; each batch is classified in
+    one model call, written, and checkpointed before the next one.
+
+    Args:
+        input_path: Directory, zip or tar archive of PDF/DOCX/TXT resumes
+        output_path: JSONL file, or directory of Parquet part files
+        output_format: "jsonl" or "parquet"
+        workers: Worker processes (0 for one per CPU)
+        batch_size: Resumes classified, written and checkpointed together
+        top_k: Number of ranked categories to include per resume
+        checkpoint_path: Checkpoint file (default: output_path + ".checkpoint")
+        restart: Ignore an existing checkpoint and start over
+        index_resumes: Also store analyzed resumes in the match index (MATCH_INDEX_DIR)
+
+    Returns:
+        Run summary: processed (this run), succeeded and failed (whole output), skipped, seconds
+    """
+    input_path = os.path.abspath(input_path)
+    if not os.path.exists(input_path):
+        raise ValueError(f"Input not found: {input_path}")
+    checkpoint_path = checkpoint_path or output_path.rstrip(os.sep) + ".checkpoint"
+    checkpoint = None if restart else load_checkpoint(checkpoint_path, input_path, output_format)
+    checkpoint = checkpoint or {"input": input_path, "format": output_format, "items": 0, "position": 0, "succeeded": 0, "failed": 0}
+    skipped = checkpoint["items"]
+    if skipped:
+        print(f"Resuming after {skipped} resumes from {checkpoint_path}", file=sys.stderr)
+
+    # Fail before any work if there is no model (or no match index to fill)
+    load_classifier(train_if_missing=MODEL_TRAIN_IF_MISSING)
+    if index_resumes:
+        get_match_index(build_if_missing=True)
+
+    workers = workers or os.cpu_count() or 1
+    writer = RESULT_WRITERS[output_format](output_path, checkpoint["position"])
+    start = time.perf_counter()
+
+    def flush(batch: List[tuple]):
+        rows = classify_batch(batch, top_k, index_resumes)
+        checkpoint["position"] = writer.write(rows)
+        checkpoint["items"] += len(rows)
+        failed = sum(1 for row in rows if row["error"] is not None)
+        checkpoint["failed"] += failed
+        checkpoint["succeeded"] += len(rows) - failed
+        save_checkpoint(checkpoint_path, checkpoint)
+        processed = checkpoint["items"] - skipped
+        print(f"{checkpoint['items']} resumes written ({processed / (time.perf_counter() - start):.1f} docs/s)", file=sys.stderr)
+
+    # spawn matches the server's process pool and avoids forking loaded models
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        # Results are consumed in input order; the window bounds memory to a few resumes per worker
+        pending = deque()
+        batch = []
+
+        def collect():
+            index, source, future = pending.popleft()
+            text, parsed_data, error, observations = future.result()
+            record_observations(observations)
+            batch.append((index, source, text, parsed_data, error))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch.clear()
+
+        for index, source, filename, content in iter_resume_files(input_path, skipped):
+            pending.append((index, source, pool.submit(prepare_resume, filename, content)))
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                collect()
+        while pending:
+            collect()
+        if batch:
+            flush(batch)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        writer.close()
+
+    # A finished run leaves no checkpoint behind, so the next run starts over
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return {
+        "processed": checkpoint["items"] - skipped,
+        "succeeded": checkpoint["succeeded"],
+        "failed": checkpoint["failed"],
+        "skipped": skipped,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def print_report(summary: dict):
+    """Print throughput and per-stage timings of a run"""
+    seconds = summary["seconds"]
+    print(
+        f"\n{summary['processed']} resumes in {seconds:.1f}s "
+        f"({summary['processed'] / seconds if seconds else 0.0:.1f} docs/s); "
+        f"{summary['succeeded'] + summary['failed']} in the output: "
+        f"{summary['succeeded']} succeeded, {summary['failed']} failed"
+    )
+    print(f"{'stage':<28}{'count':>8}{'mean ms':>10}{'total s':>10}")
+    for (stage,), (count, total) in sorted(STAGE_SECONDS.totals().items()):
+        print(f"{stage:<28}{count:>8}{total / count * 1000:>10.2f}{total:>10.2f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Offline resume analysis")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyze = commands.add_parser("analyze", help="Analyze a directory, zip or tar archive of resumes")
+    analyze.add_argument("input", help="Directory, .zip or .tar(.gz/.bz2/.xz) of PDF/DOCX/TXT resumes")
+    analyze.add_argument("-o", "--output", required=True, help="Output .jsonl file or Parquet directory")
+    analyze.add_argument("--format", choices=sorted(RESULT_WRITERS), help="Output format (default: from the output extension, else jsonl)")
+    analyze.add_argument("--workers", type=int, default=0, help="Worker processes (default: one per CPU)")
+    analyze.add_argument("--batch-size", type=int, default=100, help="Resumes classified and checkpointed together")
+    analyze.add_argument("--top-k", type=int, default=0, help="Number of ranked categories per resume")
+    analyze.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    analyze.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    analyze.add_argument("--index", action="store_true", help="Also store the analyzed resumes in the match index (MATCH_INDEX_DIR)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ("parquet" if args.output.rstrip(os.sep).endswith(".parquet") else "jsonl")
+    try:
+        summary = analyze_directory(
+            args.input,
+            args.output,
+            output_format=output_format,
+            workers=args.workers,
+            batch_size=max(1, args.batch_size),
+            top_k=max(0, args.top_k),
+            checkpoint_path=args.checkpoint,
+            restart=args.restart,
+            index_resumes=args.index
+        )
+    except KeyboardInterrupt:
+        print("\nInterrupted; rerun the same command to resume from the last checkpoint", file=sys.stderr)
+        sys.exit(130)
+    except (ValueError, ModelNotAvailableError, MatchIndexNotAvailableError) as e:
+        parser.error(str(e))
+    print_report(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Application Configuration
+Runtime settings read from environment variables
+"""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return float(value)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean setting (1/true/yes/on) from the environment"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_list(name: str, default: str) -> tuple:
+    """Read a comma-separated setting from the environment"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        value = default
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+# Batch analysis
+# Maximum number of resumes (files, archive members and text blobs) in one batch
+BATCH_MAX_ITEMS = _env_int("BATCH_MAX_ITEMS", 500)
+
+# Executors
+# Threads for I/O-ish work (file reads, archive expansion, classification)
+EXECUTOR_THREAD_WORKERS = _env_int("EXECUTOR_THREAD_WORKERS", 4)
+# Worker processes for CPU-bound extraction and parsing; 0 runs them on the thread pool
+EXECUTOR_PROCESS_WORKERS = _env_int("EXECUTOR_PROCESS_WORKERS", 0)
+# Queued + running stage tasks allowed before requests are rejected with 429
+EXECUTOR_MAX_PENDING = _env_int("EXECUTOR_MAX_PENDING", 32)
+
+# Per-stage timeouts in seconds (0 disables the timeout)
+STAGE_TIMEOUTS = {
+    "extract": _env_float("STAGE_TIMEOUT_EXTRACT", 30.0),
+    "parse": _env_float("STAGE_TIMEOUT_PARSE", 15.0),
+    "classify": _env_float("STAGE_TIMEOUT_CLASSIFY", 10.0),
+    "match": _env_float("STAGE_TIMEOUT_MATCH", 10.0),
+}
+
+# Result cache
+RESULT_CACHE_ENABLED = _env_bool("RESULT_CACHE_ENABLED", True)
+# In-process LRU tier
+RESULT_CACHE_MAX_ENTRIES = _env_int("RESULT_CACHE_MAX_ENTRIES", 1024)
+RESULT_CACHE_TTL = _env_float("RESULT_CACHE_TTL", 3600.0)
+# Optional SQLite tier that survives restarts; empty disables it
+RESULT_CACHE_DB_PATH = os.getenv("RESULT_CACHE_DB_PATH", "")
+RESULT_CACHE_DB_TTL = _env_float("RESULT_CACHE_DB_TTL", 7 * 24 * 3600.0)
+
+# Near-duplicate detection
+# Look up every analyzed resume in a MinHash/LSH index of the resumes seen before
+DEDUP_ENABLED = _env_bool("DEDUP_ENABLED", False)
+# SQLite file of the index; empty keeps it in memory until restart
+DEDUP_DB_PATH = os.getenv("DEDUP_DB_PATH", "")
+# Estimated Jaccard similarity of word shingles from which resumes count as near-duplicates
+DEDUP_THRESHOLD = _env_float("DEDUP_THRESHOLD", 0.8)
+# Borrow the cached classification of a near-duplicate at least this similar
+# instead of running the model (0 disables reuse)
+DEDUP_REUSE_THRESHOLD = _env_float("DEDUP_REUSE_THRESHOLD", 0.0)
+
+# Classifier
+# Model artifact to serve: "auto" uses the compact export when it matches resume_classifier.joblib,
+# "compact" always prefers the compact export, "joblib" always loads the full pipeline
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "auto").strip().lower()
+# Train a model during startup warm-up when none exists (requests never train; without this they get 503)
+MODEL_TRAIN_IF_MISSING = _env_bool("MODEL_TRAIN_IF_MISSING", False)
+# Seconds before a failed warm-up is retried, doubling after each failure up to WARMUP_RETRY_MAX_DELAY
+WARMUP_RETRY_DELAY = _env_float("WARMUP_RETRY_DELAY", 5.0)
+WARMUP_RETRY_MAX_DELAY = _env_float("WARMUP_RETRY_MAX_DELAY", 300.0)
+# Directory of versioned models (<dir>/<version>/ plus ACTIVE and SHADOW pointer files);
+# empty serves app/ml/resume_classifier.joblib
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "")
+# Seconds between checks for a new model (registry pointers or model file); 0 disables hot reload
+MODEL_WATCH_INTERVAL = _env_float("MODEL_WATCH_INTERVAL", 10.0)
+# Fraction of classified resumes also scored by the shadow model (0 disables shadow scoring)
+SHADOW_SAMPLE_RATE = _env_float("SHADOW_SAMPLE_RATE", 0.0)
+# Shadow batches queued before further samples are dropped
+SHADOW_MAX_PENDING = _env_int("SHADOW_MAX_PENDING", 8)
+
+# Resume/job matching
+# Directory of the match index (projection plus resume and job vectors); empty disables /match
+MATCH_INDEX_DIR = os.getenv("MATCH_INDEX_DIR", "")
+# Vector dimensions (SVD components) of a newly built index
+MATCH_INDEX_DIM = _env_int("MATCH_INDEX_DIM", 128)
+# Add every resume analyzed by /analyze and /analyze/batch to the index
+MATCH_INDEX_ANALYZED = _env_bool("MATCH_INDEX_ANALYZED", True)
+# Largest top_n accepted by the /match endpoints
+MATCH_MAX_RESULTS = _env_int("MATCH_MAX_RESULTS", 100)
+
+# Admin endpoints
+# Token expected in the X-Admin-Token header; empty disables /admin
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Resume parsing
+# Optional skill vocabulary file (one skill per line) replacing the built-in list
+SKILLS_VOCAB_PATH = os.getenv("SKILLS_VOCAB_PATH", "")
+# spaCy model used for the NER fallback in name extraction
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+# Disable to skip NER entirely (names then come from line heuristics only)
+SPACY_NER_ENABLED = _env_bool("SPACY_NER_ENABLED", True)
+
+# File extraction
+# Pages read from a PDF at most; later pages are ignored (0 for no limit)
+PDF_MAX_PAGES = _env_int("PDF_MAX_PAGES", 20)
+# Largest PDF accepted, in bytes (0 for no limit)
+PDF_MAX_BYTES = _env_int("PDF_MAX_BYTES", 20 * 1024 * 1024)
+# PDF text backends tried in order; later ones are fallbacks for empty or garbled text
+# (available: pypdfium2, pdfminer, pdfplumber)
+PDF_BACKENDS = _env_list("PDF_BACKENDS", "pypdfium2,pdfplumber")
+# Stop reading pages once this many characters were extracted (0 reads every page)
+PDF_TARGET_CHARS = _env_int("PDF_TARGET_CHARS", 30000)
+# Uploads larger than this are spooled to a temp file instead of held in memory
+UPLOAD_SPOOL_THRESHOLD = _env_int("UPLOAD_SPOOL_THRESHOLD", 1024 * 1024)
+
+# Input limits (0 for no limit)
+# Request bodies larger than this are cut off with 413 while they stream in
+REQUEST_MAX_BYTES = _env_int("REQUEST_MAX_BYTES", 25 * 1024 * 1024)
+# Body limit of /analyze/batch requests
+BATCH_REQUEST_MAX_BYTES = _env_int("BATCH_REQUEST_MAX_BYTES", 200 * 1024 * 1024)
+# Largest uploaded PDF, DOCX or TXT file; zip archives are bounded by the batch body limit
+UPLOAD_MAX_BYTES = _env_int("UPLOAD_MAX_BYTES", 20 * 1024 * 1024)
+# Longest resume or job description text accepted as form input
+TEXT_MAX_CHARS = _env_int("TEXT_MAX_CHARS", 100000)
+
+# Metrics
+# Add a Server-Timing header with the per-stage breakdown to every response
+SERVER_TIMING_ENABLED = _env_bool("SERVER_TIMING_ENABLED", False)
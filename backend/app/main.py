@@ -1,11 +1,21 @@
 import os
+import time
 import asyncio
 import httpx
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import analyze
-from app.models.schemas import HealthResponse
+from app.config import SERVER_TIMING_ENABLED, MODEL_WATCH_INTERVAL, REQUEST_MAX_BYTES, BATCH_REQUEST_MAX_BYTES
+from app.routers import analyze, admin, match
+from app.models.schemas import HealthResponse, ReadinessResponse
+from app.services.executor import get_executor, shutdown_executor
+from app.services.warmup import warm_up, get_readiness
+from app.services.model_watcher import watch_models
+from app.services.uploads import RequestSizeLimitMiddleware
+from app.services.metrics import (
+    HTTP_REQUESTS, HTTP_SECONDS, start_request_timings, stop_request_timings,
+    format_server_timing, render_metrics
+)
 
 
 # Self-ping to prevent Render free tier spin-down
@@ -30,11 +40,18 @@ async def keep_alive():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events"""
-    # Startup: Start keep-alive task
+    # Startup: Create stage executor pools, warm the models in the background
+    # (the app reports ready once done), watch for new model versions and start keep-alive task
+    executor = get_executor()
+    warmup_task = asyncio.create_task(warm_up(executor))
+    watch_task = asyncio.create_task(watch_models(MODEL_WATCH_INTERVAL))
     task = asyncio.create_task(keep_alive())
     yield
-    # Shutdown: Cancel keep-alive task
+    # Shutdown: Cancel background tasks and release executor pools
+    warmup_task.cancel()
+    watch_task.cancel()
     task.cancel()
+    shutdown_executor()
 
 
 app = FastAPI(
@@ -44,6 +61,14 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Cut off oversized request bodies while they stream in, before multipart parsing
+# spools them (added first so the 413 still gets CORS headers and request metrics)
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    max_bytes=REQUEST_MAX_BYTES,
+    path_limits={"/analyze/batch": BATCH_REQUEST_MAX_BYTES},
+)
+
 # CORS middleware for frontend connection
 # Read allowed origins from environment variable, default to all for dev
 cors_origins_env = os.getenv("CORS_ORIGINS", "*")
@@ -60,8 +85,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Count requests and their latency per route, and add Server-Timing when enabled"""
+    start = time.perf_counter()
+    timings, token = start_request_timings()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        stop_request_timings(token)
+        elapsed = time.perf_counter() - start
+        # Route templates keep label cardinality bounded; unmatched paths share one label
+        route = request.scope.get("route")
+        path = getattr(route, "path", "other")
+        HTTP_REQUESTS.inc(path=path, method=request.method, status=status)
+        HTTP_SECONDS.observe(elapsed, path=path)
+
+    if SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = format_server_timing(timings, elapsed)
+    return response
+
+
 # Include routers
 app.include_router(analyze.router, tags=["Resume Analysis"])
+app.include_router(match.router, tags=["Resume Matching"])
+app.include_router(admin.router, tags=["Admin"])
 
 
 @app.get("/", response_model=HealthResponse)
@@ -70,8 +121,33 @@ async def root():
     return HealthResponse()
 
 
-@app.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint"""
-    return HealthResponse(status="healthy", message="API is running")
+@app.get("/health/live", response_model=HealthResponse)
+async def liveness_check():
+    """Liveness: the process is up and serving, whether or not models are loaded"""
+    return HealthResponse(status="alive", message="API is running")
+
+
+@app.get("/health/ready", response_model=ReadinessResponse)
+@app.get("/health", response_model=ReadinessResponse)
+async def readiness_check(response: Response):
+    """Readiness: 200 once the models are loaded and warmed, 503 before that or if warm-up failed"""
+    readiness = get_readiness()
+    if not readiness.ready:
+        response.status_code = 503
+    messages = {
+        "starting": "Loading models",
+        "ready": "API is running",
+        "failed": "Model warm-up failed, retrying",
+    }
+    return ReadinessResponse(
+        status="healthy" if readiness.ready else readiness.status,
+        message=messages[readiness.status],
+        steps=readiness.steps,
+        error=readiness.error
+    )
+
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Stage timings, input and error counters in the Prometheus text format"""
+    return Response(content=render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
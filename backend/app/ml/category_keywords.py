@@ -0,0 +1,102 @@
+"""
+Category Keywords
+Precompiled word-boundary keyword matchers deciding which job titles are relevant to a category
+"""
+import os
+import re
+import json
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, List, Pattern
+
+
+# Keywords per classifier category, one JSON list per category
+CATEGORY_KEYWORDS_PATH = os.path.join(os.path.dirname(__file__), 'category_keywords.json')
+
+
+def load_category_keywords(path: str = CATEGORY_KEYWORDS_PATH) -> Dict[str, List[str]]:
+    """
+    Load the category keyword file
+
+    Args:
+        path: Path to a JSON object mapping category to a list of keywords
+
+    Returns:
+        Dict mapping category to keywords
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected an object mapping category to keywords")
+    for category, keywords in data.items():
+        if not isinstance(keywords, list) or not all(isinstance(kw, str) for kw in keywords):
+            raise ValueError(f"{path}: keywords for '{category}' must be a list of strings")
+    return data
+
+
+def compile_keyword_pattern(keywords: Iterable[str]) -> Pattern:
+    """
+    Compile keywords into one case-insensitive alternation
+
+    A keyword only matches as a whole word (optionally pluralized with "s"),
+    so "ai" no longer matches inside "maintenance". Spaces inside a keyword
+    match any run of spaces or tabs.
+    """
+    alternatives = sorted({kw.strip().lower() for kw in keywords if kw.strip()}, key=len, reverse=True)
+    if not alternatives:
+        return re.compile(r'(?!)')  # Matches nothing
+    body = '|'.join(re.escape(kw).replace(r'\ ', r'[ \t]+') for kw in alternatives)
+    return re.compile(r'(?<!\w)(?:' + body + r')s?(?!\w)', re.IGNORECASE)
+
+
+CATEGORY_KEYWORDS = load_category_keywords()
+_CATEGORY_PATTERNS = {category: compile_keyword_pattern(keywords) for category, keywords in CATEGORY_KEYWORDS.items()}
+
+
+@lru_cache(maxsize=64)
+def get_category_pattern(category: str) -> Pattern:
+    """Keyword pattern for a category; categories missing from the file match the words of their name"""
+    pattern = _CATEGORY_PATTERNS.get(category)
+    if pattern is None:
+        pattern = compile_keyword_pattern(re.split(r'[\s/]+', category))
+    return pattern
+
+
+def match_titles(category: str, titles: List[str]) -> List[bool]:
+    """
+    Decide which job titles belong to a category
+
+    All titles are scanned in a single regex pass over their newline-joined text.
+
+    Args:
+        category: Predicted classifier category
+        titles: Job titles from the experience breakdown
+
+    Returns:
+        One bool per title, True when the title has a keyword of the category
+    """
+    if not titles:
+        return []
+
+    starts = []
+    offset = 0
+    for title in titles:
+        starts.append(offset)
+        offset += len(title) + 1
+
+    matched = [False] * len(titles)
+    for match in get_category_pattern(category).finditer('\n'.join(titles)):
+        matched[bisect_right(starts, match.start()) - 1] = True
+    return matched
+
+
+def check_category_keywords(classes: Iterable[str]):
+    """Warn about classifier categories without keywords and keywords for unknown categories"""
+    classes = [str(c) for c in classes]
+    missing = [c for c in classes if c not in CATEGORY_KEYWORDS]
+    unknown = [c for c in CATEGORY_KEYWORDS if c not in classes]
+    if missing:
+        print(f"Warning: no category keywords for {', '.join(missing)}; falling back to words of the category name")
+    if unknown:
+        print(f"Warning: category keywords for unknown categories: {', '.join(unknown)}")
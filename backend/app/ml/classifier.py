@@ -3,27 +3,347 @@ Resume Classifier Service
 Loads trained model and provides classification functions
 """
 import os
+import threading
 import joblib
-from typing import Tuple
-from .train_classifier import train_model, get_all_categories as _get_all_categories
+import numpy as np
+from typing import List, NamedTuple, Optional, Tuple
+from .train_classifier import train_model, COMPACT_MODEL_DIR
+from .category_keywords import check_category_keywords
+from .compact_model import CompactClassifier, file_sha256, is_compact_model_current, META_FILE as COMPACT_META_FILE
+from .registry import ModelRegistry, UnknownModelVersionError, get_registry, ACTIVE_POINTER, SHADOW_POINTER
+from app.config import MODEL_FORMAT
+from app.services.metrics import timed
+from app.services.shadow import get_shadow_scorer
 
 
 # Path to the trained model
 MODEL_PATH = os.path.join(os.path.dirname(__file__), 'resume_classifier.joblib')
+# Metadata file of the compact export, written last
+COMPACT_META_PATH = os.path.join(COMPACT_MODEL_DIR, COMPACT_META_FILE)
 
 
-def get_classifier():
-    """Load or train the classifier model"""
+def _use_compact_model(model_path: str, compact_dir: str) -> bool:
+    """Whether MODEL_FORMAT and the files on disk select the compact export"""
+    if MODEL_FORMAT == "joblib":
+        return False
+    if MODEL_FORMAT == "compact":
+        if os.path.exists(os.path.join(compact_dir, COMPACT_META_FILE)):
+            return True
+        print(f"Warning: compact model not found at {compact_dir}, loading {model_path}")
+        return False
+    # auto: only an export of the current model file
+    return is_compact_model_current(compact_dir, model_path)
+
+
+class ModelNotAvailableError(Exception):
+    """Raised when no trained model exists and training was not allowed"""
+
+
+def get_classifier(train_if_missing: bool = False):
+    """
+    Load the compact export or the full model
+
+    Args:
+        train_if_missing: Train (and save) a model when neither exists; only
+            startup warm-up and offline tools do this, never a request
+
+    Raises:
+        ModelNotAvailableError: If there is no model and training is not allowed
+    """
+    if _use_compact_model(MODEL_PATH, COMPACT_MODEL_DIR):
+        return CompactClassifier(COMPACT_MODEL_DIR)
     if os.path.exists(MODEL_PATH):
         return joblib.load(MODEL_PATH)
-    else:
-        # Train if model doesn't exist
-        print("Model not found. Training new model...")
-        return train_model()
+    if not train_if_missing:
+        raise ModelNotAvailableError(
+            f"No trained model at {MODEL_PATH}; run `python -m app.ml.train_classifier` "
+            f"or start with MODEL_TRAIN_IF_MISSING=true"
+        )
+    print("Model not found. Training new model...")
+    return train_model()
+
+
+class LoadedModel(NamedTuple):
+    """A classifier with its version, swapped in as one reference so a prediction never mixes two models"""
+    model: object
+    version: str
+    # (mtime, size) of the model files it was loaded from (single-file mode only)
+    signature: Optional[tuple] = None
+
+
+# Served and shadow models; replaced by assignment, which readers see atomically
+_active: Optional[LoadedModel] = None
+_shadow: Optional[LoadedModel] = None
+# Serializes loads and swaps; predictions never take it once a model is active
+_model_lock = threading.Lock()
+
+# Exercises the vectorizer and model pages before a model is swapped in
+_WARMUP_TEXT = "Senior software engineer with Python, SQL and AWS experience"
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _model_file_signature() -> Optional[tuple]:
+    """Cheap change detector for the model file and the compact export"""
+    signatures = (_file_signature(MODEL_PATH), _file_signature(COMPACT_META_PATH))
+    return signatures if any(signatures) else None
+
+
+def _hash_model_file(model) -> str:
+    """Short content hash of a loaded model (the compact export's metadata or the model file)"""
+    path = COMPACT_META_PATH if isinstance(model, CompactClassifier) else MODEL_PATH
+    return file_sha256(path)[:12]
+
+
+def _prepare(model, version: str, signature: Optional[tuple] = None) -> LoadedModel:
+    """Check a freshly loaded model and run one prediction before it serves traffic"""
+    check_category_keywords(model.classes_)
+    model.predict_proba([_WARMUP_TEXT])
+    return LoadedModel(model, version, signature)
+
+
+def _load_registry_version(registry: ModelRegistry, version: str) -> LoadedModel:
+    """Load a published version, preferring its compact export as MODEL_FORMAT allows"""
+    model_path, compact_dir = registry.model_paths(version)
+    with timed("classify.load_model"):
+        if _use_compact_model(model_path, compact_dir):
+            model = CompactClassifier(compact_dir)
+        else:
+            model = joblib.load(model_path)
+    return _prepare(model, version)
+
 
+def _load_active_model(train_if_missing: bool = False) -> LoadedModel:
+    """Load the model to serve: the registry's ACTIVE version, or the single model file"""
+    registry = get_registry()
+    if registry is not None:
+        version = registry.active_version()
+        if version is None:
+            raise ModelNotAvailableError(
+                f"No active model version in {registry.root}; publish one with "
+                f"`python -m app.ml.train_classifier --publish VERSION --activate`"
+            )
+        return _load_registry_version(registry, version)
 
-# Load model at module import (singleton pattern)
-_classifier = None
+    with timed("classify.load_model"):
+        model = get_classifier(train_if_missing)
+    signature = _model_file_signature()
+    return _prepare(model, _hash_model_file(model) if signature else "untrained", signature)
+
+
+def _load_shadow_model(registry: ModelRegistry, version: Optional[str]) -> Optional[LoadedModel]:
+    """Load the shadow candidate; a broken candidate is reported but never affects serving"""
+    if version is None:
+        return None
+    try:
+        return _load_registry_version(registry, version)
+    except Exception as e:
+        print(f"Warning: shadow model {version} not loaded: {e}")
+        return None
+
+
+def _get_active_model(train_if_missing: bool = False) -> LoadedModel:
+    """Return the served model, loading it on first use"""
+    global _active, _shadow
+    loaded = _active
+    if loaded is not None:
+        return loaded
+
+    with _model_lock:
+        if _active is None:
+            _active = _load_active_model(train_if_missing)
+            registry = get_registry()
+            if registry is not None:
+                _shadow = _load_shadow_model(registry, registry.shadow_version())
+        return _active
+
+
+def load_classifier(train_if_missing: bool = False):
+    """
+    Load the classifier now instead of on the first prediction
+
+    Args:
+        train_if_missing: Train a model when none exists (see get_classifier)
+
+    Returns:
+        The loaded classifier
+    """
+    return _get_active_model(train_if_missing).model
+
+
+def get_model_version() -> str:
+    """
+    Version of the model currently used for classification
+
+    The registry version name, or in single-file mode a content hash of
+    resume_classifier.joblib (or of the compact export's metadata when that
+    is served).
+    """
+    return _get_active_model().version
+
+
+def get_shadow_model_version() -> Optional[str]:
+    """Version of the shadow model, or None when shadow scoring has no candidate"""
+    shadow = _shadow
+    return shadow.version if shadow is not None else None
+
+
+def _require_registry() -> ModelRegistry:
+    registry = get_registry()
+    if registry is None:
+        raise UnknownModelVersionError("No model registry is configured (set MODEL_REGISTRY_DIR)")
+    return registry
+
+
+def activate_model_version(version: str) -> Optional[str]:
+    """
+    Load a registry version and swap it in as the served model
+
+    The current model keeps serving while the new one loads. The ACTIVE
+    pointer is updated only once the new model has loaded and predicted,
+    so other processes watching the registry follow a working version.
+
+    Args:
+        version: Published version name
+
+    Returns:
+        The previously served version (None if nothing was loaded)
+
+    Raises:
+        UnknownModelVersionError: If there is no registry or no such version
+    """
+    global _active
+    registry = _require_registry()
+    with _model_lock:
+        loaded = _load_registry_version(registry, version)
+        registry.set_pointer(ACTIVE_POINTER, version)
+        previous, _active = _active, loaded
+    print(f"Activated model version {version} (was {previous.version if previous else None})")
+    return previous.version if previous else None
+
+
+def set_shadow_model_version(version: Optional[str]) -> Optional[str]:
+    """
+    Load a registry version as the shadow candidate, or clear it with None
+
+    Returns:
+        The previous shadow version
+
+    Raises:
+        UnknownModelVersionError: If there is no registry or no such version
+    """
+    global _shadow
+    registry = _require_registry()
+    with _model_lock:
+        loaded = _load_registry_version(registry, version) if version is not None else None
+        registry.set_pointer(SHADOW_POINTER, version)
+        previous, _shadow = _shadow, loaded
+    return previous.version if previous else None
+
+
+def refresh_models() -> List[str]:
+    """
+    Load and swap in models that changed on disk since they were loaded
+
+    Follows the registry's ACTIVE and SHADOW pointers, or in single-file
+    mode the model file's (mtime, size). Nothing is loaded before the
+    first model is; a failed load keeps the current model serving.
+
+    Returns:
+        Descriptions of the swaps made
+    """
+    global _active, _shadow
+    if _active is None:
+        return []
+
+    changes = []
+    registry = get_registry()
+    with _model_lock:
+        current = _active
+        try:
+            if registry is None:
+                signature = _model_file_signature()
+                # A loaded model keeps serving if its files are removed; only a replacement triggers a reload
+                if signature not in (current.signature, None):
+                    _active = _load_active_model()
+            else:
+                version = registry.active_version()
+                if version is not None and version != current.version:
+                    _active = _load_registry_version(registry, version)
+        except Exception as e:
+            print(f"Warning: model reload failed, still serving {current.version}: {e}")
+        if _active is not current:
+            changes.append(f"active {current.version} -> {_active.version}")
+
+        if registry is not None:
+            shadow_version = registry.shadow_version()
+            previous = _shadow.version if _shadow is not None else None
+            if shadow_version != previous:
+                _shadow = _load_shadow_model(registry, shadow_version)
+                changes.append(f"shadow {previous} -> {get_shadow_model_version()}")
+    return changes
+
+
+def list_model_versions() -> List[str]:
+    """Published registry versions (empty in single-file mode)"""
+    registry = get_registry()
+    return registry.versions() if registry is not None else []
+
+
+def predict_categories(texts: List[str], top_k: int = 0) -> List[dict]:
+    """
+    Classify resumes from a single probability matrix
+
+    Each text is vectorized once; the label, its confidence and the
+    optional top-k ranking all come from the same predict_proba row.
+
+    Args:
+        texts: Resume text contents
+        top_k: Number of ranked categories to include (0 for none)
+
+    Returns:
+        List of dicts with category, confidence, model_version and top_categories, in input order
+    """
+    if not texts:
+        return []
+
+    # One snapshot for the whole call: a concurrent swap cannot mix two models' outputs
+    loaded = _get_active_model()
+    classifier = loaded.model
+    classes = classifier.classes_
+
+    with timed("classify.predict"):
+        probabilities = classifier.predict_proba(texts)
+    best = probabilities.argmax(axis=1)
+    top_k = max(0, min(top_k, len(classes)))
+    ranked = np.argsort(-probabilities, axis=1, kind='stable')[:, :top_k]
+
+    results = []
+    for row, col in enumerate(best):
+        results.append({
+            "category": str(classes[col]),
+            "confidence": round(float(probabilities[row, col]), 2),
+            "model_version": loaded.version,
+            "top_categories": [
+                {"category": str(classes[k]), "probability": round(float(probabilities[row, k]), 4)}
+                for k in ranked[row]
+            ]
+        })
+
+    shadow = _shadow
+    if shadow is not None and shadow.version != loaded.version:
+        get_shadow_scorer().submit(
+            texts, [str(classes[col]) for col in best],
+            [float(probabilities[row, col]) for row, col in enumerate(best)],
+            loaded.version, shadow
+        )
+    return results
 
 
 def classify_resume(text: str) -> Tuple[str, float]:
@@ -36,19 +356,21 @@ def classify_resume(text: str) -> Tuple[str, float]:
     Returns:
         Tuple of (category, confidence)
     """
-    global _classifier
-    
-    if _classifier is None:
-        _classifier = get_classifier()
-    
-    # Get prediction
-    prediction = _classifier.predict([text])[0]
-    
-    # Get confidence (probability of predicted class)
-    probabilities = _classifier.predict_proba([text])[0]
-    confidence = max(probabilities)
-    
-    return prediction, round(confidence, 2)
+    result = predict_categories([text])[0]
+    return result["category"], result["confidence"]
+
+
+def classify_resumes(texts: List[str]) -> List[Tuple[str, float]]:
+    """
+    Classify many resumes with a single vectorized model call
+
+    Args:
+        texts: Resume text contents
+
+    Returns:
+        List of (category, confidence) tuples in input order
+    """
+    return [(result["category"], result["confidence"]) for result in predict_categories(texts)]
 
 
 def get_experience_level(years: float) -> str:
@@ -70,5 +392,5 @@ def get_experience_level(years: float) -> str:
 
 
 def get_all_categories() -> list:
-    """Get list of all classification categories from dataset"""
-    return _get_all_categories()
+    """Categories of the served model (read from the loaded model, never from the dataset)"""
+    return sorted(str(label) for label in _get_active_model().model.classes_)
@@ -0,0 +1,215 @@
+"""
+Compact Classifier Artifact
+Exports the TF-IDF + Logistic Regression pipeline as memory-mappable float32 arrays and serves predictions from them
+"""
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, List, Optional
+import numpy as np
+
+
+COMPACT_FORMAT_VERSION = 1
+META_FILE = "meta.json"
+VOCABULARY_FILE = "vocabulary.txt"
+# Arrays loaded with np.load(mmap_mode='r'), so worker processes share their pages
+ARRAY_FILES = ("idf.npy", "coef.npy", "intercept.npy")
+
+# Largest allowed difference between a probability of the compact model and the original pipeline
+PROBABILITY_TOLERANCE = 1e-4
+
+# Vectorizer parameters needed at inference time (training-only ones such as min_df are dropped)
+_ANALYZER_PARAMS = ("lowercase", "token_pattern", "ngram_range", "analyzer", "strip_accents")
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _uses_ovr(clf) -> bool:
+    """Whether predict_proba normalizes one-vs-rest sigmoids instead of a softmax"""
+    # SGDClassifier(loss='log_loss') is always one-vs-rest
+    if not hasattr(clf, "solver"):
+        return True
+    multi_class = getattr(clf, "multi_class", "auto")
+    if multi_class == "ovr":
+        return True
+    if multi_class == "multinomial":
+        return False
+    return len(clf.classes_) <= 2 or getattr(clf, "solver", "lbfgs") == "liblinear"
+
+
+class CompactClassifier:
+    """
+    Inference-only TF-IDF + Logistic Regression model read from an exported directory
+
+    Mirrors the predict_proba/classes_ interface of the sklearn pipeline.
+    """
+
+    def __init__(self, model_dir: str):
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        with open(os.path.join(model_dir, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("format_version") != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model format: {meta.get('format_version')}")
+        with open(os.path.join(model_dir, VOCABULARY_FILE), encoding='utf-8') as f:
+            terms = f.read().split('\n')
+
+        self.meta = meta
+        self.classes_ = np.array(meta["classes"], dtype=object)
+        self.idf, self.coef, self.intercept = (
+            np.load(os.path.join(model_dir, name), mmap_mode='r') for name in ARRAY_FILES
+        )
+        params = meta["vectorizer"]
+        # Counting with a fixed vocabulary reuses sklearn's tokenization exactly
+        self._counter = CountVectorizer(
+            vocabulary={term: index for index, term in enumerate(terms)},
+            stop_words=meta["stop_words"] or None,
+            ngram_range=tuple(params["ngram_range"]),
+            lowercase=params["lowercase"],
+            token_pattern=params["token_pattern"],
+            analyzer=params["analyzer"],
+            strip_accents=params["strip_accents"],
+            dtype=np.float32
+        )
+
+    def transform(self, texts: List[str]):
+        """TF-IDF features as a float32 CSR matrix"""
+        from sklearn.preprocessing import normalize
+
+        features = self._counter.transform(texts)
+        if self.meta["vectorizer"]["sublinear_tf"]:
+            np.log(features.data, features.data)
+            features.data += 1
+        features.data *= self.idf[features.indices]
+        if self.meta["vectorizer"]["norm"]:
+            features = normalize(features, norm=self.meta["vectorizer"]["norm"], copy=False)
+        return features
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """Class probabilities, one row per text, columns in classes_ order"""
+        scores = np.asarray(self.transform(texts) @ self.coef.T, dtype=np.float64) + self.intercept
+        if self.meta["ovr"]:
+            probabilities = 1.0 / (1.0 + np.exp(-scores))
+            if probabilities.shape[1] == 1:
+                return np.hstack([1.0 - probabilities, probabilities])
+            return probabilities / probabilities.sum(axis=1, keepdims=True)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, scores)
+        return scores / scores.sum(axis=1, keepdims=True)
+
+
+def export_compact_model(pipeline, model_dir: str, source_path: Optional[str] = None, prune_threshold: float = 0.0) -> dict:
+    """
+    Write the inference parts of a fitted pipeline as a compact artifact
+
+    Args:
+        pipeline: Fitted Pipeline with 'tfidf' (TfidfVectorizer) and 'clf' (LogisticRegression or log-loss SGDClassifier) steps
+        model_dir: Output directory (replaced if it exists)
+        source_path: Model file the pipeline was loaded from; its hash is recorded
+            so a stale artifact can be detected after retraining
+        prune_threshold: Drop features whose largest absolute coefficient is below this
+            (0 keeps every feature and reproduces the pipeline up to float32 rounding;
+            pruned features no longer count towards the L2 norm, so check the tolerance)
+
+    Returns:
+        The artifact metadata
+    """
+    vectorizer = pipeline.named_steps['tfidf']
+    clf = pipeline.named_steps['clf']
+    if not hasattr(vectorizer, "vocabulary_"):
+        raise ValueError("Only pipelines with a fitted TfidfVectorizer vocabulary can be exported")
+
+    coef = np.asarray(clf.coef_)
+    terms = np.empty(len(vectorizer.vocabulary_), dtype=object)
+    for term, index in vectorizer.vocabulary_.items():
+        terms[index] = term
+    if any('\n' in term for term in terms):
+        raise ValueError("Vocabulary terms must not contain newlines")
+    keep = np.abs(coef).max(axis=0) >= prune_threshold if prune_threshold > 0 else np.ones(len(terms), dtype=bool)
+
+    stop_words = vectorizer.get_stop_words()
+    meta = {
+        "format_version": COMPACT_FORMAT_VERSION,
+        "classes": [str(label) for label in clf.classes_],
+        "vectorizer": {
+            **{name: vectorizer.get_params()[name] for name in _ANALYZER_PARAMS},
+            "sublinear_tf": vectorizer.sublinear_tf,
+            "norm": vectorizer.norm,
+        },
+        "stop_words": sorted(stop_words) if stop_words else [],
+        "ovr": _uses_ovr(clf),
+        "features": int(keep.sum()),
+        "pruned_features": int((~keep).sum()),
+        "prune_threshold": prune_threshold,
+        "source_sha256": file_sha256(source_path) if source_path else None,
+    }
+    if not isinstance(meta["vectorizer"]["token_pattern"], str) or meta["vectorizer"]["analyzer"] != "word":
+        raise ValueError("Only word analyzers with a token pattern can be exported")
+
+    # Write next to the target and swap in at the end, so readers never see half an artifact
+    staging_dir = model_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+    with open(os.path.join(staging_dir, VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(terms[keep]))
+    arrays = (
+        vectorizer.idf_[keep].astype(np.float32),
+        np.ascontiguousarray(coef[:, keep], dtype=np.float32),
+        np.asarray(clf.intercept_, dtype=np.float32),
+    )
+    for name, array in zip(ARRAY_FILES, arrays):
+        np.save(os.path.join(staging_dir, name), array)
+    with open(os.path.join(staging_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(model_dir, ignore_errors=True)
+    os.replace(staging_dir, model_dir)
+    return meta
+
+
+def verify_compact_model(pipeline, compact: CompactClassifier, texts: List[str], tolerance: float = PROBABILITY_TOLERANCE) -> Dict[str, float]:
+    """
+    Compare compact and pipeline predictions on sample texts
+
+    Labels must agree wherever the pipeline's top two classes are further
+    apart than the tolerance.
+
+    Returns:
+        max_abs_diff of any probability and label_mismatches
+
+    Raises:
+        ValueError: If a probability differs by more than the tolerance or a label flips
+    """
+    expected = pipeline.predict_proba(texts)
+    actual = compact.predict_proba(texts)
+    max_abs_diff = float(np.abs(expected - actual).max()) if len(texts) else 0.0
+
+    top_two = np.sort(expected, axis=1)[:, -2:]
+    decisive = (top_two[:, 1] - top_two[:, 0]) > tolerance
+    mismatches = int((expected.argmax(axis=1) != actual.argmax(axis=1))[decisive].sum())
+    if max_abs_diff > tolerance or mismatches:
+        raise ValueError(
+            f"Compact model differs from the pipeline: max probability difference {max_abs_diff:.2e} "
+            f"(tolerance {tolerance:.0e}), {mismatches} label mismatches"
+        )
+    return {"max_abs_diff": max_abs_diff, "label_mismatches": mismatches}
+
+
+def is_compact_model_current(model_dir: str, source_path: str) -> bool:
+    """Whether an artifact exists and was exported from the current model file (or that file is gone)"""
+    meta_path = os.path.join(model_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return False
+    if not os.path.exists(source_path):
+        return True
+    with open(meta_path, encoding='utf-8') as f:
+        source_sha256 = json.load(f).get("source_sha256")
+    return source_sha256 == file_sha256(source_path)
@@ -0,0 +1,156 @@
+"""
+Training Data Loader
+Streams the resume dataset (CSV or Parquet) in chunks with vectorized preprocessing and deduplication by text hash
+"""
+import hashlib
+import os
+import re
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+TEXT_COLUMN = 'resume_text'
+LABEL_COLUMN = 'category'
+# Rows read per chunk; memory use is bounded by this, not by the dataset size
+DEFAULT_CHUNK_SIZE = 50000
+# Preprocessed texts this short are not used for training
+MIN_TEXT_CHARS = 50
+
+_SPECIAL_CHARS = r'[^\w\s\-\.\,\@\/\+\#]'
+_SEPARATOR_RUNS = r'[^\w\-\.\,\@\/\+\#]+'
+
+
+def preprocess_text(text: str) -> str:
+    """Clean and preprocess resume text"""
+    if not isinstance(text, str):
+        return ""
+
+    # Remove extra whitespace
+    text = re.sub(r'\s+', ' ', text)
+
+    # Remove special characters but keep important punctuation
+    text = re.sub(_SPECIAL_CHARS, ' ', text)
+
+    # Normalize whitespace
+    text = ' '.join(text.split())
+
+    return text.strip()
+
+
+def preprocess_series(texts: pd.Series) -> pd.Series:
+    """preprocess_text for a whole column, using pandas string operations"""
+    cleaned = texts.where(texts.map(type) == str)
+    # Whitespace and special characters both end up as single spaces, so one pass over runs of
+    # either does all three steps (\s matches exactly what str.split() splits on)
+    cleaned = cleaned.str.replace(_SEPARATOR_RUNS, ' ', regex=True).str.strip()
+    return cleaned.fillna('')
+
+
+def text_hashes(texts: pd.Series) -> np.ndarray:
+    """64-bit content hash of each text, used for deduplication and hash-based splits"""
+    return pd.util.hash_pandas_object(texts, index=False).to_numpy()
+
+
+class RowDigest:
+    """Running row count and content hash of raw dataset rows, independent of the chunk size"""
+
+    def __init__(self):
+        self.rows = 0
+        self._digest = hashlib.sha256()
+
+    def update(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+        self._digest.update(pd.util.hash_pandas_object(chunk[[TEXT_COLUMN, LABEL_COLUMN]], index=False).to_numpy().tobytes())
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def iter_raw_chunks(path: str, chunksize: int = DEFAULT_CHUNK_SIZE, columns: Tuple[str, ...] = (TEXT_COLUMN, LABEL_COLUMN)) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Parquet dataset in chunks of raw rows
+
+    Args:
+        path: .csv or .parquet file
+        chunksize: Rows per chunk
+        columns: Columns to read; all of them must exist
+
+    Raises:
+        FileNotFoundError: If the dataset does not exist
+        ValueError: If a column is missing
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Dataset not found at: {path}")
+
+    if path.lower().endswith('.parquet'):
+        # Optional dependency, only needed for Parquet datasets
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        missing = [name for name in columns if name not in parquet.schema_arrow.names]
+        if missing:
+            raise ValueError(f"Dataset must have {', '.join(map(repr, columns))} columns (missing {', '.join(missing)})")
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=list(columns)):
+            yield batch.to_pandas()
+        return
+
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [name for name in columns if name not in header]
+    if missing:
+        raise ValueError(f"Dataset must have {', '.join(map(repr, columns))} columns (missing {', '.join(missing)})")
+    # Reading as str keeps row hashes independent of per-chunk type inference
+    yield from pd.read_csv(path, usecols=list(columns), dtype=str, chunksize=chunksize)
+
+
+def iter_training_chunks(
+    path: str,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    skip_rows: int = 0,
+    digest: Optional[RowDigest] = None
+) -> Iterator[Tuple[List[str], List[str], np.ndarray]]:
+    """
+    Stream preprocessed, deduplicated training rows
+
+    Rows whose preprocessed text is shorter than MIN_TEXT_CHARS or was
+    already seen earlier in the stream are dropped. Only the 8-byte hashes
+    of seen texts stay in memory, so every pass keeps the first occurrence.
+
+    Args:
+        path: .csv or .parquet dataset
+        chunksize: Raw rows per chunk
+        skip_rows: Raw rows at the start to skip (still fed to digest)
+        digest: Updated with every raw row read
+
+    Yields:
+        (texts, labels, text hashes) per chunk, possibly empty
+    """
+    seen = set()
+    position = 0
+    for chunk in iter_raw_chunks(path, chunksize):
+        if digest is not None:
+            digest.update(chunk)
+        start = position
+        position += len(chunk)
+        if position <= skip_rows:
+            continue
+        chunk = chunk.iloc[max(0, skip_rows - start):]
+
+        texts = preprocess_series(chunk[TEXT_COLUMN])
+        labels = chunk[LABEL_COLUMN]
+        keep = (texts.str.len() > MIN_TEXT_CHARS) & labels.notna()
+        texts, labels = texts[keep], labels[keep]
+        hashes = text_hashes(texts)
+
+        unique = np.zeros(len(hashes), dtype=bool)
+        for i, value in enumerate(hashes.tolist()):
+            if value not in seen:
+                seen.add(value)
+                unique[i] = True
+        yield texts[unique].tolist(), labels[unique].tolist(), hashes[unique]
+
+
+def iter_categories(path: str, chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.Series]:
+    """Stream only the label column"""
+    for chunk in iter_raw_chunks(path, chunksize, columns=(LABEL_COLUMN,)):
+        yield chunk[LABEL_COLUMN].dropna()
@@ -0,0 +1,339 @@
+"""
+Resume Matcher
+Projects resumes and job descriptions from the classifier's TF-IDF space onto SVD components and ranks stored ones by cosine similarity
+
+Usage (from backend/):
+    python -m app.ml.matcher build [--dim 128] [--dataset data.csv] [--force]
+    python -m app.ml.matcher stats
+"""
+import argparse
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+import joblib
+import numpy as np
+from .data_loader import iter_training_chunks, preprocess_text
+from .compact_model import file_sha256
+from .registry import get_registry
+from app.config import MATCH_INDEX_DIR, MATCH_INDEX_DIM
+from app.services.vector_index import VectorIndex
+
+
+PROJECTION_FORMAT_VERSION = 1
+PROJECTION_FILE = "projection.joblib"
+PROJECTION_META_FILE = "projection.json"
+# Collections of the index directory, each a VectorIndex
+RESUMES = "resumes"
+JOBS = "jobs"
+# Dataset rows the SVD is fitted on at most; more barely changes the components
+SVD_SAMPLE_ROWS = 20000
+
+
+class MatchIndexNotAvailableError(Exception):
+    """Raised when matching is disabled or the index has no projection yet"""
+
+
+class Projection:
+    """
+    Fixed map from resume text to a unit vector: the TF-IDF steps of a trained
+    pipeline followed by truncated SVD components
+
+    The projection keeps its own copy of the feature steps, so swapping the
+    served classifier never changes the space stored vectors live in.
+    """
+
+    def __init__(self, features, columns: Optional[np.ndarray], components: np.ndarray, meta: dict):
+        self.features = features
+        # TF-IDF columns the components cover (None for all); hashed feature spaces are mostly unused
+        self.columns = columns
+        self.components = components
+        self.meta = meta
+
+    @property
+    def dim(self) -> int:
+        return self.components.shape[0]
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """(texts, dim) float32 unit vectors; texts without known terms map to zero vectors"""
+        features = self.features.transform([preprocess_text(text) for text in texts])
+        if self.columns is not None:
+            features = features[:, self.columns]
+        vectors = np.asarray(features @ self.components.T, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+def _served_model_path() -> str:
+    """Full pipeline file of the served model (the registry's ACTIVE version, or the single model file)"""
+    from .classifier import MODEL_PATH
+
+    registry = get_registry()
+    if registry is not None:
+        version = registry.active_version()
+        if version is None:
+            raise MatchIndexNotAvailableError(f"No active model version in {registry.root}")
+        return registry.model_paths(version)[0]
+    return MODEL_PATH
+
+
+def build_projection(dim: int = MATCH_INDEX_DIM, model_path: Optional[str] = None, dataset_path: Optional[str] = None,
+                     sample_rows: int = SVD_SAMPLE_ROWS) -> Projection:
+    """
+    Fit SVD components on the TF-IDF features of the training dataset
+
+    Args:
+        dim: Number of components (capped by the features and documents available)
+        model_path: Trained pipeline whose feature steps are reused (default: the served model file)
+        dataset_path: Dataset the components are fitted on (default: the bundled CSV)
+        sample_rows: Deduplicated rows used at most
+
+    Returns:
+        The fitted projection
+    """
+    from sklearn.decomposition import TruncatedSVD
+    from .train_classifier import DATASET_PATH
+
+    model_path = model_path or _served_model_path()
+    dataset_path = dataset_path or DATASET_PATH
+    if not os.path.exists(model_path):
+        raise MatchIndexNotAvailableError(f"No trained model at {model_path}; train one first")
+    pipeline = joblib.load(model_path)
+    # Everything up to the classifier step: TfidfVectorizer, or HashingVectorizer + TfidfTransformer
+    features = pipeline[:-1]
+
+    texts = []
+    for chunk_texts, _, _ in iter_training_chunks(dataset_path):
+        texts.extend(chunk_texts)
+        if len(texts) >= sample_rows:
+            break
+    texts = texts[:sample_rows]
+    matrix = features.transform(texts)
+
+    used = np.flatnonzero(matrix.getnnz(axis=0))
+    columns = used if len(used) < matrix.shape[1] else None
+    if columns is not None:
+        matrix = matrix[:, columns]
+    n_components = max(1, min(dim, matrix.shape[1] - 1, len(texts) - 1))
+    svd = TruncatedSVD(n_components=n_components, random_state=42).fit(matrix)
+
+    meta = {
+        "format_version": PROJECTION_FORMAT_VERSION,
+        "dim": n_components,
+        "documents": len(texts),
+        "features": int(matrix.shape[1]),
+        "explained_variance": round(float(svd.explained_variance_ratio_.sum()), 4),
+        "model_sha256": file_sha256(model_path),
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    return Projection(features, columns, svd.components_.astype(np.float32), meta)
+
+
+def save_projection(projection: Projection, directory: str):
+    """Write the projection, metadata last so a reader never sees half of it"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, PROJECTION_FILE)
+    joblib.dump(
+        {"features": projection.features, "columns": projection.columns, "components": projection.components},
+        path + ".tmp"
+    )
+    os.replace(path + ".tmp", path)
+    with open(os.path.join(directory, PROJECTION_META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(projection.meta, f, indent=2)
+
+
+def load_projection(directory: str) -> Optional[Projection]:
+    """Read a saved projection, or None if the directory has none"""
+    meta_path = os.path.join(directory, PROJECTION_META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get("format_version") != PROJECTION_FORMAT_VERSION:
+        raise ValueError(f"Unsupported projection format: {meta.get('format_version')}")
+    saved = joblib.load(os.path.join(directory, PROJECTION_FILE))
+    return Projection(saved["features"], saved["columns"], saved["components"], meta)
+
+
+class MatchIndex:
+    """A projection with a resume and a job description collection in one directory"""
+
+    def __init__(self, directory: str, projection: Projection):
+        self.directory = directory
+        self.projection = projection
+        self.collections = {
+            name: VectorIndex(os.path.join(directory, name), projection.dim) for name in (RESUMES, JOBS)
+        }
+
+    def add(self, collection: str, items: Sequence[Tuple[str, str, dict]], replace: bool = False) -> int:
+        """
+        Embed texts and store them
+
+        Args:
+            collection: RESUMES or JOBS
+            items: (item id, text, metadata) tuples
+            replace: Overwrite items whose id is already stored
+
+        Returns:
+            Number of items added or replaced
+        """
+        if not items:
+            return 0
+        vectors = self.projection.embed([text for _, text, _ in items])
+        return self.collections[collection].add(
+            [(item_id, vector, info) for (item_id, _, info), vector in zip(items, vectors)], replace
+        )
+
+    def query_vector(self, collection: str, item_id: str) -> Optional[np.ndarray]:
+        """Stored vector of an item, or None if it is not in the collection"""
+        return self.collections[collection].get_vector(item_id)
+
+    def search(self, collection: str, queries: np.ndarray, top_n: int) -> List[List[dict]]:
+        """
+        Most similar stored items for each query vector
+
+        Returns:
+            Per query, dicts with id, score and the item's metadata, best first
+        """
+        index = self.collections[collection]
+        hits = index.search(queries, top_n)
+        items = index.items({row for query_hits in hits for row, _ in query_hits})
+        return [
+            [
+                {"id": items[row][0], "score": round(score, 4), **items[row][1]}
+                for row, score in query_hits if row in items
+            ]
+            for query_hits in hits
+        ]
+
+    def stats(self) -> dict:
+        """Items per collection and the projection metadata"""
+        return {
+            **{name: len(index) for name, index in self.collections.items()},
+            "projection": self.projection.meta,
+        }
+
+
+_index: Optional[MatchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_match_index(build_if_missing: bool = False) -> MatchIndex:
+    """
+    Open the index in MATCH_INDEX_DIR, loading it on first use
+
+    Args:
+        build_if_missing: Fit and save a projection when the directory has
+            none (startup warm-up and the CLI do this, never a request)
+
+    Raises:
+        MatchIndexNotAvailableError: If MATCH_INDEX_DIR is unset, or the
+            index has no projection and building is not allowed
+    """
+    global _index
+    index = _index
+    if index is not None:
+        return index
+    if not MATCH_INDEX_DIR:
+        raise MatchIndexNotAvailableError("Matching is disabled (set MATCH_INDEX_DIR)")
+
+    with _index_lock:
+        if _index is None:
+            projection = load_projection(MATCH_INDEX_DIR)
+            if projection is None:
+                if not build_if_missing:
+                    raise MatchIndexNotAvailableError(
+                        f"No projection in {MATCH_INDEX_DIR}; run `python -m app.ml.matcher build`"
+                    )
+                print(f"Building the match index projection in {MATCH_INDEX_DIR}...")
+                projection = build_projection()
+                save_projection(projection, MATCH_INDEX_DIR)
+            _index = MatchIndex(MATCH_INDEX_DIR, projection)
+        return _index
+
+
+def add_resumes(items: Sequence[Tuple[str, str, dict]]) -> int:
+    """Store analyzed resumes as (resume id, text, summary) tuples; resumes already stored are kept as they are"""
+    return get_match_index().add(RESUMES, items)
+
+
+def put_job(job_id: str, text: str, info: dict) -> int:
+    """Store a job description, replacing an earlier one with the same id; returns the number of stored jobs"""
+    index = get_match_index()
+    index.add(JOBS, [(job_id, text, info)], replace=True)
+    return len(index.collections[JOBS])
+
+
+def index_stats() -> dict:
+    """Items per collection and the projection metadata of the index"""
+    return get_match_index().stats()
+
+
+def match(collection: str, top_n: int, text: Optional[str] = None,
+          stored: Optional[Tuple[str, str]] = None) -> Optional[Tuple[List[dict], int]]:
+    """
+    Rank a collection against a text or a stored item
+
+    Args:
+        collection: Collection to search (RESUMES or JOBS)
+        top_n: Results to return
+        text: Query text, embedded with the index's projection
+        stored: Or (collection, item id) of a stored item to use as the query
+
+    Returns:
+        (matches, number of items searched), or None if the stored item does not exist
+    """
+    index = get_match_index()
+    if stored is not None:
+        query = index.query_vector(*stored)
+        if query is None:
+            return None
+    else:
+        query = index.projection.embed([text])[0]
+    searched = len(index.collections[collection])
+    return index.search(collection, query, top_n)[0], searched
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m app.ml.matcher", description="Manage the resume/job match index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Fit the SVD projection of a new, empty index in MATCH_INDEX_DIR")
+    build.add_argument("--dim", type=int, default=MATCH_INDEX_DIM, help="SVD components (vector dimensions)")
+    build.add_argument("--model", help="Trained pipeline file (default: the served model)")
+    build.add_argument("--dataset", help="CSV or Parquet dataset to fit on (default: the bundled CSV)")
+    build.add_argument("--sample-rows", type=int, default=SVD_SAMPLE_ROWS, help="Dataset rows fitted on at most")
+    build.add_argument("--force", action="store_true", help="Replace an existing index, deleting its stored vectors")
+    commands.add_parser("stats", help="Print the number of stored resumes and jobs")
+    args = parser.parse_args(argv)
+
+    if not MATCH_INDEX_DIR:
+        parser.error("Set MATCH_INDEX_DIR to the index directory")
+    if args.command == "stats":
+        try:
+            print(json.dumps(get_match_index().stats(), indent=2))
+        except MatchIndexNotAvailableError as e:
+            parser.error(str(e))
+        return
+
+    if os.path.exists(os.path.join(MATCH_INDEX_DIR, PROJECTION_META_FILE)):
+        if not args.force:
+            parser.error(f"{MATCH_INDEX_DIR} already has an index; vectors from another projection "
+                         f"cannot be compared, so rebuilding deletes them (pass --force)")
+        for name in (RESUMES, JOBS):
+            shutil.rmtree(os.path.join(MATCH_INDEX_DIR, name), ignore_errors=True)
+        os.remove(os.path.join(MATCH_INDEX_DIR, PROJECTION_META_FILE))
+    try:
+        projection = build_projection(args.dim, args.model, args.dataset, args.sample_rows)
+    except MatchIndexNotAvailableError as e:
+        parser.error(str(e))
+    save_projection(projection, MATCH_INDEX_DIR)
+    meta = projection.meta
+    print(f"✓ Projection with {meta['dim']} components fitted on {meta['documents']} resumes "
+          f"({meta['explained_variance']:.1%} of the variance) saved to: {MATCH_INDEX_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Model Registry
+Versioned classifier artifacts in a directory, with ACTIVE and SHADOW pointer files selecting the served versions
+"""
+import os
+import re
+import shutil
+from typing import List, Optional
+from app.config import MODEL_REGISTRY_DIR
+
+
+# <registry>/<version>/ holds a model file and optionally its compact export
+MODEL_FILE = "resume_classifier.joblib"
+COMPACT_DIR = "compact"
+# Training metadata (categories, dataset rows seen) written next to the model
+METADATA_FILE = "resume_classifier.state.json"
+# Pointer files naming the version to serve and the candidate to shadow-score
+ACTIVE_POINTER = "ACTIVE"
+SHADOW_POINTER = "SHADOW"
+
+# Version names are directory names: no separators, no leading dot, no .tmp suffix (staging)
+_VERSION_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+
+
+class UnknownModelVersionError(Exception):
+    """Raised when a version name is invalid or not present in the registry"""
+
+
+def _check_version_name(version: str):
+    if not isinstance(version, str) or not _VERSION_PATTERN.match(version) or version.endswith('.tmp'):
+        raise UnknownModelVersionError(f"Invalid model version name: {version!r}")
+
+
+class ModelRegistry:
+    """
+    A directory of immutable model versions
+
+    Layout:
+        <root>/<version>/resume_classifier.joblib
+        <root>/<version>/compact/            (optional compact export)
+        <root>/<version>/resume_classifier.state.json  (optional training metadata)
+        <root>/ACTIVE                        (name of the served version)
+        <root>/SHADOW                        (optional candidate version)
+
+    Pointers are replaced atomically, so every server process watching the
+    directory sees either the old or the new version name.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def version_dir(self, version: str) -> str:
+        """Directory of a published version"""
+        _check_version_name(version)
+        path = os.path.join(self.root, version)
+        if not os.path.exists(os.path.join(path, MODEL_FILE)):
+            raise UnknownModelVersionError(f"Model version {version!r} not found in {self.root}")
+        return path
+
+    def model_paths(self, version: str):
+        """(model file, compact export directory) of a published version"""
+        path = self.version_dir(version)
+        return os.path.join(path, MODEL_FILE), os.path.join(path, COMPACT_DIR)
+
+    def versions(self) -> List[str]:
+        """Names of the published versions, sorted"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if _VERSION_PATTERN.match(name) and not name.endswith('.tmp')
+            and os.path.exists(os.path.join(self.root, name, MODEL_FILE))
+        )
+
+    def get_pointer(self, pointer: str) -> Optional[str]:
+        """Version named by a pointer file, or None if it is not set"""
+        try:
+            with open(os.path.join(self.root, pointer), encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_pointer(self, pointer: str, version: Optional[str]):
+        """
+        Point ACTIVE or SHADOW at a version (None clears it)
+
+        Raises:
+            UnknownModelVersionError: If the version is not published
+        """
+        path = os.path.join(self.root, pointer)
+        if version is None:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        self.version_dir(version)
+        staging_path = f"{path}.{os.getpid()}.tmp"
+        with open(staging_path, 'w', encoding='utf-8') as f:
+            f.write(version + '\n')
+        os.replace(staging_path, path)
+
+    def active_version(self) -> Optional[str]:
+        return self.get_pointer(ACTIVE_POINTER)
+
+    def shadow_version(self) -> Optional[str]:
+        return self.get_pointer(SHADOW_POINTER)
+
+    def publish(self, version: str, model_path: str, compact_dir: Optional[str] = None,
+                metadata_path: Optional[str] = None) -> str:
+        """
+        Copy a model file (and its compact export) into the registry as a new version
+
+        Versions are immutable: publishing an existing name fails.
+
+        Args:
+            version: New version name
+            model_path: Trained model file
+            compact_dir: Compact export of that model, copied when it exists
+            metadata_path: Training metadata of that model, copied when it exists
+
+        Returns:
+            The version directory
+        """
+        _check_version_name(version)
+        target = os.path.join(self.root, version)
+        if os.path.exists(target):
+            raise ValueError(f"Model version {version!r} already exists in {self.root}")
+
+        os.makedirs(self.root, exist_ok=True)
+        # Copy next to the target and rename at the end, so watchers never see half a version
+        staging_dir = f"{target}.{os.getpid()}.tmp"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+        shutil.copy2(model_path, os.path.join(staging_dir, MODEL_FILE))
+        if compact_dir and os.path.isdir(compact_dir):
+            shutil.copytree(compact_dir, os.path.join(staging_dir, COMPACT_DIR))
+        if metadata_path and os.path.exists(metadata_path):
+            shutil.copy2(metadata_path, os.path.join(staging_dir, METADATA_FILE))
+        os.rename(staging_dir, target)
+        return target
+
+
+def get_registry() -> Optional[ModelRegistry]:
+    """The registry configured by MODEL_REGISTRY_DIR, or None when serving the single model file"""
+    return ModelRegistry(MODEL_REGISTRY_DIR) if MODEL_REGISTRY_DIR else None
@@ -3,86 +3,166 @@ Resume Classifier Training Script
 Trains a TF-IDF + Logistic Regression model for resume classification
 Uses the resume_dataset.csv for training data
 """
+import argparse
+import json
 import joblib
 import os
-import re
-import pandas as pd
+import shutil
+from collections import Counter
+from typing import Dict, Optional
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
+from .data_loader import (
+    DEFAULT_CHUNK_SIZE, RowDigest, preprocess_text, iter_raw_chunks, iter_training_chunks, iter_categories
+)
+from .tuning import (
+    DEFAULT_PARAMS, DEFAULT_HASH_FEATURES, CLASSIFIER_TYPES, FEATURE_CACHE_DIR, FeatureCache, build_classifier,
+    build_hashing_vectorizer, idf_transformer, dataset_key, search_candidates, run_search, format_results,
+    params_from_result
+)
 
 
 # Path to the dataset
 DATASET_PATH = os.path.join(os.path.dirname(__file__), 'dataset', 'resume_dataset.csv')
+# Trained pipeline and its compact inference export
+MODEL_PATH = os.path.join(os.path.dirname(__file__), 'resume_classifier.joblib')
+COMPACT_MODEL_DIR = os.path.join(os.path.dirname(__file__), 'resume_classifier_compact')
+# Dataset rows the saved model was trained on, so appended rows can be applied incrementally
+MODEL_STATE_PATH = os.path.join(os.path.dirname(__file__), 'resume_classifier.state.json')
 
 
-def preprocess_text(text: str) -> str:
-    """Clean and preprocess resume text"""
-    if not isinstance(text, str):
-        return ""
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove special characters but keep important punctuation
-    text = re.sub(r'[^\w\s\-\.\,\@\/\+\#]', ' ', text)
-    
-    # Normalize whitespace
-    text = ' '.join(text.split())
-    
-    return text.strip()
+def load_dataset(path: Optional[str] = None, chunksize: int = DEFAULT_CHUNK_SIZE, digest: Optional[RowDigest] = None):
+    """
+    Load and prepare training data from the CSV (or Parquet) dataset
 
+    The file is read in chunks and preprocessed column-wise; duplicate texts
+    (after preprocessing) keep only their first row.
 
-def load_dataset():
-    """Load and prepare training data from CSV dataset"""
-    print(f"Loading dataset from: {DATASET_PATH}")
-    
-    if not os.path.exists(DATASET_PATH):
-        raise FileNotFoundError(f"Dataset not found at: {DATASET_PATH}")
-    
-    # Load CSV
-    df = pd.read_csv(DATASET_PATH)
-    
-    print(f"Total samples loaded: {len(df)}")
-    print(f"Columns: {df.columns.tolist()}")
-    
-    # Check for required columns
-    if 'resume_text' not in df.columns or 'category' not in df.columns:
-        raise ValueError("Dataset must have 'resume_text' and 'category' columns")
+    Args:
+        path: Dataset file (default DATASET_PATH)
+        chunksize: Rows read at a time
+        digest: Updated with every raw row, to record what the model was trained on
+
+    Returns:
+        Tuple of (texts, labels)
+    """
+    path = path or DATASET_PATH
+    print(f"Loading dataset from: {path}")
     
-    # Clean text data
-    df['resume_text'] = df['resume_text'].apply(preprocess_text)
+    digest = digest if digest is not None else RowDigest()
+    texts, labels = [], []
+    for chunk_texts, chunk_labels, _ in iter_training_chunks(path, chunksize, digest=digest):
+        texts.extend(chunk_texts)
+        labels.extend(chunk_labels)
     
-    # Remove empty rows
-    df = df[df['resume_text'].str.len() > 50]
+    print(f"Total rows read: {digest.rows}")
+    print(f"Unique samples kept: {len(texts)} ({digest.rows - len(texts)} duplicate, short or unlabeled rows dropped)")
     
     print(f"\nCategory distribution:")
-    print(df['category'].value_counts())
-    
-    texts = df['resume_text'].tolist()
-    labels = df['category'].tolist()
+    for category, count in Counter(labels).most_common():
+        print(f"  {category:<28}{count:>8}")
     
     return texts, labels
 
 
 def get_all_categories():
-    """Get list of all classification categories from dataset"""
+    """Get list of all classification categories, from the saved model's metadata or the dataset"""
+    state = read_training_state()
+    if state and state.get("categories"):
+        return sorted(state["categories"])
     if os.path.exists(DATASET_PATH):
-        df = pd.read_csv(DATASET_PATH)
-        return sorted(df['category'].unique().tolist())
+        categories = set()
+        for labels in iter_categories(DATASET_PATH):
+            categories.update(labels.unique().tolist())
+        return sorted(categories)
     return []
 
 
-def train_model():
-    """Train and save the resume classification model"""
+def read_training_state(path: Optional[str] = None) -> Optional[dict]:
+    """Training metadata saved with the model, or None for models trained before it was recorded"""
+    path = path or MODEL_STATE_PATH
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dataset_prefix_digest(path: str, rows: int, chunksize: int = DEFAULT_CHUNK_SIZE):
+    """
+    Digest of the first rows of the dataset, streamed
+
+    Returns:
+        Tuple of (RowDigest of the first `rows` rows, total row count)
+    """
+    prefix = RowDigest()
+    total = 0
+    for chunk in iter_raw_chunks(path, chunksize):
+        total += len(chunk)
+        if prefix.rows < rows:
+            prefix.update(chunk.iloc[:rows - prefix.rows])
+    return prefix, total
+
+
+def save_model(pipeline, digest: RowDigest, params: dict, categories: Dict[str, int], updates: int = 0):
+    """
+    Save a trained pipeline with its training metadata
+
+    The metadata file next to the model records the dataset rows the model
+    has seen (so appended rows can be applied incrementally), the training
+    parameters and the samples per category, so listing categories never
+    reads the dataset.
+
+    Args:
+        pipeline: Fitted vectorizer + classifier pipeline
+        digest: Raw dataset rows the model was trained on
+        params: Training parameters
+        categories: Training samples per category
+        updates: Incremental updates applied since the last full training
+    """
+    joblib.dump(pipeline, MODEL_PATH)
+    state = {
+        "dataset_rows": digest.rows,
+        "dataset_sha256": digest.hexdigest(),
+        "params": {name: list(value) if isinstance(value, tuple) else value for name, value in params.items()},
+        "categories": {category: int(count) for category, count in sorted(categories.items())},
+        "incremental_updates": updates,
+    }
+    with open(MODEL_STATE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    print(f"\n✓ Model saved to: {MODEL_PATH}")
+
+    # Keep an existing compact export in sync with the new model
+    if os.path.isdir(COMPACT_MODEL_DIR):
+        if isinstance(pipeline.named_steps.get('tfidf'), TfidfVectorizer):
+            export_compact_model_file()
+        else:
+            # Hashed features have no vocabulary to export; a stale export must not be served
+            shutil.rmtree(COMPACT_MODEL_DIR)
+            print(f"Removed {COMPACT_MODEL_DIR}: hashed-feature models have no compact export")
+
+
+def train_model(params: Optional[dict] = None, cache_dir: Optional[str] = None, path: Optional[str] = None):
+    """
+    Train and save the resume classification model
+
+    Args:
+        params: ngram_range, max_features, classifier ("logreg" or "sgd") and C;
+            missing ones default to DEFAULT_PARAMS
+        cache_dir: Reuse the TF-IDF matrices cached here for the same data and
+            vectorizer settings (None always vectorizes)
+        path: CSV or Parquet dataset (default DATASET_PATH)
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
     print("=" * 60)
     print("RESUME CLASSIFIER TRAINING")
     print("=" * 60)
     
     # Load data
-    texts, labels = load_dataset()
+    digest = RowDigest()
+    texts, labels = load_dataset(path, digest=digest)
     
     print(f"\nTotal samples: {len(texts)}")
     print(f"Categories: {len(set(labels))}")
@@ -95,38 +175,28 @@ def train_model():
     print(f"\nTraining samples: {len(X_train)}")
     print(f"Test samples: {len(X_test)}")
     
-    # Create pipeline with TF-IDF + Logistic Regression
+    # TF-IDF + classifier, vectorized once per dataset and settings
     print("\n" + "-" * 40)
-    print("Training model...")
+    print(f"Training model ({params['classifier']}, C={params['C']:g}, "
+          f"{params['ngram_range'][0]}-{params['ngram_range'][1]}-grams, {params['max_features']} features)...")
     print("-" * 40)
     
-    pipeline = Pipeline([
-        ('tfidf', TfidfVectorizer(
-            max_features=10000,  # Increased for larger dataset
-            ngram_range=(1, 3),  # Include trigrams for better context
-            stop_words='english',
-            min_df=2,  # Minimum document frequency
-            max_df=0.95,
-            sublinear_tf=True  # Apply sublinear tf scaling
-        )),
-        ('clf', LogisticRegression(
-            max_iter=2000,  # Increased for convergence
-            class_weight='balanced',
-            random_state=42,
-            C=1.0,  # Regularization strength
-            solver='lbfgs'
-        ))
-    ])
-    
-    # Train the model
-    pipeline.fit(X_train, y_train)
+    cache = FeatureCache(cache_dir, dataset_key(X_train, y_train, X_test))
+    vectorizer, train_features, test_features, cached = cache.load_or_fit(
+        {"ngram_range": params["ngram_range"], "max_features": params["max_features"]}, X_train, X_test
+    )
+    if cached:
+        print("Using cached TF-IDF features")
+    clf = build_classifier(params["classifier"], params["C"], Counter(y_train))
+    clf.fit(train_features, y_train)
+    pipeline = Pipeline([('tfidf', vectorizer), ('clf', clf)])
     
     # Evaluate on test set
     print("\n" + "=" * 60)
     print("MODEL EVALUATION")
     print("=" * 60)
     
-    y_pred = pipeline.predict(X_test)
+    y_pred = clf.predict(test_features)
     print("\nClassification Report:")
     print(classification_report(y_test, y_pred))
     
@@ -135,9 +205,7 @@ def train_model():
     print(f"\nOverall Accuracy: {accuracy:.2%}")
     
     # Save model
-    model_path = os.path.join(os.path.dirname(__file__), 'resume_classifier.joblib')
-    joblib.dump(pipeline, model_path)
-    print(f"\n✓ Model saved to: {model_path}")
+    save_model(pipeline, digest, params, Counter(labels))
     
     # Print categories the model can classify
     print("\nCategories the model can classify:")
@@ -151,5 +219,288 @@ def train_model():
     return pipeline
 
 
+def search_model(strategy: str = "random", n_iter: int = 20, n_jobs: int = -1,
+                 classifiers: Optional[list] = None, cache_dir: Optional[str] = FEATURE_CACHE_DIR,
+                 path: Optional[str] = None):
+    """
+    Search hyperparameters in parallel, then train and save the best model
+
+    Candidates are scored by macro F1 on a validation split of the training
+    data; the test split is only used to evaluate the final model.
+
+    Args:
+        strategy: "grid" or "random"
+        n_iter: Candidates sampled by the random search
+        n_jobs: Parallel workers (-1 for one per CPU)
+        classifiers: Restrict the classifier types searched
+        cache_dir: TF-IDF feature cache directory (None disables it)
+        path: CSV or Parquet dataset (default DATASET_PATH)
+    """
+    texts, labels = load_dataset(path)
+    X_train, _, y_train, _ = train_test_split(texts, labels, test_size=0.2, random_state=42, stratify=labels)
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.2, random_state=42, stratify=y_train)
+
+    candidates = search_candidates(strategy, n_iter, classifiers)
+    print(f"\nSearching {len(candidates)} candidates ({strategy}) on {len(X_fit)} training "
+          f"and {len(X_val)} validation samples...")
+    results = run_search(candidates, X_fit, y_fit, X_val, y_val, n_jobs=n_jobs, cache_dir=cache_dir)
+    print("\n" + format_results(results))
+
+    best = params_from_result(results[0])
+    print(f"\nBest: {best}")
+    return train_model(best, cache_dir, path)
+
+
+def train_out_of_core(params: Optional[dict] = None, path: Optional[str] = None, chunksize: int = DEFAULT_CHUNK_SIZE,
+                      epochs: int = 1, n_features: int = DEFAULT_HASH_FEATURES):
+    """
+    Train on a dataset larger than memory, one chunk at a time
+
+    Terms are hashed (no vocabulary is learned) and a log-loss SGDClassifier
+    is fitted with partial_fit, so memory is bounded by the chunk size and
+    the number of hashed features. The file is streamed once for document
+    frequencies and category counts, once per epoch for training and once
+    for evaluation. One text in five is held out for testing, chosen by its
+    hash so every pass agrees.
+
+    Args:
+        params: ngram_range and C (other DEFAULT_PARAMS do not apply)
+        path: Dataset file (default DATASET_PATH)
+        chunksize: Rows read at a time
+        epochs: Passes of partial_fit over the training rows
+        n_features: Hashed feature space size
+    """
+    params = {"ngram_range": DEFAULT_PARAMS["ngram_range"], "C": DEFAULT_PARAMS["C"], **(params or {})}
+    params.update(classifier="sgd", vectorizer="hashing", n_features=n_features, max_features=None)
+    path = path or DATASET_PATH
+    hashing = build_hashing_vectorizer(params["ngram_range"], n_features)
+    print("=" * 60)
+    print(f"OUT-OF-CORE TRAINING ({path}, {chunksize} rows per chunk)")
+    print("=" * 60)
+
+    def is_test(hashes):
+        return hashes % 5 == 0
+
+    # Pass 1: document frequencies and category counts of the training rows
+    digest = RowDigest()
+    document_frequency = np.zeros(n_features, dtype=np.int64)
+    train_counts, all_counts = Counter(), Counter()
+    for texts, labels, hashes in iter_training_chunks(path, chunksize, digest=digest):
+        test = is_test(hashes)
+        all_counts.update(labels)
+        train_counts.update(label for label, held_out in zip(labels, test) if not held_out)
+        counts = hashing.transform([text for text, held_out in zip(texts, test) if not held_out])
+        counts.sum_duplicates()
+        document_frequency += np.bincount(counts.indices, minlength=n_features)
+    n_train = sum(train_counts.values())
+    print(f"Rows read: {digest.rows}, unique samples: {sum(all_counts.values())}, training samples: {n_train}")
+    if not n_train:
+        raise ValueError("No training samples in the dataset")
+
+    tfidf = idf_transformer(document_frequency, n_train)
+    clf = build_classifier("sgd", params["C"], train_counts)
+    classes = np.array(sorted(train_counts))
+    pipeline = Pipeline([('hashing', hashing), ('tfidf', tfidf), ('clf', clf)])
+
+    # Pass 2: partial_fit chunk by chunk, shuffled within each chunk
+    rng = np.random.default_rng(42)
+    for epoch in range(epochs):
+        for texts, labels, hashes in iter_training_chunks(path, chunksize):
+            train = np.flatnonzero(~is_test(hashes))
+            if not len(train):
+                continue
+            order = rng.permutation(train)
+            clf.partial_fit(pipeline[:-1].transform([texts[i] for i in order]), [labels[i] for i in order], classes=classes)
+        print(f"Epoch {epoch + 1}/{epochs} done")
+
+    # Pass 3: evaluate on the held-out rows
+    y_test, y_pred = [], []
+    for texts, labels, hashes in iter_training_chunks(path, chunksize):
+        test = np.flatnonzero(is_test(hashes))
+        if len(test):
+            y_test.extend(labels[i] for i in test)
+            y_pred.extend(pipeline.predict([texts[i] for i in test]))
+    if y_test:
+        print("\nClassification Report:")
+        print(classification_report(y_test, y_pred))
+        print(f"\nOverall Accuracy: {np.mean(np.array(y_test) == np.array(y_pred)):.2%}")
+
+    save_model(pipeline, digest, params, all_counts)
+    return pipeline
+
+
+def update_model(epochs: int = 1, chunksize: int = DEFAULT_CHUNK_SIZE, path: Optional[str] = None):
+    """
+    Apply rows appended to the dataset since the last training with partial_fit
+
+    The vectorizer is kept as is (new terms are ignored until the next full
+    training), and only models with a partial_fit-capable classifier (sgd)
+    can be updated. New rows are streamed in chunks and deduplicated among
+    themselves.
+
+    Args:
+        epochs: Passes over the new rows
+        chunksize: Rows read at a time
+        path: The dataset the model was trained on, with rows appended (default DATASET_PATH)
+
+    Raises:
+        ValueError: If the model cannot be updated incrementally and needs a full training
+    """
+    state = read_training_state()
+    if state is None or not os.path.exists(MODEL_PATH):
+        raise ValueError("No training state for the saved model; run a full training first")
+    pipeline = joblib.load(MODEL_PATH)
+    clf = pipeline.named_steps['clf']
+    if not hasattr(clf, 'partial_fit'):
+        raise ValueError(f"{type(clf).__name__} cannot be updated incrementally; train with --classifier sgd")
+
+    path = path or DATASET_PATH
+    seen = state["dataset_rows"]
+    prefix, total = dataset_prefix_digest(path, seen, chunksize)
+    if prefix.rows < seen or prefix.hexdigest() != state["dataset_sha256"]:
+        raise ValueError("Dataset rows were changed or removed, not only appended; run a full training")
+    if total == seen:
+        print("No new rows since the last training")
+        return pipeline
+
+    # Check labels before changing anything
+    new_counts = Counter()
+    for _, labels, _ in iter_training_chunks(path, chunksize, skip_rows=seen):
+        new_counts.update(labels)
+    unknown = sorted(set(new_counts) - set(clf.classes_))
+    if unknown:
+        raise ValueError(f"New categories need a full training: {', '.join(unknown)}")
+
+    digest = RowDigest()
+    before = after = 0
+    for epoch in range(epochs):
+        for texts, labels, _ in iter_training_chunks(path, chunksize, skip_rows=seen,
+                                                     digest=digest if epoch == 0 else None):
+            if not texts:
+                continue
+            features = pipeline[:-1].transform(texts)
+            if epoch == 0:
+                before += int((clf.predict(features) == np.array(labels)).sum())
+            clf.partial_fit(features, labels)
+            if epoch == epochs - 1:
+                after += int((clf.predict(features) == np.array(labels)).sum())
+    new_samples = sum(new_counts.values())
+    if new_samples:
+        print(f"\nUpdated with {new_samples} new samples ({total - seen} rows): "
+              f"accuracy on them {before / new_samples:.2%} -> {after / new_samples:.2%}")
+
+    params = dict(state["params"])
+    params["ngram_range"] = tuple(params["ngram_range"])
+    save_model(pipeline, digest, params, Counter(state.get("categories", {})) + new_counts,
+               updates=state.get("incremental_updates", 0) + 1)
+    return pipeline
+
+
+def export_compact_model_file(prune_threshold: float = 0.0):
+    """
+    Export the saved model as a compact inference artifact and verify it
+
+    The artifact (pruned vocabulary, float32 IDF and coefficients as .npy
+    files) is checked against the full pipeline on every dataset resume and
+    removed again if any probability differs by more than
+    PROBABILITY_TOLERANCE.
+
+    Args:
+        prune_threshold: Drop features whose largest absolute coefficient is below this
+    """
+    from .compact_model import CompactClassifier, export_compact_model, verify_compact_model, PROBABILITY_TOLERANCE
+
+    pipeline = joblib.load(MODEL_PATH) if os.path.exists(MODEL_PATH) else train_model()
+    meta = export_compact_model(pipeline, COMPACT_MODEL_DIR, MODEL_PATH, prune_threshold)
+    print(f"\n✓ Compact model saved to: {COMPACT_MODEL_DIR} "
+          f"({meta['features']} features, {meta['pruned_features']} pruned)")
+
+    compact = CompactClassifier(COMPACT_MODEL_DIR)
+    verified, max_abs_diff = 0, 0.0
+    try:
+        for chunk in iter_raw_chunks(DATASET_PATH, columns=('resume_text',)):
+            texts = chunk['resume_text'].fillna('').tolist()
+            report = verify_compact_model(pipeline, compact, texts)
+            verified += len(texts)
+            max_abs_diff = max(max_abs_diff, report['max_abs_diff'])
+    except ValueError:
+        shutil.rmtree(COMPACT_MODEL_DIR, ignore_errors=True)
+        raise
+    print(f"✓ Verified on {verified} resumes: max probability difference "
+          f"{max_abs_diff:.2e} (tolerance {PROBABILITY_TOLERANCE:.0e})")
+    return meta
+
+
+def publish_model_version(version: str, registry_dir: str, activate: bool = False):
+    """
+    Copy the saved model (with its metadata and compact export, if current) into the model registry
+
+    Args:
+        version: New version name
+        registry_dir: Registry directory
+        activate: Also point ACTIVE at the new version; watching servers swap it in
+    """
+    from .compact_model import is_compact_model_current
+    from .registry import ModelRegistry, ACTIVE_POINTER
+
+    if not os.path.exists(MODEL_PATH):
+        raise FileNotFoundError(f"No trained model at {MODEL_PATH}; train one first")
+    registry = ModelRegistry(registry_dir)
+    compact_dir = COMPACT_MODEL_DIR if is_compact_model_current(COMPACT_MODEL_DIR, MODEL_PATH) else None
+    path = registry.publish(version, MODEL_PATH, compact_dir, MODEL_STATE_PATH)
+    print(f"✓ Published model version {version} to: {path}" + (" (with compact export)" if compact_dir else ""))
+    if activate:
+        registry.set_pointer(ACTIVE_POINTER, version)
+        print(f"✓ Activated model version {version}")
+
+
 if __name__ == "__main__":
-    train_model()
+    parser = argparse.ArgumentParser(description="Train the resume classifier or export it for inference")
+    parser.add_argument("--classifier", choices=CLASSIFIER_TYPES,
+                        help="Classifier to train (default logreg; sgd can be updated with --update). "
+                             "With --search, only search this type")
+    parser.add_argument("--search", choices=("grid", "random"),
+                        help="Search hyperparameters in parallel and train the best model")
+    parser.add_argument("--n-iter", type=int, default=20, help="Candidates sampled by --search random")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel search workers (-1 for one per CPU)")
+    parser.add_argument("--update", action="store_true",
+                        help="Apply rows appended to the dataset to the saved sgd model with partial_fit")
+    parser.add_argument("--epochs", type=int, default=1, help="With --update or --out-of-core, partial_fit passes over the rows")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="Stream the dataset in chunks into hashed features and an sgd model (for datasets larger than memory)")
+    parser.add_argument("--dataset", help="CSV or Parquet dataset to train on (default: the bundled CSV)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows read at a time")
+    parser.add_argument("--n-features", type=int, default=DEFAULT_HASH_FEATURES, help="With --out-of-core, hashed feature space size")
+    parser.add_argument("--cache-dir", default=FEATURE_CACHE_DIR, help="TF-IDF feature cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Always vectorize instead of using the feature cache")
+    parser.add_argument("--export-compact", action="store_true",
+                        help="Export the saved model as a compact float32 artifact instead of training")
+    parser.add_argument("--prune-threshold", type=float, default=0.0,
+                        help="With --export-compact, drop features whose largest |coefficient| is below this")
+    parser.add_argument("--publish", metavar="VERSION",
+                        help="Copy the saved model into the model registry as VERSION instead of training")
+    parser.add_argument("--registry", default=os.getenv("MODEL_REGISTRY_DIR", ""),
+                        help="With --publish, the registry directory (default: MODEL_REGISTRY_DIR)")
+    parser.add_argument("--activate", action="store_true",
+                        help="With --publish, make the new version the served one")
+    args = parser.parse_args()
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    if args.publish:
+        if not args.registry:
+            parser.error("--publish needs --registry or MODEL_REGISTRY_DIR")
+        publish_model_version(args.publish, args.registry, args.activate)
+    elif args.export_compact:
+        export_compact_model_file(args.prune_threshold)
+    elif args.update:
+        try:
+            update_model(args.epochs, args.chunk_size, args.dataset)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.out_of_core:
+        train_out_of_core(None, args.dataset, args.chunk_size, args.epochs, args.n_features)
+    elif args.search:
+        search_model(args.search, args.n_iter, args.n_jobs,
+                     [args.classifier] if args.classifier else None, cache_dir, args.dataset)
+    else:
+        train_model({"classifier": args.classifier or DEFAULT_PARAMS["classifier"]}, cache_dir, args.dataset)
@@ -0,0 +1,294 @@
+"""
+Classifier Tuning
+Cached TF-IDF features and a parallel hyperparameter search over vectorizer and linear model settings
+"""
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+
+# Fitted vectorizers and their TF-IDF matrices, keyed by dataset split and vectorizer params
+FEATURE_CACHE_DIR = os.path.join(os.path.dirname(__file__), '.feature_cache')
+
+# Vectorizer settings shared by every candidate; the search varies ngram_range and max_features
+BASE_VECTORIZER_PARAMS = {
+    "stop_words": "english",
+    "min_df": 2,  # Minimum document frequency
+    "max_df": 0.95,
+    "sublinear_tf": True,  # Apply sublinear tf scaling
+}
+VECTORIZER_SEARCH_PARAMS = ("ngram_range", "max_features")
+
+# Linear models that serve predict_proba and export to the compact format; sgd also supports partial_fit
+CLASSIFIER_TYPES = ("logreg", "sgd")
+
+SEARCH_SPACE = {
+    "ngram_range": [(1, 1), (1, 2), (1, 3)],
+    "max_features": [5000, 10000, 20000],
+    "classifier": list(CLASSIFIER_TYPES),
+    "C": [0.3, 1.0, 3.0, 10.0],
+}
+
+# Settings of the default model trained by train_model
+DEFAULT_PARAMS = {"ngram_range": (1, 3), "max_features": 10000, "classifier": "logreg", "C": 1.0}
+
+# Out-of-core training hashes terms instead of learning a vocabulary, so memory does not grow with the corpus
+DEFAULT_HASH_FEATURES = 2 ** 20
+
+
+def build_vectorizer(ngram_range: Tuple[int, int], max_features: Optional[int]) -> TfidfVectorizer:
+    """TF-IDF vectorizer with the shared settings"""
+    return TfidfVectorizer(ngram_range=tuple(ngram_range), max_features=max_features, **BASE_VECTORIZER_PARAMS)
+
+
+def balanced_class_weights(class_counts: Dict[str, int]) -> Dict[str, float]:
+    """class_weight='balanced' computed from label counts: n_samples / (n_classes * count)"""
+    total = sum(class_counts.values())
+    return {label: total / (len(class_counts) * count) for label, count in sorted(class_counts.items())}
+
+
+def build_classifier(classifier: str, C: float, class_counts: Dict[str, int]):
+    """
+    Unfitted linear classifier with balanced class weights
+
+    Args:
+        classifier: "logreg" (LogisticRegression) or "sgd" (log-loss SGDClassifier, supports partial_fit)
+        C: Inverse regularization strength; for sgd it is converted to alpha = 1 / (C * n_samples)
+        class_counts: Training samples per label, used for the class weights
+
+    Returns:
+        The estimator
+    """
+    if classifier == "logreg":
+        return LogisticRegression(
+            max_iter=2000,  # Increased for convergence
+            class_weight='balanced',
+            random_state=42,
+            C=C,  # Regularization strength
+            solver='lbfgs'
+        )
+    if classifier == "sgd":
+        # partial_fit rejects class_weight='balanced', so the weights are fixed up front
+        return SGDClassifier(
+            loss='log_loss',
+            alpha=1.0 / (C * sum(class_counts.values())),
+            class_weight=balanced_class_weights(class_counts),
+            max_iter=50,
+            tol=1e-4,
+            random_state=42
+        )
+    raise ValueError(f"Unknown classifier type: {classifier} (expected one of {', '.join(CLASSIFIER_TYPES)})")
+
+
+def build_hashing_vectorizer(ngram_range: Tuple[int, int], n_features: int = DEFAULT_HASH_FEATURES) -> HashingVectorizer:
+    """Stateless term counter for out-of-core training (IDF weighting is a separate step)"""
+    return HashingVectorizer(
+        ngram_range=tuple(ngram_range),
+        n_features=n_features,
+        stop_words=BASE_VECTORIZER_PARAMS["stop_words"],
+        alternate_sign=False,
+        norm=None
+    )
+
+
+def idf_transformer(document_frequency: np.ndarray, n_documents: int) -> TfidfTransformer:
+    """
+    TF-IDF step built from streamed document frequencies
+
+    Uses the same smoothed IDF and sublinear TF as the TfidfVectorizer of
+    in-memory training. Hashed features below min_df or above max_df get a
+    zero IDF, which drops them like the vocabulary limits do.
+    """
+    idf = np.log((1 + n_documents) / (1 + document_frequency.astype(np.float64))) + 1.0
+    idf[document_frequency < BASE_VECTORIZER_PARAMS["min_df"]] = 0.0
+    idf[document_frequency > BASE_VECTORIZER_PARAMS["max_df"] * n_documents] = 0.0
+    transformer = TfidfTransformer(sublinear_tf=BASE_VECTORIZER_PARAMS["sublinear_tf"])
+    transformer.idf_ = idf
+    transformer.n_features_in_ = len(idf)
+    return transformer
+
+
+def dataset_key(*parts: Sequence[str]) -> str:
+    """Content hash of text/label sequences (e.g. a train/evaluation split)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        for value in part:
+            digest.update(str(value).encode('utf-8'))
+            digest.update(b'\x1f')
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """
+    Fitted vectorizers and their TF-IDF matrices on disk
+
+    Entries are keyed by the dataset split hash and the vectorizer params,
+    so a repeated search or training run on unchanged data skips
+    vectorization; any change to the data or params gets a new entry.
+    """
+
+    def __init__(self, cache_dir: Optional[str], key: str):
+        self.cache_dir = cache_dir
+        self.key = key
+
+    def path(self, vectorizer_params: dict) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        params = json.dumps({"dataset": self.key, **_jsonable(vectorizer_params), **BASE_VECTORIZER_PARAMS}, sort_keys=True)
+        return os.path.join(self.cache_dir, f"tfidf-{hashlib.sha256(params.encode('utf-8')).hexdigest()[:24]}.joblib")
+
+    def load_or_fit(self, vectorizer_params: dict, train_texts: List[str], eval_texts: List[str]):
+        """
+        Return (fitted vectorizer, train matrix, evaluation matrix, whether it was cached)
+        """
+        path = self.path(vectorizer_params)
+        if path and os.path.exists(path):
+            try:
+                vectorizer, X_train, X_eval = joblib.load(path)
+                return vectorizer, X_train, X_eval, True
+            except Exception as e:
+                print(f"Warning: ignoring unreadable feature cache {path}: {e}")
+
+        vectorizer = build_vectorizer(**vectorizer_params)
+        X_train = vectorizer.fit_transform(train_texts)
+        X_eval = vectorizer.transform(eval_texts)
+        if path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Concurrent runs may fit the same entry; the rename keeps readers from seeing a partial file
+            staging_path = f"{path}.{os.getpid()}.tmp"
+            joblib.dump((vectorizer, X_train, X_eval), staging_path)
+            os.replace(staging_path, path)
+        return vectorizer, X_train, X_eval, False
+
+
+def _jsonable(params: dict) -> dict:
+    return {name: list(value) if isinstance(value, tuple) else value for name, value in params.items()}
+
+
+def search_candidates(strategy: str, n_iter: int, classifiers: Optional[Sequence[str]] = None, seed: int = 42) -> List[dict]:
+    """
+    Parameter combinations to evaluate
+
+    Args:
+        strategy: "grid" (every combination of SEARCH_SPACE) or "random" (n_iter distinct samples)
+        n_iter: Number of random candidates
+        classifiers: Restrict the classifier types searched
+        seed: Random search seed
+
+    Returns:
+        List of parameter dicts with ngram_range, max_features, classifier and C
+    """
+    space = dict(SEARCH_SPACE)
+    if classifiers:
+        space["classifier"] = list(classifiers)
+    if strategy == "grid":
+        candidates = list(ParameterGrid(space))
+    elif strategy == "random":
+        total = len(ParameterGrid(space))
+        candidates = list(ParameterSampler(space, n_iter=min(n_iter, total), random_state=seed))
+    else:
+        raise ValueError(f"Unknown search strategy: {strategy}")
+    # Group candidates sharing a vectorizer, so each feature matrix is shipped to the workers together
+    return sorted(candidates, key=lambda params: json.dumps(_jsonable(params), sort_keys=True))
+
+
+def _evaluate(params: dict, X_train, y_train, X_eval, y_eval) -> dict:
+    """Fit one candidate classifier on cached features and score it on the evaluation split"""
+    start = time.perf_counter()
+    clf = build_classifier(params["classifier"], params["C"], Counter(y_train))
+    clf.fit(X_train, y_train)
+    predictions = clf.predict(X_eval)
+    return {
+        "params": _jsonable(params),
+        "macro_f1": round(float(f1_score(y_eval, predictions, average='macro')), 4),
+        "accuracy": round(float(accuracy_score(y_eval, predictions)), 4),
+        "fit_seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def _vectorize(cache: FeatureCache, vectorizer_params: dict, train_texts: List[str], eval_texts: List[str]):
+    _, X_train, X_eval, cached = cache.load_or_fit(vectorizer_params, train_texts, eval_texts)
+    return X_train, X_eval, cached
+
+
+def run_search(
+    candidates: List[dict],
+    train_texts: List[str],
+    y_train: List[str],
+    eval_texts: List[str],
+    y_eval: List[str],
+    n_jobs: int = -1,
+    cache_dir: Optional[str] = FEATURE_CACHE_DIR
+) -> List[dict]:
+    """
+    Evaluate every candidate, fitting each distinct vectorizer only once
+
+    Vectorizers are fitted (or read from the feature cache) in parallel,
+    then every classifier candidate is fitted in parallel on the shared
+    matrices, which joblib memory-maps into its worker processes.
+
+    Args:
+        candidates: Parameter dicts from search_candidates
+        train_texts, y_train: Training split
+        eval_texts, y_eval: Evaluation split used for scoring
+        n_jobs: Parallel workers (-1 for one per CPU)
+        cache_dir: Feature cache directory (None disables caching)
+
+    Returns:
+        Results sorted best first by macro F1, then accuracy
+    """
+    cache = FeatureCache(cache_dir, dataset_key(train_texts, y_train, eval_texts))
+    vectorizer_configs = []
+    for params in candidates:
+        config = {name: params[name] for name in VECTORIZER_SEARCH_PARAMS}
+        if config not in vectorizer_configs:
+            vectorizer_configs.append(config)
+
+    start = time.perf_counter()
+    features = Parallel(n_jobs=n_jobs)(
+        delayed(_vectorize)(cache, config, train_texts, eval_texts) for config in vectorizer_configs
+    )
+    cached = sum(1 for _, _, hit in features if hit)
+    print(f"Vectorized {len(vectorizer_configs)} configurations in {time.perf_counter() - start:.1f}s "
+          f"({cached} from cache)")
+
+    matrices = [(config, X_train, X_eval) for config, (X_train, X_eval, _) in zip(vectorizer_configs, features)]
+    start = time.perf_counter()
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate)(params, X_train, y_train, X_eval, y_eval)
+        for params in candidates
+        for config, X_train, X_eval in matrices
+        if all(params[name] == config[name] for name in VECTORIZER_SEARCH_PARAMS)
+    )
+    print(f"Fitted {len(results)} candidates in {time.perf_counter() - start:.1f}s")
+    return sorted(results, key=lambda result: (-result["macro_f1"], -result["accuracy"], result["fit_seconds"]))
+
+
+def format_results(results: List[dict], limit: int = 10) -> str:
+    """Table of the best search results"""
+    lines = [f"{'rank':<6}{'classifier':<12}{'C':>6}{'ngrams':>9}{'features':>10}{'macro F1':>10}{'accuracy':>10}{'fit s':>8}"]
+    for rank, result in enumerate(results[:limit], 1):
+        params = result["params"]
+        lines.append(
+            f"{rank:<6}{params['classifier']:<12}{params['C']:>6g}{'%d-%d' % tuple(params['ngram_range']):>9}"
+            f"{params['max_features']:>10}{result['macro_f1']:>10.4f}{result['accuracy']:>10.4f}{result['fit_seconds']:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def params_from_result(result: dict) -> Dict[str, object]:
+    """Candidate parameters from a search result, with tuples restored"""
+    params = dict(result["params"])
+    params["ngram_range"] = tuple(params["ngram_range"])
+    return params
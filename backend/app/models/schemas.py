@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class ResumeAnalysisRequest(BaseModel):
@@ -7,6 +7,18 @@ class ResumeAnalysisRequest(BaseModel):
     text: Optional[str] = Field(None, description="Raw resume text")
 
 
+class CategoryScore(BaseModel):
+    """A job category with its predicted probability"""
+    category: str = Field(..., description="Job category")
+    probability: float = Field(..., description="Predicted probability")
+
+
+class NearDuplicateResume(BaseModel):
+    """A previously analyzed resume that is nearly identical to this one"""
+    resume_id: str = Field(..., description="Hash of the earlier resume's text")
+    similarity: float = Field(..., description="Estimated Jaccard similarity of the word shingles (0-1)")
+
+
 class ResumeAnalysisResponse(BaseModel):
     """Response model for resume analysis"""
     name: Optional[str] = Field(None, description="Candidate name")
@@ -21,9 +33,104 @@ class ResumeAnalysisResponse(BaseModel):
     experience_level: str = Field("Junior", description="Experience level: Junior/Mid/Senior")
     classification: str = Field("", description="Job category classification")
     confidence: float = Field(0.0, description="Classification confidence score")
+    top_categories: List[CategoryScore] = Field(default_factory=list, description="Top-k categories ranked by probability (when requested)")
+    model_version: str = Field("", description="Version of the model that produced the classification")
+    near_duplicates: List[NearDuplicateResume] = Field(default_factory=list, description="Earlier resumes this one nearly duplicates, most similar first (when detection is enabled)")
+    reused_from: Optional[str] = Field(None, description="resume_id of the near-duplicate whose classification was reused instead of running the model")
+
+
+class BatchItemResult(BaseModel):
+    """Result for a single item of a batch analysis"""
+    index: int = Field(..., description="Position of the item in the batch")
+    source: str = Field(..., description="File name, archive member or text index")
+    result: Optional[ResumeAnalysisResponse] = Field(None, description="Analysis result if successful")
+    error: Optional[str] = Field(None, description="Error message if the item failed")
+
+
+class BatchAnalysisResponse(BaseModel):
+    """Response model for batch resume analysis"""
+    total: int = Field(0, description="Number of items processed")
+    succeeded: int = Field(0, description="Number of items analyzed successfully")
+    failed: int = Field(0, description="Number of items that failed")
+    results: List[BatchItemResult] = Field(default_factory=list, description="Per-item results in input order")
 
 
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str = "ok"
     message: str = "AI Resume Analyzer API is running"
+
+
+class ReadinessResponse(HealthResponse):
+    """Readiness check response"""
+    steps: Dict[str, float] = Field(default_factory=dict, description="Seconds spent in each completed warm-up step")
+    error: Optional[str] = Field(None, description="Why warm-up failed, if it did")
+
+
+class ModelVersionRequest(BaseModel):
+    """Request to activate a model version or set the shadow candidate"""
+    version: Optional[str] = Field(None, description="Registry version name (null clears the shadow model)")
+
+
+class ShadowStats(BaseModel):
+    """Agreement between the primary and the shadow model on sampled resumes"""
+    primary_version: str = Field(..., description="Version of the served model")
+    shadow_version: str = Field(..., description="Version of the candidate model")
+    compared: int = Field(0, description="Sampled resumes scored by both models")
+    agreed: int = Field(0, description="Sampled resumes given the same category")
+    agreement_rate: Optional[float] = Field(None, description="agreed / compared")
+    mean_confidence_delta: Optional[float] = Field(None, description="Mean absolute difference of the top-class confidences")
+    dropped: int = Field(0, description="Samples skipped because the shadow queue was full")
+    errors: int = Field(0, description="Samples the shadow model failed on")
+
+
+class ModelRegistryResponse(BaseModel):
+    """Served, shadow and published model versions"""
+    active_version: Optional[str] = Field(None, description="Version serving requests")
+    shadow_version: Optional[str] = Field(None, description="Candidate scored on sampled traffic, if any")
+    shadow_sample_rate: float = Field(0.0, description="Fraction of resumes scored by the shadow model")
+    versions: List[str] = Field(default_factory=list, description="Versions published in the registry")
+    shadow_stats: List[ShadowStats] = Field(default_factory=list, description="Agreement per primary/shadow version pair")
+
+
+class ResumeMatch(BaseModel):
+    """A stored resume ranked against a job description"""
+    resume_id: str = Field(..., description="Hash of the resume text")
+    score: float = Field(..., description="Cosine similarity to the query (-1 to 1)")
+    name: Optional[str] = Field(None, description="Candidate name")
+    email: Optional[str] = Field(None, description="Candidate email")
+    classification: str = Field("", description="Job category classification")
+    experience_level: str = Field("", description="Experience level: Junior/Mid/Senior")
+    experience_years: float = Field(0.0, description="Total years of experience")
+
+
+class JobMatch(BaseModel):
+    """A stored job description ranked against a resume"""
+    job_id: str = Field(..., description="Job id given when the job description was stored")
+    score: float = Field(..., description="Cosine similarity to the query (-1 to 1)")
+    title: Optional[str] = Field(None, description="Job title")
+
+
+class ResumeMatchResponse(BaseModel):
+    """Stored resumes most similar to a job description"""
+    searched: int = Field(0, description="Resumes in the index")
+    matches: List[ResumeMatch] = Field(default_factory=list, description="Best matches first")
+
+
+class JobMatchResponse(BaseModel):
+    """Stored job descriptions most similar to a resume"""
+    searched: int = Field(0, description="Job descriptions in the index")
+    matches: List[JobMatch] = Field(default_factory=list, description="Best matches first")
+
+
+class JobStoredResponse(BaseModel):
+    """Result of storing a job description"""
+    job_id: str = Field(..., description="Job id")
+    jobs: int = Field(0, description="Job descriptions in the index")
+
+
+class MatchIndexStats(BaseModel):
+    """Size and projection of the match index"""
+    resumes: int = Field(0, description="Stored resumes")
+    jobs: int = Field(0, description="Stored job descriptions")
+    projection: dict = Field(default_factory=dict, description="Dimensions, fitting corpus and source model of the SVD projection")
@@ -0,0 +1,80 @@
+"""
+Admin Router
+Model registry endpoints: list versions, activate a version, set the shadow candidate
+"""
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from app.config import ADMIN_TOKEN
+from app.models.schemas import ModelRegistryResponse, ModelVersionRequest
+from app.services.shadow import get_shadow_scorer
+from app.ml.classifier import (
+    activate_model_version, set_shadow_model_version, get_model_version, get_shadow_model_version,
+    list_model_versions, ModelNotAvailableError
+)
+from app.ml.registry import UnknownModelVersionError
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """Reject requests without the configured X-Admin-Token; 404 when ADMIN_TOKEN is unset"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token header.")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_token)])
+
+
+def _registry_state() -> ModelRegistryResponse:
+    """Served and shadow versions, published versions and shadow agreement (blocking)"""
+    try:
+        active_version = get_model_version()
+    except ModelNotAvailableError:
+        active_version = None
+    scorer = get_shadow_scorer()
+    return ModelRegistryResponse(
+        active_version=active_version,
+        shadow_version=get_shadow_model_version(),
+        shadow_sample_rate=scorer.sample_rate,
+        versions=list_model_versions(),
+        shadow_stats=scorer.stats()
+    )
+
+
+async def _change_models(fn, version: Optional[str]) -> ModelRegistryResponse:
+    """Load and swap models on a worker thread while requests keep being served"""
+    try:
+        await run_in_threadpool(fn, version)
+    except UnknownModelVersionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Failed to load model version {version}: {e}")
+    return await run_in_threadpool(_registry_state)
+
+
+@router.get("/models", response_model=ModelRegistryResponse)
+async def list_models():
+    """Served and shadow versions, published versions and shadow agreement statistics"""
+    return await run_in_threadpool(_registry_state)
+
+
+@router.post("/models/activate", response_model=ModelRegistryResponse)
+async def activate_model(request: ModelVersionRequest):
+    """
+    Load a published version and swap it in as the served model
+
+    The previous model serves requests until the new one is loaded and
+    warmed. The registry's ACTIVE pointer is updated too, so other server
+    processes follow on their next watch interval.
+    """
+    if not request.version:
+        raise HTTPException(status_code=400, detail="Please provide the version to activate.")
+    return await _change_models(activate_model_version, request.version)
+
+
+@router.post("/models/shadow", response_model=ModelRegistryResponse)
+async def set_shadow_model(request: ModelVersionRequest):
+    """Set the candidate scored on a SHADOW_SAMPLE_RATE fraction of traffic, or clear it with null"""
+    return await _change_models(set_shadow_model_version, request.version)
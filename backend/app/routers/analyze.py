@@ -1,149 +1,522 @@
 """
 Resume Analysis Router
-Provides the /analyze endpoint for resume processing
+Provides the /analyze and /analyze/batch endpoints for resume processing
 """
+import asyncio
+import io
+import zipfile
+import zlib
 from fastapi import APIRouter, File, Form, UploadFile, HTTPException
-from typing import Optional
-from app.models.schemas import ResumeAnalysisResponse
-from app.services.pdf_extractor import extract_text_from_pdf, extract_text_from_docx
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from typing import List, Optional, Tuple
+from app.config import BATCH_MAX_ITEMS, BATCH_REQUEST_MAX_BYTES, MATCH_INDEX_DIR, MATCH_INDEX_ANALYZED, DEDUP_REUSE_THRESHOLD
+from app.models.schemas import ResumeAnalysisResponse, BatchAnalysisResponse, BatchItemResult, NearDuplicateResume
+from app.services.cache import get_result_cache, content_digest, text_digest, make_cache_key, ResultCache
+from app.services.dedup import get_dedup_index
+from app.services.executor import get_executor
+from app.services.metrics import STAGE_ERRORS, NEAR_DUPLICATES
+from app.services.pdf_extractor import FileSource
+from app.services.uploads import (
+    receive_upload, content_type_error, check_text_length, check_file_type, check_docx, count_input, input_type_of,
+    upload_limit, SpooledUpload, UploadTooLargeError, UploadTypeError, SUPPORTED_FILE_TYPES, BATCH_FILE_TYPES,
+    SNIFF_BYTES
+)
+from app.services.pipeline import (
+    run_stage, extract_resume_text, validate_resume_text, classify_resumes, resume_index_item,
+    borrow_classification, build_borrowed_response, BorrowedClassification
+)
 from app.services.resume_parser import parse_resume
-from app.ml.classifier import classify_resume, get_experience_level
-
+from app.ml.classifier import get_model_version
+from app.ml.matcher import add_resumes
 
 router = APIRouter()
 
 
+async def cache_get(cache: ResultCache, keys: List[str]) -> List[Optional[dict]]:
+    """
+    Look keys up in the result cache without blocking the event loop
+
+    Memory-tier hits are answered inline; the misses go to the SQLite tier
+    (when enabled) in one call on a worker thread.
+    """
+    values = [cache.peek(key) for key in keys]
+    missing = [i for i, value in enumerate(values) if value is None]
+    if missing:
+        def lookup() -> List[Optional[dict]]:
+            return [cache.get(keys[i]) for i in missing]
+
+        for i, value in zip(missing, await run_in_threadpool(lookup) if cache.persistent else lookup()):
+            values[i] = value
+    return values
+
+
+async def lookup_cached_result(digest: str, top_k: int) -> Optional[ResumeAnalysisResponse]:
+    """Return the cached response for a content digest under the served model version, if any"""
+    cache = get_result_cache()
+    if cache is None:
+        return None
+
+    # Resolved off the event loop because the first call loads the model
+    model_version = await run_stage("classify.model_version", get_model_version)
+    cached = (await cache_get(cache, [make_cache_key(digest, model_version, top_k)]))[0]
+    return ResumeAnalysisResponse(**cached) if cached is not None else None
+
+
+async def store_cached_result(digest: str, top_k: int, response: ResumeAnalysisResponse):
+    """
+    Store an analysis result under the version of the model that produced it
+
+    Keyed by the response's own model_version rather than the one seen at
+    lookup, so a swap in between cannot file a new model's result under the old version.
+    The SQLite tier (when enabled) is written on a worker thread.
+    """
+    cache = get_result_cache()
+    if cache is not None:
+        key = make_cache_key(digest, response.model_version, top_k)
+        value = jsonable_encoder(response)
+        if cache.persistent:
+            await run_in_threadpool(cache.set, key, value)
+        else:
+            cache.set(key, value)
+
+
+async def check_near_duplicates(
+    digest: str, resume_text: str, top_k: int
+) -> Tuple[List[NearDuplicateResume], Optional[BorrowedClassification]]:
+    """
+    Look a resume up among the resumes analyzed before (when DEDUP_ENABLED)
+
+    A resume with no near-duplicate is added to the index. When one is at
+    least DEDUP_REUSE_THRESHOLD similar and its result is still cached under
+    the served model version, its classification is borrowed instead of
+    running the model. The resume is still parsed, so its name, contact
+    details and experience are its own.
+
+    Args:
+        digest: Content digest the resume's own result is cached under
+        resume_text: Extracted resume text
+        top_k: Requested number of ranked categories
+
+    Returns:
+        (near-duplicates, most similar first; the borrowed classification or None)
+    """
+    index = get_dedup_index()
+    if index is None:
+        return [], None
+    resubmission, duplicates = await run_stage(
+        "dedup", index.check_and_add, text_digest(resume_text), resume_text, digest
+    )
+    if not duplicates:
+        # The same text analyzed again is not its own near-duplicate
+        NEAR_DUPLICATES.inc(outcome="resubmitted" if resubmission else "unique")
+        return [], None
+    near_duplicates = [
+        NearDuplicateResume(resume_id=duplicate.resume_id, similarity=duplicate.similarity) for duplicate in duplicates
+    ]
+
+    cache = get_result_cache()
+    if DEDUP_REUSE_THRESHOLD > 0 and cache is not None:
+        model_version = await run_stage("classify.model_version", get_model_version)
+        reusable = [
+            duplicate for duplicate in duplicates
+            if duplicate.similarity >= DEDUP_REUSE_THRESHOLD and duplicate.result_digest
+        ]
+        hits = await cache_get(
+            cache, [make_cache_key(duplicate.result_digest, model_version, top_k) for duplicate in reusable]
+        )
+        for duplicate, cached in zip(reusable, hits):
+            if cached is not None:
+                NEAR_DUPLICATES.inc(outcome="reused")
+                return near_duplicates, borrow_classification(duplicate.resume_id, cached)
+    NEAR_DUPLICATES.inc(outcome="duplicate")
+    return near_duplicates, None
+
+
+async def index_analyzed_resumes(entries: List[Tuple[str, ResumeAnalysisResponse]]):
+    """Store analyzed (text, response) pairs in the match index; failures are logged and the analysis still succeeds"""
+    if not MATCH_INDEX_DIR or not MATCH_INDEX_ANALYZED or not entries:
+        return
+    try:
+        await run_stage("match.index", add_resumes, [resume_index_item(*entry) for entry in entries])
+    except Exception as e:
+        print(f"Warning: analyzed resumes not added to the match index: {e}")
+
+
 @router.post("/analyze", response_model=ResumeAnalysisResponse)
 async def analyze_resume(
     file: Optional[UploadFile] = File(None, description="PDF or DOCX resume file"),
-    text: Optional[str] = Form(None, description="Raw resume text")
+    text: Optional[str] = Form(None, description="Raw resume text"),
+    top_k: int = Form(0, ge=0, description="Number of ranked categories to return")
 ):
     """
     Analyze a resume and extract key information
-    
+
     - **file**: Upload a PDF or DOCX resume file
     - **text**: Or provide raw resume text
-    
+    - **top_k**: Optionally return the top-k categories with probabilities
+
     Returns extracted information, job classification, and experience level.
     """
     resume_text = None
-    
+    digest = None
+
     # Process file upload
     if file:
         # Validate file type
         filename = file.filename.lower() if file.filename else ""
-        
-        if filename.endswith('.pdf'):
-            try:
-                content = await file.read()
-                resume_text = extract_text_from_pdf(content)
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to process PDF file: {str(e)}"
-                )
-        elif filename.endswith('.docx'):
-            try:
-                content = await file.read()
-                resume_text = extract_text_from_docx(content)
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to process DOCX file: {str(e)}"
-                )
-        else:
+
+        if not filename.endswith(SUPPORTED_FILE_TYPES):
             raise HTTPException(
                 status_code=400,
                 detail="Unsupported file type. Please upload a PDF or DOCX file."
             )
+        upload = await receive_upload(file, filename)
+        digest = upload.digest
+        try:
+            cached = await lookup_cached_result(digest, top_k)
+            if cached is not None:
+                return cached
+            resume_text = await extract_resume_text(filename, upload.source)
+        finally:
+            upload.cleanup()
     elif text:
+        check_text_length(text)
         resume_text = text.strip()
+        count_input("text", len(resume_text))
+        digest = text_digest(resume_text)
+        cached = await lookup_cached_result(digest, top_k)
+        if cached is not None:
+            return cached
     else:
         raise HTTPException(
             status_code=400,
             detail="Please provide either a file upload or text input."
         )
-    
+
     # Validate text content
-    if not resume_text or len(resume_text) < 50:
+    resume_text = validate_resume_text(resume_text)
+
+    # Report near-duplicates of earlier resumes, or borrow the classification of one
+    near_duplicates, borrowed = await check_near_duplicates(digest, resume_text, top_k)
+
+    # Parse resume
+    parsed_data = await run_stage("parse", parse_resume, resume_text, cpu_bound=True)
+    if borrowed is not None:
+        # Not cached under this digest: the classification belongs to the near-duplicate
+        response = build_borrowed_response(parsed_data, borrowed)
+        response.near_duplicates = near_duplicates
+        return response
+
+    # Classify resume
+    response = (await run_stage("classify", classify_resumes, [resume_text], [parsed_data], top_k))[0]
+    response.near_duplicates = near_duplicates
+    await store_cached_result(digest, top_k, response)
+    await index_analyzed_resumes([(resume_text, response)])
+    return response
+
+
+def _open_archive(archive_name: str, content) -> zipfile.ZipFile:
+    """Open a zip archive from bytes, a path or a file object, rejecting invalid ones with 400"""
+    try:
+        return zipfile.ZipFile(io.BytesIO(content) if isinstance(content, bytes) else content)
+    except zipfile.BadZipFile:
         raise HTTPException(
             status_code=400,
-            detail="Resume content is too short or empty. Please provide a valid resume."
+            detail=f"Failed to open zip archive: {archive_name}"
         )
-    
-    # Parse resume
-    parsed_data = parse_resume(resume_text)
-    
-    # Classify resume
-    classification, confidence = classify_resume(resume_text)
-    
-
-    
-    # Calculate Relevant vs Other Experience
-    breakdown = parsed_data.get("experience_breakdown", [])
-    relevant_years = 0.0
-    other_years = 0.0
-    
-    # Define keywords for each category
-    # Categories: "Software Engineer", "Data Scientist", "AI Engineer", "Web Developer", 
-    # "Mobile App Developer", "DevOps Engineer", "Full Stack Developer"
-    # "Cloud Architect", "Database Administrator", "Cybersecurity Analyst", "QA Engineer", "Network Engineer"
-    category_keywords = {
-        "Web Developer": ["web", "frontend", "front-end", "front end", "backend", "back-end", "back end", "fullstack", "full-stack", "full stack", "react", "node", "js", "html", "css", "django", "laravel", "developer", "engineer", "software", "freelance"],
-        "Full Stack Developer": ["fullstack", "full-stack", "full stack", "web", "frontend", "backend", "react", "node", "django", "software", "developer", "engineer"],
-        "Software Engineer": ["software", "engineer", "developer", "programmer", "system", "application", "tech", "stack"],
-        "AI Engineer": ["ai", "machine learning", "ml", "deep learning", "dl", "nlp", "computer vision", "data scientist", "model", "algorithm"],
-        "Data Scientist": ["data", "scientist", "analyst", "ml", "ai", "python", "statistics", "research"],
-        "Machine Learning Engineer": ["machine learning", "ml", "ai", "model", "algorithm", "engineer"],
-        "DevOps Engineer": ["devops", "cloud", "aws", "azure", "docker", "kubernetes", "ci/cd", "infrastructure", "systems"],
-        "Cloud Architect": ["cloud", "architect", "aws", "azure", "gcp", "infrastructure"],
-        "Mobile App Developer": ["mobile", "android", "ios", "flutter", "react native", "swift", "kotlin", "app"],
-        "QA Engineer": ["qa", "quality", "test", "automation", "selenium", "assurance"],
-        "Cybersecurity Analyst": ["security", "cyber", "analyst", "network", "protection", "info"],
-    }
-    
-    target_keywords = category_keywords.get(classification, [])
-    # Fallback to generic if not found specific
-    if not target_keywords:
-        target_keywords = classification.lower().split()
-
-    for item in breakdown:
-        title = item["title"].lower()
-        years = item["years"]
-        # Check matches
-        matched = False
-        for kw in target_keywords:
-            if kw.lower() in title:
-                matched = True
-                break
-        
-        if matched:
-            relevant_years += years
+
+
+def _batch_members(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """Archive members analyzed as batch items"""
+    return [
+        info for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith('__MACOSX/')
+        and info.filename.lower().endswith(BATCH_FILE_TYPES)
+    ]
+
+
+def _archive_too_large(error: UploadTooLargeError) -> HTTPException:
+    """413 for zip archive content over a size limit"""
+    STAGE_ERRORS.inc(stage="read", reason="too_large")
+    return HTTPException(status_code=413, detail=str(error))
+
+
+def _check_member_size(archive_name: str, info: zipfile.ZipInfo, size: int):
+    """Reject an archive member of size bytes over the upload limit of its file type with 413"""
+    limit = upload_limit(input_type_of(info.filename.lower()))
+    if limit and size > limit:
+        raise _archive_too_large(UploadTooLargeError(limit, f"Archive member {archive_name}/{info.filename}"))
+
+
+def _unpacked_too_large() -> HTTPException:
+    """413 for a batch whose archives unpack to more than BATCH_REQUEST_MAX_BYTES"""
+    return _archive_too_large(UploadTooLargeError(BATCH_REQUEST_MAX_BYTES, "Unpacked content of the zip archives"))
+
+
+def _scan_archive(archive_name: str, fileobj) -> Tuple[int, int]:
+    """
+    Count the batch items of an uploaded zip archive from its central directory only
+
+    A file that is not a zip archive is rejected with 415, as when spooling it,
+    and members declaring more bytes than their upload limit with 413.
+
+    Returns:
+        (number of items, declared uncompressed bytes)
+    """
+    head = fileobj.read(SNIFF_BYTES)
+    fileobj.seek(0)
+    try:
+        check_file_type("zip", head)
+    except UploadTypeError as e:
+        raise content_type_error(e)
+    with _open_archive(archive_name, fileobj) as archive:
+        members = _batch_members(archive)
+    for info in members:
+        _check_member_size(archive_name, info, info.file_size)
+    return len(members), sum(info.file_size for info in members)
+
+
+def _read_member(archive_name: str, archive: zipfile.ZipFile, info: zipfile.ZipInfo, budget: Optional[int]) -> bytes:
+    """
+    Decompress one archive member, reading at most one byte past its limits
+
+    Declared sizes can lie, so the read itself is bounded by the member's
+    upload limit and the unpacked bytes left in the batch budget (None for no budget).
+    """
+    member_limit = upload_limit(input_type_of(info.filename.lower()))
+    limits = ([member_limit] if member_limit else []) + ([budget] if budget is not None else [])
+    try:
+        with archive.open(info) as member:
+            content = member.read(min(limits) + 1 if limits else -1)
+    except (zipfile.BadZipFile, zlib.error, NotImplementedError, RuntimeError):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Failed to read {info.filename} from zip archive: {archive_name}"
+        )
+    _check_member_size(archive_name, info, len(content))
+    return content
+
+
+def _expand_archive(
+    archive_name: str, content: FileSource, budget: Optional[int] = None
+) -> List[Tuple[str, str, bytes, str]]:
+    """
+    List (source, filename, content, digest) for every supported member of a zip archive
+
+    Args:
+        archive_name: Archive name used in sources and error messages
+        content: Archive bytes or path
+        budget: Unpacked bytes the archive may hold, rejected with 413 past it (None for no limit)
+    """
+    members = []
+    unpacked = 0
+    with _open_archive(archive_name, content) as archive:
+        for info in _batch_members(archive):
+            member_name = info.filename
+            member_content = _read_member(archive_name, archive, info, None if budget is None else budget - unpacked)
+            unpacked += len(member_content)
+            if budget is not None and unpacked > budget:
+                raise _unpacked_too_large()
+            count_input(input_type_of(member_name.lower()), len(member_content))
+            members.append((
+                f"{archive_name}/{member_name}",
+                member_name.lower(),
+                member_content,
+                content_digest(member_content)
+            ))
+    return members
+
+
+async def _prepare_batch_item(filename: Optional[str], payload, digest: str, top_k: int, limiter: asyncio.Semaphore):
+    """
+    Extract (for files) and parse one batch item
+
+    Returns:
+        (text, parsed_data, near-duplicates, classification borrowed from a near-duplicate or None)
+    """
+    async with limiter:
+        if filename is None:
+            resume_text = payload.strip()
+        elif filename.endswith(BATCH_FILE_TYPES):
+            if isinstance(payload, bytes):
+                # Archive members were not sniffed while spooling
+                try:
+                    check_file_type(input_type_of(filename), payload)
+                    if filename.endswith('.docx'):
+                        check_docx(payload)
+                except UploadTypeError as e:
+                    raise content_type_error(e)
+            resume_text = await extract_resume_text(filename, payload)
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Unsupported file type. Please upload a PDF, DOCX, TXT or ZIP file."
+            )
+        resume_text = validate_resume_text(resume_text)
+        near_duplicates, borrowed = await check_near_duplicates(digest, resume_text, top_k)
+        parsed_data = await run_stage("parse", parse_resume, resume_text, cpu_bound=True)
+        return resume_text, parsed_data, near_duplicates, borrowed
+
+
+async def _analyze_batch_items(
+    files: Optional[List[UploadFile]],
+    texts: Optional[List[str]],
+    top_k: int,
+    uploads: List[SpooledUpload]
+) -> BatchAnalysisResponse:
+    """Collect, extract, parse and classify batch items, registering spooled uploads for cleanup"""
+    for blob in texts or []:
+        check_text_length(blob)
+
+    # Count the items and unpacked archive bytes before any upload is spooled or archive
+    # member decompressed, so an oversized batch fails fast; archives are scanned from
+    # their central directory
+    item_count = len(texts or [])
+    unpacked_size = 0
+    for file in files or []:
+        if item_count > BATCH_MAX_ITEMS:
+            break
+        if (file.filename or "").lower().endswith('.zip'):
+            member_count, member_bytes = await run_in_threadpool(_scan_archive, file.filename, file.file)
+            await file.seek(0)
+            item_count += member_count
+            unpacked_size += member_bytes
+            if BATCH_REQUEST_MAX_BYTES and unpacked_size > BATCH_REQUEST_MAX_BYTES:
+                raise _unpacked_too_large()
         else:
-            other_years += years
-    
-    # If no breakdown found (e.g. no dates), assume all is relevant if total > 0? 
-    # Or just keep it as is.
-    if not breakdown and parsed_data["experience_years"] > 0:
-         # If classification matches skills/text, assume relevant?
-         # Simplified: If no breakdown, we can't split.
-         relevant_years = parsed_data["experience_years"]
-
-    # Get experience level based on RELEVANT experience
-    experience_level = get_experience_level(relevant_years)
-
-    # Build response
-    return ResumeAnalysisResponse(
-        name=parsed_data["name"],
-        email=parsed_data["email"],
-        phone=parsed_data["phone"],
-        skills=parsed_data["skills"],
-        education=parsed_data["education"],
-        experience_years=parsed_data["experience_years"],
-        relevant_experience_years=round(relevant_years, 1),
-        other_experience_years=round(other_years, 1),
-        experience_breakdown=breakdown,
-        experience_level=experience_level,
-        classification=classification,
-        confidence=confidence
+            item_count += 1
+    if not item_count:
+        raise HTTPException(
+            status_code=400,
+            detail="Please provide at least one file upload or text input."
+        )
+    if item_count > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many resumes in one batch ({item_count} or more). The limit is {BATCH_MAX_ITEMS}."
+        )
+
+    # Collect (source, filename, payload, digest); filename is None for text items
+    items = []
+    unpacked_budget = BATCH_REQUEST_MAX_BYTES or None
+    for file in files or []:
+        source = file.filename or f"file[{len(items)}]"
+        filename = source.lower()
+        upload = await receive_upload(file, filename)
+        uploads.append(upload)
+        if filename.endswith('.zip'):
+            members = await run_stage("extract", _expand_archive, source, upload.source, unpacked_budget)
+            if unpacked_budget is not None:
+                unpacked_budget -= sum(len(member[2]) for member in members)
+            items.extend(members)
+        else:
+            items.append((source, filename, upload.source, upload.digest))
+    for i, blob in enumerate(texts or []):
+        count_input("text", len(blob))
+        items.append((f"text[{i}]", None, blob, text_digest(blob)))
+
+    # Serve repeated submissions from the result cache
+    cached = {}
+    cache = get_result_cache()
+    if cache is not None:
+        model_version = await run_stage("classify.model_version", get_model_version)
+        hits = await cache_get(cache, [make_cache_key(digest, model_version, top_k) for _, _, _, digest in items])
+        for i, hit in enumerate(hits):
+            if hit is not None:
+                cached[i] = ResumeAnalysisResponse(**hit)
+    pending = [i for i in range(len(items)) if i not in cached]
+
+    # Extract and parse concurrently, holding at most one executor slot per CPU worker
+    # so a large batch does not exhaust the pending budget shared with other requests
+    limiter = asyncio.Semaphore(get_executor().cpu_workers)
+    outcomes = await asyncio.gather(
+        *(_prepare_batch_item(items[i][1], items[i][2], items[i][3], top_k, limiter) for i in pending),
+        return_exceptions=True
     )
+    prepared = dict(zip(pending, outcomes))
+
+    # Classify every successfully parsed resume in one call; near-duplicates
+    # with a borrowed classification need no model call
+    ok_indices = [i for i in pending if not isinstance(prepared[i], BaseException)]
+    unclassified = [i for i in ok_indices if prepared[i][3] is None]
+    responses = await run_stage(
+        "classify", classify_resumes,
+        [prepared[i][0] for i in unclassified], [prepared[i][1] for i in unclassified], top_k
+    )
+    classified = dict(zip(unclassified, responses))
+
+    results = []
+    analyzed = []
+    for i, (source, _, _, digest) in enumerate(items):
+        if i in cached:
+            results.append(BatchItemResult(index=i, source=source, result=cached[i]))
+            continue
+        outcome = prepared[i]
+        if isinstance(outcome, HTTPException):
+            results.append(BatchItemResult(index=i, source=source, error=outcome.detail))
+        elif isinstance(outcome, BaseException):
+            results.append(BatchItemResult(index=i, source=source, error=f"Failed to analyze resume: {str(outcome)}"))
+        elif outcome[3] is not None:
+            response = build_borrowed_response(outcome[1], outcome[3])
+            response.near_duplicates = outcome[2]
+            results.append(BatchItemResult(index=i, source=source, result=response))
+        else:
+            response = classified[i]
+            response.near_duplicates = outcome[2]
+            await store_cached_result(digest, top_k, response)
+            analyzed.append((outcome[0], response))
+            results.append(BatchItemResult(index=i, source=source, result=response))
+    await index_analyzed_resumes(analyzed)
+
+    succeeded = len(ok_indices) + len(cached)
+    return BatchAnalysisResponse(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
+
+
+@router.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_resume_batch(
+    files: Optional[List[UploadFile]] = File(None, description="PDF, DOCX, TXT or ZIP files"),
+    texts: Optional[List[str]] = Form(None, description="Raw resume texts"),
+    top_k: int = Form(0, ge=0, description="Number of ranked categories to return per resume")
+):
+    """
+    Analyze many resumes in one request
+
+    - **files**: PDF, DOCX or TXT resume files, or zip archives of them
+    - **texts**: Raw resume texts
+    - **top_k**: Optionally return the top-k categories with probabilities
+
+    Items are extracted and parsed concurrently and classified together in a
+    single model call. Each result carries either the analysis or its error.
+    """
+    # Spooled uploads (temp files) are removed once the batch is done
+    uploads: List[SpooledUpload] = []
+    try:
+        return await _analyze_batch_items(files, texts, top_k, uploads)
+    finally:
+        for upload in uploads:
+            upload.cleanup()
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Result cache hit/miss counters and tier sizes"""
+    cache = get_result_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **await run_in_threadpool(cache.stats)}
+
+
+@router.get("/dedup/stats")
+async def dedup_stats():
+    """Resumes stored in the near-duplicate index and lookup counters"""
+    index = get_dedup_index()
+    if index is None:
+        return {"enabled": False}
+    return {"enabled": True, **await run_stage("dedup.stats", index.stats)}
@@ -0,0 +1,144 @@
+"""
+Resume Matching Router
+Ranks stored resumes against a job description and stored job descriptions against a resume
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from app.config import MATCH_INDEX_DIR, MATCH_MAX_RESULTS
+from app.models.schemas import (
+    ResumeMatch, ResumeMatchResponse, JobMatch, JobMatchResponse, JobStoredResponse, MatchIndexStats
+)
+from app.services.pipeline import run_stage, extract_resume_text, validate_resume_text
+from app.services.uploads import receive_upload, check_text_length, SUPPORTED_FILE_TYPES
+from app.ml.matcher import match, put_job, index_stats, MatchIndexNotAvailableError, RESUMES, JOBS
+
+
+def require_match_index():
+    """404 for every /match endpoint when MATCH_INDEX_DIR is unset"""
+    if not MATCH_INDEX_DIR:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+router = APIRouter(prefix="/match", dependencies=[Depends(require_match_index)])
+
+# Longest job id accepted
+MAX_JOB_ID_CHARS = 128
+
+
+async def run_match_stage(stage: str, fn, *args):
+    """run_stage for index work, reporting an index without a projection as 503"""
+    try:
+        return await run_stage(stage, fn, *args)
+    except MatchIndexNotAvailableError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+
+def _query_text(text: Optional[str], field: str) -> str:
+    text = (text or "").strip()
+    if not text:
+        raise HTTPException(status_code=400, detail=f"Please provide a non-empty {field}.")
+    check_text_length(text, field.capitalize())
+    return text
+
+
+@router.post("/resumes", response_model=ResumeMatchResponse)
+async def match_resumes(
+    text: Optional[str] = Form(None, description="Job description"),
+    job_id: Optional[str] = Form(None, description="Or the id of a stored job description"),
+    top_n: int = Form(10, ge=1, le=MATCH_MAX_RESULTS, description="Number of resumes to return")
+):
+    """
+    Find the stored resumes most similar to a job description
+
+    - **text**: Job description text
+    - **job_id**: Or a job description stored with PUT /match/jobs/{job_id}
+    - **top_n**: Number of resumes to return
+
+    Resumes are stored as they are analyzed.
+    """
+    if job_id:
+        found = await run_match_stage("match.search", match, RESUMES, top_n, None, (JOBS, job_id))
+        if found is None:
+            raise HTTPException(status_code=404, detail=f"Job description {job_id!r} not found.")
+    else:
+        found = await run_match_stage("match.search", match, RESUMES, top_n, _query_text(text, "job description"))
+    matches, searched = found
+    return ResumeMatchResponse(
+        searched=searched,
+        matches=[ResumeMatch(resume_id=item.pop("id"), **item) for item in matches]
+    )
+
+
+@router.post("/jobs", response_model=JobMatchResponse)
+async def match_jobs(
+    file: Optional[UploadFile] = File(None, description="PDF or DOCX resume file"),
+    text: Optional[str] = Form(None, description="Or raw resume text"),
+    resume_id: Optional[str] = Form(None, description="Or the id of a stored resume"),
+    top_n: int = Form(10, ge=1, le=MATCH_MAX_RESULTS, description="Number of job descriptions to return")
+):
+    """
+    Find the stored job descriptions most similar to a resume
+
+    - **file**: Upload a PDF or DOCX resume file
+    - **text**: Or provide raw resume text
+    - **resume_id**: Or the resume_id of a stored resume (returned by /match/resumes)
+    - **top_n**: Number of job descriptions to return
+    """
+    if resume_id:
+        found = await run_match_stage("match.search", match, JOBS, top_n, None, (RESUMES, resume_id))
+        if found is None:
+            raise HTTPException(status_code=404, detail=f"Resume {resume_id!r} not found.")
+    else:
+        if file:
+            filename = file.filename.lower() if file.filename else ""
+            if not filename.endswith(SUPPORTED_FILE_TYPES):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Unsupported file type. Please upload a PDF or DOCX file."
+                )
+            upload = await receive_upload(file, filename)
+            try:
+                resume_text = await extract_resume_text(filename, upload.source)
+            finally:
+                upload.cleanup()
+        elif text:
+            check_text_length(text)
+            resume_text = text.strip()
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Please provide a file upload, text input or resume_id."
+            )
+        resume_text = validate_resume_text(resume_text)
+        found = await run_match_stage("match.search", match, JOBS, top_n, resume_text)
+    matches, searched = found
+    return JobMatchResponse(
+        searched=searched,
+        matches=[JobMatch(job_id=item.pop("id"), **item) for item in matches]
+    )
+
+
+@router.put("/jobs/{job_id}", response_model=JobStoredResponse)
+async def store_job(
+    job_id: str,
+    text: Optional[str] = Form(None, description="Job description"),
+    title: Optional[str] = Form(None, description="Job title")
+):
+    """
+    Store a job description under an id, replacing the one stored before
+
+    Stored job descriptions are ranked by POST /match/jobs and can be used
+    as the query of POST /match/resumes.
+    """
+    if len(job_id) > MAX_JOB_ID_CHARS:
+        raise HTTPException(status_code=400, detail=f"Job ids are at most {MAX_JOB_ID_CHARS} characters.")
+    description = _query_text(text, "job description")
+    jobs = await run_match_stage("match.index", put_job, job_id, description, {"title": title})
+    return JobStoredResponse(job_id=job_id, jobs=jobs)
+
+
+@router.get("/stats", response_model=MatchIndexStats)
+async def match_stats():
+    """Stored resumes and job descriptions, and the projection they were embedded with"""
+    return MatchIndexStats(**await run_match_stage("match.stats", index_stats))
+
@@ -0,0 +1,170 @@
+"""
+Result Cache Service
+Content-addressed cache of analysis results with an in-process LRU tier
+and an optional SQLite tier that survives restarts
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.config import (
+    RESULT_CACHE_ENABLED, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL,
+    RESULT_CACHE_DB_PATH, RESULT_CACHE_DB_TTL
+)
+
+
+# Bump when parsing or response changes make previously cached results stale
+CACHE_FORMAT_VERSION = 8
+
+
+def content_digest(content: bytes) -> str:
+    """Hash raw uploaded bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def text_digest(text: str) -> str:
+    """Hash resume text after normalizing whitespace"""
+    normalized = ' '.join(text.split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def make_cache_key(digest: str, model_version: str, top_k: int = 0) -> str:
+    """Build a cache key from a content digest, the model version and request options"""
+    return f"v{CACHE_FORMAT_VERSION}:{model_version}:{digest}:k{top_k}"
+
+
+class ResultCache:
+    """
+    Two-tier result cache
+
+    The memory tier is an LRU bounded by entry count with per-entry TTL.
+    The disk tier is a SQLite table with its own TTL; disk hits are promoted
+    back into memory. With a disk tier, get, set and stats block on SQLite,
+    so async callers run them on a thread and answer memory hits with peek.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, db_path: str = "", db_ttl: float = 0.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.db_ttl = db_ttl
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._counters = {
+            "hits": 0, "disk_hits": 0, "misses": 0,
+            "sets": 0, "evictions": 0, "expirations": 0,
+        }
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM results WHERE expires_at < ?", (time.time(),))
+
+    @property
+    def persistent(self) -> bool:
+        """Whether the SQLite tier is enabled"""
+        return self._db is not None
+
+    def peek(self, key: str) -> Optional[dict]:
+        """Return the value for a key from the memory tier only (a miss is not counted)"""
+        with self._lock:
+            return self._get_memory(key, time.time())
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached value for a key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            value = self._get_memory(key, now)
+            if value is not None:
+                return value
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM results WHERE key = ? AND expires_at >= ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._store(key, value, now)
+                    self._counters["disk_hits"] += 1
+                    return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: dict):
+        """Store a JSON-serializable value in both tiers"""
+        now = time.time()
+        with self._lock:
+            self._store(key, value, now)
+            self._counters["sets"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), now + self.db_ttl)
+                )
+
+    def _get_memory(self, key: str, now: float) -> Optional[dict]:
+        # Caller holds the lock
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at >= now:
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+        del self._entries[key]
+        self._counters["expirations"] += 1
+        return None
+
+    def _store(self, key: str, value: dict, now: float):
+        # Caller holds the lock
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+
+    def stats(self) -> dict:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._entries)
+            if self._db is not None:
+                stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+# Singleton cache, None when caching is disabled
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Return the shared result cache, or None if caching is disabled"""
+    global _cache
+
+    if _cache is None and RESULT_CACHE_ENABLED:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache(
+                    RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL, RESULT_CACHE_DB_PATH, RESULT_CACHE_DB_TTL
+                )
+    return _cache
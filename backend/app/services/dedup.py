@@ -0,0 +1,210 @@
+"""
+Near-Duplicate Detection Service
+MinHash signatures of resume text shingles, looked up in a banded LSH index stored in SQLite
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from typing import List, NamedTuple, Optional
+import numpy as np
+from app.config import DEDUP_ENABLED, DEDUP_DB_PATH, DEDUP_THRESHOLD
+from app.services.pdf_extractor import clean_text
+
+
+# Words per shingle; small edits change few 3-word shingles of a resume-length text
+SHINGLE_WORDS = 3
+# MinHash permutations, split into BANDS bands of ROWS rows. Two texts with Jaccard
+# similarity s share at least one band with probability 1 - (1 - s^ROWS)^BANDS:
+# about 95% at s = 0.8 and 6% at s = 0.5
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# Candidates compared per lookup at most, whatever the bucket sizes
+MAX_CANDIDATES = 256
+# Near-duplicates reported per resume
+MAX_DUPLICATES = 5
+
+_WORD_PATTERN = re.compile(r'\w+')
+# Universal hash family (a * x + b) mod p over 32-bit shingle hashes; the fixed seed
+# keeps signatures comparable across processes and restarts
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_EMPTY_SIGNATURE = np.full(NUM_PERM, 0xFFFFFFFF, dtype=np.uint32)
+
+
+def shingles(text: str) -> set:
+    """Lowercased word SHINGLE_WORDS-grams of cleaned text (the whole text when it is shorter)"""
+    words = _WORD_PATTERN.findall(clean_text(text).lower())
+    if len(words) <= SHINGLE_WORDS:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(text: str) -> np.ndarray:
+    """NUM_PERM uint32 MinHash signature of a text's shingles"""
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles(text)),
+        dtype=np.uint64
+    )
+    if not len(hashes):
+        return _EMPTY_SIGNATURE.copy()
+    # a, b < 2^31 and x < 2^32, so a * x + b fits in 64 bits
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return (permuted & np.uint64(0xFFFFFFFF)).min(axis=1).astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray) -> List[int]:
+    """One signed 64-bit bucket key per band"""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(bytes([band]) + signature[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest(),
+            'little', signed=True
+        )
+        for band in range(BANDS)
+    ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class NearDuplicate(NamedTuple):
+    """A previously seen resume similar to the one looked up"""
+    resume_id: str
+    # Content digest its analysis result is cached under
+    result_digest: Optional[str]
+    similarity: float
+
+
+class DedupLookup(NamedTuple):
+    """Outcome of looking a resume up in the index"""
+    # The same text (same resume_id) was seen before
+    resubmission: bool
+    # Other stored resumes at least threshold-similar, most similar first
+    duplicates: List[NearDuplicate]
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures
+
+    Each stored resume has a row in docs and one row per band in buckets,
+    keyed by a hash of the band. A lookup reads the buckets of its BANDS
+    keys through the (key, row) primary key and compares at most
+    MAX_CANDIDATES signatures, so its cost depends on bucket sizes and not
+    on the number of stored resumes. Resumes with a near-duplicate already
+    stored are not added, so a cluster of near-identical resumes keeps a
+    single bucket entry per band.
+    """
+
+    def __init__(self, db_path: str = "", threshold: float = DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._counters = {"lookups": 0, "resubmissions": 0, "duplicates": 0, "added": 0}
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False, isolation_level=None)
+        if db_path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "row INTEGER PRIMARY KEY, resume_id TEXT NOT NULL UNIQUE, result_digest TEXT, "
+            "signature BLOB NOT NULL, added_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key INTEGER NOT NULL, row INTEGER NOT NULL, "
+            "PRIMARY KEY (key, row)) WITHOUT ROWID"
+        )
+
+    def _find(self, resume_id: str, signature: np.ndarray) -> List[NearDuplicate]:
+        """Stored resumes other than resume_id at least threshold-similar, best first; the caller holds the lock"""
+        keys = band_keys(signature)
+        rows = [row for (row,) in self._db.execute(
+            f"SELECT DISTINCT row FROM buckets WHERE key IN ({','.join('?' * len(keys))}) LIMIT ?",
+            (*keys, MAX_CANDIDATES)
+        )]
+        if not rows:
+            return []
+        found = []
+        for candidate_id, result_digest, blob in self._db.execute(
+            f"SELECT resume_id, result_digest, signature FROM docs "
+            f"WHERE row IN ({','.join('?' * len(rows))}) AND resume_id != ?", (*rows, resume_id)
+        ):
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold:
+                found.append(NearDuplicate(candidate_id, result_digest, round(score, 4)))
+        found.sort(key=lambda duplicate: -duplicate.similarity)
+        return found[:MAX_DUPLICATES]
+
+    def check_and_add(self, resume_id: str, text: str, result_digest: Optional[str] = None) -> DedupLookup:
+        """
+        Look up near-duplicates of a resume, storing it when it is new and has none
+
+        A resume whose text was seen before is a resubmission, not its own
+        near-duplicate: the earlier entry is excluded from the duplicates.
+
+        Args:
+            resume_id: Hash of the resume text
+            text: Resume text
+            result_digest: Content digest the resume's analysis will be cached under
+
+        Returns:
+            Whether the text was seen before, and the other stored near-duplicates
+        """
+        signature = minhash(text)
+        if np.array_equal(signature, _EMPTY_SIGNATURE):
+            return DedupLookup(False, [])
+        with self._lock:
+            # The write lock makes lookup + insert atomic across processes sharing the database
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                resubmission = self._db.execute(
+                    "SELECT 1 FROM docs WHERE resume_id = ?", (resume_id,)
+                ).fetchone() is not None
+                duplicates = self._find(resume_id, signature)
+                if not duplicates and not resubmission:
+                    cursor = self._db.execute(
+                        "INSERT INTO docs (resume_id, result_digest, signature, added_at) VALUES (?, ?, ?, ?)",
+                        (resume_id, result_digest, signature.tobytes(), time.time())
+                    )
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO buckets (key, row) VALUES (?, ?)",
+                        [(key, cursor.lastrowid) for key in band_keys(signature)]
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._counters["lookups"] += 1
+            if resubmission:
+                self._counters["resubmissions"] += 1
+            elif duplicates:
+                self._counters["duplicates"] += 1
+            else:
+                self._counters["added"] += 1
+        return DedupLookup(resubmission, duplicates)
+
+    def stats(self) -> dict:
+        """Stored resumes and lookup counters"""
+        with self._lock:
+            stored = self._db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+            return {"stored": stored, "threshold": self.threshold, **self._counters}
+
+
+# Singleton index, None when detection is disabled
+_index: Optional[NearDuplicateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_dedup_index() -> Optional[NearDuplicateIndex]:
+    """Return the shared near-duplicate index, or None if detection is disabled"""
+    global _index
+
+    if _index is None and DEDUP_ENABLED:
+        with _index_lock:
+            if _index is None:
+                _index = NearDuplicateIndex(DEDUP_DB_PATH, DEDUP_THRESHOLD)
+    return _index
@@ -0,0 +1,152 @@
+"""
+Executor Service
+Runs blocking extraction, parsing and classification work off the asyncio event loop
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+from app.config import EXECUTOR_THREAD_WORKERS, EXECUTOR_PROCESS_WORKERS, EXECUTOR_MAX_PENDING
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when too many stage tasks are already queued or running"""
+
+
+class StageTimeoutError(Exception):
+    """Raised when a stage does not finish within its timeout"""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"Stage '{stage}' timed out after {timeout:g}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class StageExecutor:
+    """
+    Thread pool for I/O-ish work plus an optional process pool for CPU-bound
+    stages, sharing one bounded budget of queued + running tasks
+    """
+
+    def __init__(self, thread_workers: int, process_workers: int, max_pending: int):
+        self.thread_workers = max(1, thread_workers)
+        self.process_workers = max(0, process_workers)
+        self.max_pending = max(1, max_pending)
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="stage")
+        self._processes = self._new_process_pool() if self.process_workers else None
+
+    def _new_process_pool(self) -> ProcessPoolExecutor:
+        # spawn avoids forking a process that already runs the event loop and worker threads
+        # Each worker loads the parser's models before its first task, so no request pays for it
+        from app.services.warmup import warm_up_worker
+        return ProcessPoolExecutor(
+            max_workers=self.process_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_up_worker
+        )
+
+    @property
+    def pending(self) -> int:
+        """Number of queued + running tasks"""
+        return self._pending
+
+    @property
+    def cpu_workers(self) -> int:
+        """Number of workers that CPU-bound stages run on"""
+        return self.process_workers or self.thread_workers
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ExecutorSaturatedError(f"{self._pending} tasks already pending")
+            self._pending += 1
+
+    def _release(self, _future: Optional[Future] = None):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, stage: str, fn: Callable, *args, cpu_bound: bool = False, timeout: Optional[float] = None):
+        """
+        Run a blocking function on the matching pool and await its result
+
+        Args:
+            stage: Stage name used in timeout errors
+            fn: Function to run; must be picklable when cpu_bound and a process pool is configured
+            *args: Positional arguments for fn
+            cpu_bound: Run on the process pool when one is configured
+            timeout: Seconds to wait before raising StageTimeoutError (None or 0 waits forever)
+
+        Returns:
+            The function's return value
+        """
+        processes = self._processes if cpu_bound else None
+        pool = processes or self._threads
+
+        self._acquire()
+        try:
+            future = pool.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is held until the work actually finishes, even after a timeout,
+        # so a stuck task keeps counting against the pending budget
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or None)
+        except asyncio.TimeoutError:
+            if processes is not None and not future.done():
+                self._retire_process_pool(processes, grace=timeout)
+            raise StageTimeoutError(stage, timeout)
+
+    def _retire_process_pool(self, pool: ProcessPoolExecutor, grace: float):
+        """Route new work to a fresh process pool and kill the stuck one after a grace period"""
+        with self._lock:
+            if self._processes is not pool:
+                return  # Already retired by another timeout
+            self._processes = self._new_process_pool()
+
+        def terminate():
+            # Give other tasks on the retired pool a chance to finish first
+            time.sleep(grace)
+            # ProcessPoolExecutor has no public API to kill a busy worker
+            workers = list((getattr(pool, "_processes", None) or {}).values())
+            pool.shutdown(wait=False, cancel_futures=True)
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+
+        threading.Thread(target=terminate, name="retire-process-pool", daemon=True).start()
+
+    def shutdown(self):
+        """Stop accepting work and release the pools"""
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton executor, created on first use or at startup
+_executor: Optional[StageExecutor] = None
+
+
+def get_executor() -> StageExecutor:
+    """Return the shared stage executor, creating it from the configuration if needed"""
+    global _executor
+
+    if _executor is None:
+        _executor = StageExecutor(EXECUTOR_THREAD_WORKERS, EXECUTOR_PROCESS_WORKERS, EXECUTOR_MAX_PENDING)
+    return _executor
+
+
+def shutdown_executor():
+    """Shut down the shared stage executor if it was started"""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,282 @@
+"""
+Metrics Service
+Stage timing histograms and input/error counters, exposed in the Prometheus text format
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Histogram buckets: seconds, bytes and PDF pages
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50)
+
+# Registered metrics by name, in registration order
+REGISTRY: Dict[str, "Metric"] = {}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class for labelled metrics; registers itself by name"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY[name] = self
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    """Monotonically increasing count per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def record(self, value: float, **labels):
+        self.inc(value, **labels)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    """Bucketed distribution of observed values per label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: non-cumulative bucket counts (last slot is +Inf) and the sum
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def record(self, value: float, **labels):
+        self.observe(value, **labels)
+
+    def totals(self) -> Dict[Tuple[str, ...], Tuple[int, float]]:
+        """(count, sum) of the observations for each label set"""
+        with self._lock:
+            return {key: (sum(counts), self._sums[key]) for key, counts in self._counts.items()}
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            snapshot = sorted((key, list(counts), self._sums[key]) for key, counts in self._counts.items())
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else _format_number(bound)
+                labels = _format_labels(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "resume_stage_duration_seconds",
+    "Time spent in each pipeline stage (dotted names are parts of the enclosing stage)",
+    ("stage",)
+)
+STAGE_ERRORS = Counter(
+    "resume_stage_errors_total",
+    "Pipeline stage failures by reason (error, timeout, saturated, unavailable)",
+    ("stage", "reason")
+)
+INPUTS = Counter(
+    "resume_inputs_total",
+    "Resumes received, by input type (pdf, docx, txt, zip, text)",
+    ("input_type",)
+)
+INPUT_BYTES = Histogram(
+    "resume_input_bytes",
+    "Size of received resumes in bytes",
+    ("input_type",),
+    SIZE_BUCKETS
+)
+PDF_PAGES = Histogram(
+    "resume_pdf_pages",
+    "PDF pages with text read per document, by text backend",
+    ("backend",),
+    PAGE_BUCKETS
+)
+PDF_FALLBACKS = Counter(
+    "resume_pdf_backend_fallbacks_total",
+    "PDF text backends that were missing, failed or returned unusable text, by reason (missing, error, garbled)",
+    ("backend", "reason")
+)
+SHADOW_PREDICTIONS = Counter(
+    "resume_shadow_predictions_total",
+    "Sampled resumes scored by the shadow model, by outcome (agree, disagree, dropped, error)",
+    ("primary_version", "shadow_version", "outcome")
+)
+NEAR_DUPLICATES = Counter(
+    "resume_near_duplicate_lookups_total",
+    "Analyzed resumes looked up in the near-duplicate index, by outcome (unique, resubmitted, duplicate, reused)",
+    ("outcome",)
+)
+HTTP_REQUESTS = Counter(
+    "resume_http_requests_total",
+    "HTTP requests by route, method and status code",
+    ("path", "method", "status")
+)
+HTTP_SECONDS = Histogram(
+    "resume_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("path",)
+)
+
+
+# Observations made inside collect_observations are buffered per thread instead of
+# recorded, so they can be shipped back from worker threads and processes
+_local = threading.local()
+# Per-request stage breakdown (stage -> seconds) for the Server-Timing header
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def observe(metric_name: str, value: float, **labels):
+    """
+    Record a value on a registered metric (or buffer it inside collect_observations)
+
+    Args:
+        metric_name: Name of a registered Counter or Histogram
+        value: Observed value (counters are incremented by it)
+        labels: Label values
+    """
+    buffer = getattr(_local, "buffer", None)
+    if buffer is not None:
+        buffer.append((metric_name, value, labels))
+    else:
+        _record(metric_name, value, labels)
+
+
+def _record(metric_name: str, value: float, labels: dict):
+    REGISTRY[metric_name].record(value, **labels)
+    if metric_name == STAGE_SECONDS.name:
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[labels["stage"]] = timings.get(labels["stage"], 0.0) + value
+
+
+class timed:
+    """Context manager recording the duration of a block as a stage timing"""
+
+    __slots__ = ("stage", "_start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(STAGE_SECONDS.name, time.perf_counter() - self._start, stage=self.stage)
+        return False
+
+
+def collect_observations(fn, *args):
+    """
+    Call fn, buffering the observations it makes
+
+    Meant to run on executor workers: the buffer travels back with the
+    result and is recorded on the event loop, where the request is known.
+    If fn raises, the buffer is attached to the exception as
+    metric_observations.
+
+    Returns:
+        Tuple of (fn result, list of buffered observations)
+    """
+    previous = getattr(_local, "buffer", None)
+    buffer = _local.buffer = []
+    try:
+        return fn(*args), buffer
+    except Exception as e:
+        e.metric_observations = buffer
+        raise
+    finally:
+        _local.buffer = previous
+
+
+def record_observations(observations: List[tuple]):
+    """Record observations returned by collect_observations"""
+    for metric_name, value, labels in observations:
+        _record(metric_name, value, labels)
+
+
+def start_request_timings() -> Tuple[Dict[str, float], object]:
+    """Start collecting a per-request stage breakdown; returns (timings, reset token)"""
+    timings: Dict[str, float] = {}
+    return timings, _request_timings.set(timings)
+
+
+def stop_request_timings(token):
+    _request_timings.reset(token)
+
+
+def format_server_timing(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    """Render stage timings as a Server-Timing header value (durations in ms)"""
+    entries = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in timings.items()]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def render_metrics() -> str:
+    """All registered metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY.values():
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,30 @@
+"""
+Model Watcher Service
+Polls for new model versions and swaps them in on a worker thread while the current model keeps serving
+"""
+import asyncio
+from fastapi.concurrency import run_in_threadpool
+
+
+async def watch_models(interval: float):
+    """
+    Reload the classifier whenever the registry pointers or the model file change
+
+    Runs as a background task of the lifespan handler. Loads happen off
+    the event loop and the swap is a single reference assignment, so
+    requests keep being served by the old model until the new one is ready.
+
+    Args:
+        interval: Seconds between checks (0 or less disables watching)
+    """
+    from app.ml.classifier import refresh_models
+
+    if interval <= 0:
+        return
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            for change in await run_in_threadpool(refresh_models):
+                print(f"Model reloaded: {change}")
+        except Exception as e:
+            print(f"Warning: model watch failed: {e}")
@@ -1,73 +1,280 @@
 """
 PDF Text Extraction Service
-Uses pdfplumber to extract clean text from PDF files
+Extracts clean text from PDF files with a fast text backend, falling back to pdfplumber
 """
-import pdfplumber
 import io
+import os
 import re
-from typing import Optional
+import threading
+import unicodedata
+from typing import Callable, Dict, Iterable, Iterator, Optional, Union
+from app.config import PDF_MAX_PAGES, PDF_MAX_BYTES, PDF_TARGET_CHARS, PDF_BACKENDS
+from app.services.metrics import timed, observe, PDF_PAGES, PDF_FALLBACKS
+
+
+# File content as raw bytes, or a path to a file on disk (e.g. a spooled upload)
+FileSource = Union[bytes, str]
 
 
 def clean_text(text: str) -> str:
     """Clean extracted text by removing extra whitespace and normalizing"""
     if not text:
         return ""
-    
-    # Replace multiple spaces/tabs with single space (preserve newlines)
-    text = re.sub(r'[ \t]+', ' ', text)
-    
-    # Replace multiple newlines with double newline (paragraph separation)
-    text = re.sub(r'\n\s*\n', '\n\n', text)
-    
-    # Strip leading/trailing whitespace
-    return text.strip()
-
-
-def extract_text_from_pdf(file_content: bytes) -> str:
+
+    with timed("extract.clean_text"):
+        # Replace multiple spaces/tabs with single space (preserve newlines)
+        text = re.sub(r'[ \t]+', ' ', text)
+
+        # Replace multiple newlines with double newline (paragraph separation)
+        text = re.sub(r'\n\s*\n', '\n\n', text)
+
+        # Strip leading/trailing whitespace
+        return text.strip()
+
+
+def _open_source(source: FileSource):
+    """Path or file-like object for a FileSource"""
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def _source_size(source: FileSource) -> int:
+    return len(source) if isinstance(source, (bytes, bytearray)) else os.path.getsize(source)
+
+
+def _iter_pages_pdfplumber(source: FileSource, max_pages: Optional[int]) -> Iterator[str]:
+    """Page text from pdfplumber (character-level layout, slow but robust)"""
+    import pdfplumber
+    with pdfplumber.open(_open_source(source)) as pdf:
+        for page_number, page in enumerate(pdf.pages):
+            if max_pages and page_number >= max_pages:
+                break
+            page_text = page.extract_text()
+            page.flush_cache()
+            if page_text:
+                yield page_text
+
+
+# pdfium is not thread-safe, so every call into it is serialized
+_pdfium_lock = threading.Lock()
+
+
+def _iter_pages_pypdfium2(source: FileSource, max_pages: Optional[int]) -> Iterator[str]:
+    """Page text from PDFium's text API (no layout analysis)"""
+    import pypdfium2 as pdfium
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(source)
+    try:
+        page_count = len(pdf)
+        if max_pages:
+            page_count = min(page_count, max_pages)
+        for page_number in range(page_count):
+            with _pdfium_lock:
+                page = pdf[page_number]
+                textpage = page.get_textpage()
+                page_text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+            if page_text:
+                yield page_text.replace('\r\n', '\n').replace('\r', '\n')
+    finally:
+        with _pdfium_lock:
+            pdf.close()
+
+
+def _iter_pages_pdfminer(source: FileSource, max_pages: Optional[int]) -> Iterator[str]:
+    """Page text from pdfminer's high-level API (text boxes only)"""
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+    for page_layout in extract_pages(_open_source(source), maxpages=max_pages or 0):
+        page_text = ''.join(
+            element.get_text() for element in page_layout if isinstance(element, LTTextContainer)
+        )
+        if page_text:
+            yield page_text
+
+
+# Registered PDF text backends: name -> function(source, max_pages) yielding page texts
+PDF_TEXT_BACKENDS: Dict[str, Callable[[FileSource, Optional[int]], Iterator[str]]] = {
+    "pypdfium2": _iter_pages_pypdfium2,
+    "pdfminer": _iter_pages_pdfminer,
+    "pdfplumber": _iter_pages_pdfplumber,
+}
+
+_unknown_backends = [name for name in PDF_BACKENDS if name not in PDF_TEXT_BACKENDS]
+if _unknown_backends:
+    raise ValueError(
+        f"Unknown PDF backend(s) in PDF_BACKENDS: {', '.join(_unknown_backends)} "
+        f"(available: {', '.join(PDF_TEXT_BACKENDS)})"
+    )
+
+
+def iter_pdf_pages(
+    source: FileSource,
+    max_pages: Optional[int] = PDF_MAX_PAGES,
+    backend: str = "pdfplumber"
+) -> Iterator[str]:
+    """
+    Yield the text of each PDF page, one page at a time
+
+    Stopping the iteration early closes the document without touching later pages.
+
+    Args:
+        source: PDF content as bytes, or a path to a PDF file
+        max_pages: Stop after this many pages (0 or None for no limit)
+        backend: Name of a registered backend (see PDF_TEXT_BACKENDS)
+
+    Yields:
+        Raw text of each page that has any
+    """
+    return PDF_TEXT_BACKENDS[backend](source, max_pages)
+
+
+# Text shorter than this (ignoring whitespace) counts as empty, e.g. a scanned PDF
+MIN_TEXT_CHARS = 20
+# pdfminer's placeholder for glyphs without a unicode mapping
+CID_PATTERN = re.compile(r'\(cid:\d+\)')
+
+
+def is_garbled_text(text: str) -> bool:
+    """
+    Detect text a fast backend failed to decode (missing font maps, broken encodings)
+
+    Args:
+        text: Extracted text
+
+    Returns:
+        True when the text is empty or mostly unreadable
+    """
+    visible = ''.join(text.split())
+    if len(visible) < MIN_TEXT_CHARS:
+        return True
+
+    unreadable = 5 * len(CID_PATTERN.findall(visible))
+    letters = 0
+    for ch in visible:
+        if ch.isalpha():
+            letters += 1
+        elif ch == '\ufffd' or unicodedata.category(ch) in ('Cc', 'Co', 'Cs', 'Cn'):
+            unreadable += 1
+    return unreadable > 0.05 * len(visible) or letters < 0.4 * len(visible)
+
+
+def _read_pdf_text(
+    source: FileSource,
+    backend: str,
+    max_pages: Optional[int],
+    max_chars: Optional[int]
+) -> str:
+    """Concatenate page texts from one backend, stopping at max_chars"""
+    text_parts = []
+    extracted_chars = 0
+    with timed(f"extract.pdf.{backend}"):
+        for page_text in iter_pdf_pages(source, max_pages, backend):
+            text_parts.append(page_text)
+            extracted_chars += len(page_text)
+            # Enough content for classification and parsing
+            if max_chars and extracted_chars >= max_chars:
+                break
+    observe(PDF_PAGES.name, len(text_parts), backend=backend)
+    return '\n\n'.join(text_parts)
+
+
+def extract_text_from_pdf(
+    file_content: FileSource,
+    max_pages: Optional[int] = PDF_MAX_PAGES,
+    max_chars: Optional[int] = PDF_TARGET_CHARS,
+    max_bytes: Optional[int] = PDF_MAX_BYTES,
+    backends: Iterable[str] = PDF_BACKENDS
+) -> str:
     """
     Extract text from PDF file content
-    
+
+    Backends are tried in order; the next one is used when a backend is not
+    installed, fails, or returns empty or garbled text.
+
     Args:
-        file_content: PDF file content as bytes
-        
+        file_content: PDF file content as bytes, or a path to a PDF file
+        max_pages: Read at most this many pages (0 or None for no limit)
+        max_chars: Stop once this many characters were extracted (0 or None reads every page)
+        max_bytes: Reject PDFs larger than this (0 or None for no limit)
+        backends: Names of registered backends, in order of preference
+
     Returns:
         Extracted and cleaned text from the PDF
     """
-    text_parts = []
-    
-    try:
-        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-    except Exception as e:
-        raise ValueError(f"Failed to extract text from PDF: {str(e)}")
-    
-    full_text = '\n\n'.join(text_parts)
-    return clean_text(full_text)
+    if max_bytes and _source_size(file_content) > max_bytes:
+        raise ValueError(f"PDF is larger than the {max_bytes} byte limit")
+
+    fallback_text = None
+    error = None
+    for backend in backends:
+        try:
+            full_text = _read_pdf_text(file_content, backend, max_pages, max_chars)
+        except ImportError:
+            observe(PDF_FALLBACKS.name, 1, backend=backend, reason="missing")
+            continue
+        except Exception as e:
+            observe(PDF_FALLBACKS.name, 1, backend=backend, reason="error")
+            error = e
+            continue
+        if not is_garbled_text(full_text):
+            return clean_text(full_text)
+        observe(PDF_FALLBACKS.name, 1, backend=backend, reason="garbled")
+        # Keep the first usable-looking result in case no backend does better
+        if fallback_text is None and full_text.strip():
+            fallback_text = full_text
+
+    if fallback_text is not None:
+        return clean_text(fallback_text)
+    if error is not None:
+        raise ValueError(f"Failed to extract text from PDF: {str(error)}")
+    return ""
 
 
-def extract_text_from_docx(file_content: bytes) -> str:
+def extract_text_from_docx(file_content: FileSource) -> str:
     """
     Extract text from DOCX file content
-    
+
     Args:
-        file_content: DOCX file content as bytes
-        
+        file_content: DOCX file content as bytes, or a path to a DOCX file
+
     Returns:
         Extracted and cleaned text from the DOCX
     """
     try:
         from docx import Document
-        doc = Document(io.BytesIO(file_content))
-        text_parts = []
-        
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text)
-        
+        with timed("extract.docx"):
+            doc = Document(_open_source(file_content))
+            text_parts = []
+
+            for paragraph in doc.paragraphs:
+                if paragraph.text.strip():
+                    text_parts.append(paragraph.text)
+
         full_text = '\n'.join(text_parts)
         return clean_text(full_text)
     except Exception as e:
         raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
+
+
+def extract_text_from_file(filename: str, file_content: FileSource) -> str:
+    """
+    Extract text from file content, picking the extractor by file extension
+
+    Args:
+        filename: File name (lowercased) used to pick the extractor
+        file_content: File content as bytes, or a path to the file
+
+    Returns:
+        Extracted and cleaned text
+    """
+    if filename.endswith('.pdf'):
+        return extract_text_from_pdf(file_content)
+    elif filename.endswith('.docx'):
+        return extract_text_from_docx(file_content)
+    elif filename.endswith('.txt'):
+        if not isinstance(file_content, (bytes, bytearray)):
+            with open(file_content, 'rb') as f:
+                file_content = f.read()
+        return clean_text(file_content.decode('utf-8', errors='ignore'))
+    raise ValueError(f"Unsupported file type: {filename}")
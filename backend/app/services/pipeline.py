@@ -0,0 +1,242 @@
+"""
+Analysis Pipeline Service
+The extract, parse and classify steps shared by the routers and the bulk CLI, and the
+executor stage runner the routers report errors through
+"""
+from typing import List, NamedTuple, Optional, Tuple
+from fastapi import HTTPException
+from app.config import STAGE_TIMEOUTS
+from app.models.schemas import ResumeAnalysisResponse
+from app.services.cache import text_digest
+from app.services.executor import get_executor, ExecutorSaturatedError, StageTimeoutError
+from app.services.metrics import timed, collect_observations, record_observations, STAGE_ERRORS
+from app.services.pdf_extractor import extract_text_from_file, FileSource
+from app.services.resume_parser import parse_resume, breakdown_interval, count_months
+from app.ml.classifier import predict_categories, get_experience_level, ModelNotAvailableError
+from app.ml.category_keywords import match_titles
+
+
+# Extracted text shorter than this is not treated as a resume
+MIN_RESUME_CHARS = 50
+
+
+class ResumeTooShortError(ValueError):
+    """Raised when resume content is empty or shorter than MIN_RESUME_CHARS"""
+
+    def __init__(self):
+        super().__init__("Resume content is too short or empty")
+
+
+def check_resume_text(resume_text: Optional[str]) -> str:
+    """Return resume text, raising ResumeTooShortError when it is empty or too short"""
+    if not resume_text or len(resume_text) < MIN_RESUME_CHARS:
+        raise ResumeTooShortError()
+    return resume_text
+
+
+def prepare_resume(filename: str, content: FileSource) -> Tuple[str, dict]:
+    """
+    Extract and parse one resume file
+
+    Args:
+        filename: Lowercased file name used to pick the extractor
+        content: Raw file content, or a path to the file
+
+    Returns:
+        (text, parsed_data)
+    """
+    with timed("extract"):
+        text = check_resume_text(extract_text_from_file(filename, content))
+    with timed("parse"):
+        return text, parse_resume(text)
+
+
+def build_analysis_response(parsed_data: dict, prediction: dict) -> ResumeAnalysisResponse:
+    """Split experience into relevant/other for the predicted category and build the response"""
+    classification = prediction["category"]
+
+    # Calculate Relevant vs Other Experience
+    breakdown = parsed_data.get("experience_breakdown", [])
+    relevant_years = 0.0
+    other_years = 0.0
+
+    # Titles with a keyword of the predicted category count as relevant experience.
+    # Months covered by a relevant role are relevant even if another role overlaps them,
+    # so relevant + other never exceeds the total
+    if breakdown:
+        titles = [item["title"] for item in breakdown]
+        intervals = [breakdown_interval(item) for item in breakdown]
+        relevant_intervals = [
+            interval for interval, matched in zip(intervals, match_titles(classification, titles)) if matched
+        ]
+        relevant_months = count_months(relevant_intervals)
+        relevant_years = relevant_months / 12.0
+        other_years = (count_months(intervals) - relevant_months) / 12.0
+
+    # If no breakdown found (e.g. no dates), assume all is relevant if total > 0?
+    # Or just keep it as is.
+    if not breakdown and parsed_data["experience_years"] > 0:
+         # If classification matches skills/text, assume relevant?
+         # Simplified: If no breakdown, we can't split.
+         relevant_years = parsed_data["experience_years"]
+
+    # Get experience level based on RELEVANT experience
+    experience_level = get_experience_level(relevant_years)
+
+    # Build response
+    return ResumeAnalysisResponse(
+        name=parsed_data["name"],
+        email=parsed_data["email"],
+        phone=parsed_data["phone"],
+        skills=parsed_data["skills"],
+        education=parsed_data["education"],
+        experience_years=parsed_data["experience_years"],
+        relevant_experience_years=round(relevant_years, 1),
+        other_experience_years=round(other_years, 1),
+        experience_breakdown=breakdown,
+        experience_level=experience_level,
+        classification=classification,
+        confidence=prediction["confidence"],
+        top_categories=prediction["top_categories"],
+        model_version=prediction["model_version"]
+    )
+
+
+class BorrowedClassification(NamedTuple):
+    """Model output of a near-duplicate's cached result, reused for a new resume"""
+    resume_id: str
+    prediction: dict
+
+
+def borrow_classification(resume_id: str, cached: dict) -> BorrowedClassification:
+    """
+    Take only the classification of a cached response
+
+    Name, contact details, experience and skills belong to the resume that
+    was analyzed, so they come from the new resume's own parse.
+    """
+    return BorrowedClassification(resume_id, {
+        "category": cached["classification"],
+        "confidence": cached["confidence"],
+        "top_categories": cached["top_categories"],
+        "model_version": cached["model_version"],
+    })
+
+
+def build_borrowed_response(parsed_data: dict, borrowed: BorrowedClassification) -> ResumeAnalysisResponse:
+    """Build the response of a parsed resume from a near-duplicate's classification"""
+    response = build_analysis_response(parsed_data, borrowed.prediction)
+    response.reused_from = borrowed.resume_id
+    return response
+
+
+def classify_resumes(texts: List[str], parsed: List[dict], top_k: int = 0) -> List[ResumeAnalysisResponse]:
+    """
+    Classify parsed resumes in one model call and build their responses
+
+    Args:
+        texts: Resume texts
+        parsed: parse_resume results, aligned with texts
+        top_k: Number of ranked categories to include
+
+    Returns:
+        One response per resume, in order
+    """
+    if not texts:
+        return []
+    predictions = predict_categories(texts, top_k)
+    return [build_analysis_response(parsed_data, prediction) for parsed_data, prediction in zip(parsed, predictions)]
+
+
+def resume_index_item(resume_text: str, response: ResumeAnalysisResponse) -> Tuple[str, str, dict]:
+    """
+    (resume id, text, summary) of an analyzed resume for the match index
+
+    Resumes are keyed by the hash of their text, so analyzing one again does not store it twice.
+    """
+    return text_digest(resume_text), resume_text, {
+        "name": response.name,
+        "email": response.email,
+        "classification": response.classification,
+        "experience_level": response.experience_level,
+        "experience_years": response.experience_years,
+    }
+
+
+async def run_stage(stage: str, fn, *args, cpu_bound: bool = False):
+    """
+    Run a blocking pipeline stage on the shared executor
+
+    Saturation is reported as 429, a missing model as 503 and stage timeouts as 504. The stage's
+    timing and the metrics recorded by fn on the worker are merged into the
+    process-wide metrics and the request's Server-Timing breakdown.
+    """
+    # Dotted stages ("classify.model_version") share the timeout of their parent stage
+    timeout = STAGE_TIMEOUTS.get(stage.split('.')[0])
+    try:
+        with timed(stage):
+            result, observations = await get_executor().run(
+                stage, collect_observations, fn, *args, cpu_bound=cpu_bound, timeout=timeout
+            )
+        record_observations(observations)
+        return result
+    except ExecutorSaturatedError:
+        STAGE_ERRORS.inc(stage=stage, reason="saturated")
+        raise HTTPException(
+            status_code=429,
+            detail="Server is busy processing other resumes. Please retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+    except StageTimeoutError as e:
+        STAGE_ERRORS.inc(stage=stage, reason="timeout")
+        raise HTTPException(
+            status_code=504,
+            detail=f"Resume processing took too long ({e.stage} exceeded {e.timeout:g}s)."
+        )
+    except ModelNotAvailableError:
+        STAGE_ERRORS.inc(stage=stage, reason="unavailable")
+        raise HTTPException(
+            status_code=503,
+            detail="The classification model is not available yet. Please retry later.",
+            headers={"Retry-After": "30"}
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        record_observations(getattr(e, "metric_observations", []))
+        STAGE_ERRORS.inc(stage=stage, reason="error")
+        raise
+
+
+async def extract_resume_text(filename: str, content: FileSource) -> str:
+    """
+    Extract resume text from uploaded file content based on its extension
+
+    Args:
+        filename: Lowercased file name used to pick the extractor
+        content: Raw file content, or the path of a spooled upload
+
+    Returns:
+        Extracted text
+    """
+    try:
+        return await run_stage("extract", extract_text_from_file, filename, content, cpu_bound=True)
+    except HTTPException:
+        raise
+    except Exception as e:
+        file_type = filename.rsplit('.', 1)[-1].upper()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Failed to process {file_type} file: {str(e)}"
+        )
+
+
+def validate_resume_text(resume_text: Optional[str]) -> str:
+    """Reject empty or too-short resume content with 400"""
+    try:
+        return check_resume_text(resume_text)
+    except ResumeTooShortError:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume content is too short or empty. Please provide a valid resume."
+        )
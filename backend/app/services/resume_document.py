@@ -0,0 +1,191 @@
+"""
+Resume Document
+Resume text preprocessed once (lines, offsets, sections, per-line flags) and shared by the parser extractors
+"""
+import re
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, Pattern, Union
+
+
+# Per-line feature flags
+LINE_BLANK = 1        # Only whitespace
+LINE_YEAR = 2         # Has a run of 4 digits (every date range needs one)
+LINE_AT = 4           # Has an "@" (every email needs one)
+
+FOUR_DIGITS_PATTERN = re.compile(r'\d{4}')
+
+# Section header lines, matched against the whole stripped lowercase line
+SECTION_HEADER_PATTERNS = {
+    "experience": (
+        r"(?:(?:relevant|professional|industry|work)\s+)*(?:experience|employment|work)(?:\s+history)?"
+        r"(?:\s*(?:&|and)\s*projects)?"
+        r"|(?:career|employment|work)\s+history|professional\s+background|positions\s+held|internships?"
+    ),
+    "education": r"education(?:al)?(?:\s+(?:background|qualifications?|history))?|academic(?:s|\s+background|\s+qualifications?)?",
+    "skills": r"(?:technical\s+|core\s+|key\s+)?(?:skills?|competencies|technologies)(?:\s*(?:&|and)\s*[a-z]+)?",
+    "projects": r"(?:personal\s+|academic\s+|key\s+)?projects?",
+    "summary": r"(?:professional\s+|career\s+)?(?:summary|profile|objective)|about(?:\s+me)?",
+    "certifications": r"certifications?|licen[cs]es(?:\s*(?:&|and)\s*certifications?)?|courses",
+}
+SECTION_HEADER_PATTERN = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern in SECTION_HEADER_PATTERNS.items())
+)
+# Leading bullets/numbering and trailing colons or dashes around a header
+HEADER_TRIM_CHARS = ' \t:-–—•*#|.0123456789'
+MAX_HEADER_LENGTH = 40
+# Words of an unrecognized header-like line, which closes the current section as "other"
+MAX_OTHER_HEADER_WORDS = 5
+# Lowercase words allowed in a title-case header ("Honors and Awards")
+HEADER_SMALL_WORDS = frozenset(("and", "of", "the", "in", "for", "&"))
+# Characters of sentences and entries ("Acme Corp, Inc.") that headers do not have
+NON_HEADER_CHARS = frozenset(",;()@/")
+
+
+def is_header_like(line: str, after_blank: bool) -> bool:
+    """
+    Whether a short line without a year looks like a section header
+
+    All-caps lines and lines ending with a colon qualify; title-case lines
+    only after a blank line, since names of schools and employers are title case too.
+    """
+    stripped = line.strip()
+    words = stripped.rstrip(':').split()
+    if not words or len(words) > MAX_OTHER_HEADER_WORDS or NON_HEADER_CHARS.intersection(stripped):
+        return False
+    if not any(c.isalpha() for c in stripped) or stripped.endswith('.'):
+        return False
+    if stripped.endswith(':') or stripped.isupper():
+        return True
+    return after_blank and all(word[0].isupper() or word in HEADER_SMALL_WORDS for word in words)
+
+
+class ResumeDocument:
+    """
+    A resume split and annotated once for all extractors
+
+    Attributes:
+        text: Original text
+        lower_text: Lowercased text
+        lines: Original lines (text.split('\\n'))
+        lower_lines: Lowercased lines, aligned with lines
+        offsets: Start offset of each line in text
+        flags: Per-line LINE_* bitmap
+        sections: (name, first line, end line) for each detected section, in order;
+            the header line itself is not part of the range. Header-like lines that
+            are not a known section header start an "other" section. Detected on
+            first use, so parses that never ask for sections do not pay for it
+    """
+
+    __slots__ = ("text", "lower_text", "lines", "lower_lines", "offsets", "flags", "_sections")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower_text = text.lower()
+        self.lines = text.split('\n')
+        self.lower_lines = self.lower_text.split('\n')
+
+        offsets = array('l')
+        position = 0
+        for line in self.lines:
+            offsets.append(position)
+            position += len(line) + 1
+        self.offsets = offsets
+
+        flags = array('B', bytes(len(self.lines)))
+        for i in self.lines_matching(FOUR_DIGITS_PATTERN, first_per_line=True):
+            flags[i] = LINE_YEAR
+
+        for i, line in enumerate(self.lower_lines):
+            if '@' in line:
+                flags[i] |= LINE_AT
+            if not line or line.isspace():
+                flags[i] |= LINE_BLANK
+        self.flags = flags
+        self._sections = None
+
+    @property
+    def sections(self) -> List[tuple]:
+        """(name, first line, end line) of each detected section, in order"""
+        if self._sections is None:
+            self._sections = self._detect_sections()
+        return self._sections
+
+    def _detect_sections(self) -> List[tuple]:
+        """Find section headers: known names, or other header-like lines (see is_header_like)"""
+        sections = []
+        after_blank = True
+        flags = self.flags
+        for i, line in enumerate(self.lower_lines):
+            if flags[i] & LINE_BLANK:
+                after_blank = True
+                continue
+            previous_blank, after_blank = after_blank, False
+            if len(line) > MAX_HEADER_LENGTH or flags[i] & LINE_YEAR:
+                continue
+            match = SECTION_HEADER_PATTERN.fullmatch(line.strip(HEADER_TRIM_CHARS))
+            if match:
+                name = match.lastgroup
+            elif is_header_like(self.lines[i], previous_blank):
+                name = "other"
+            else:
+                continue
+            if sections:
+                sections[-1][2] = i
+            sections.append([name, i + 1, len(self.lines)])
+        return [tuple(section) for section in sections]
+
+    def line_at(self, position: int) -> int:
+        """Index of the line containing a text offset"""
+        return bisect_right(self.offsets, position) - 1
+
+    def lines_matching(self, pattern: Pattern, first_per_line: bool = False) -> List[int]:
+        """
+        Indices of lines touched by matches of pattern, in one pass over the text
+
+        A match spanning several lines marks all of them, so the result is a
+        superset of the lines where pattern.search(line) succeeds.
+
+        Args:
+            pattern: Compiled pattern, searched over the whole text
+            first_per_line: Skip to the next line after a match (for patterns that cannot span lines)
+        """
+        found = []
+        offsets = self.offsets
+        line_count = len(offsets)
+        position = 0
+        text = self.text
+        while True:
+            match = pattern.search(text, position)
+            if match is None:
+                return found
+            first = bisect_right(offsets, match.start()) - 1
+            last = bisect_right(offsets, max(match.start(), match.end() - 1)) - 1
+            for line in range(max(first, found[-1] + 1 if found else 0), last + 1):
+                found.append(line)
+            if first_per_line:
+                if last + 1 >= line_count:
+                    return found
+                position = offsets[last + 1]
+            else:
+                position = match.end() if match.end() > match.start() else match.end() + 1
+
+    def lines_with(self, flag: int) -> List[int]:
+        """Indices of lines with a LINE_* flag set"""
+        return [i for i, value in enumerate(self.flags) if value & flag]
+
+    def section_lines(self, *names: str) -> List[int]:
+        """Indices of lines in every section called one of names, in order (empty if there is none)"""
+        return [i for section, start, end in self.sections if section in names for i in range(start, end)]
+
+    def section_of(self, line: int) -> Optional[str]:
+        """Name of the section a line belongs to, or None before the first header"""
+        for name, start, end in self.sections:
+            if start <= line < end:
+                return name
+        return None
+
+
+def as_document(text: Union[str, ResumeDocument]) -> ResumeDocument:
+    """Wrap plain text in a ResumeDocument (documents are passed through)"""
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
@@ -3,15 +3,38 @@ Resume Parser Service
 Extracts key information from resume text using spaCy NER and regex
 """
 import re
-import spacy
-from typing import List, Optional, Tuple
+import calendar
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from datetime import datetime
 from dateutil import parser as date_parser
-from dateutil.relativedelta import relativedelta
+from app.config import SKILLS_VOCAB_PATH, SPACY_MODEL, SPACY_NER_ENABLED
+from app.services.skill_matcher import SkillMatcher, load_skill_vocabulary
+from app.services.resume_document import ResumeDocument, as_document, LINE_AT, LINE_YEAR
+from app.services.metrics import timed
 
 
-# Load spaCy model - installed via requirements.txt
-nlp = spacy.load("en_core_web_sm")
+# spaCy model - installed via requirements.txt
+# Only NER is used (name extraction fallback), so every other component is
+# excluded; en_core_web_sm's ner has its own tok2vec and doesn't need these
+SPACY_EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer"]
+
+# Loaded lazily on first use - most resumes never reach the NER pass
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """Load the NER-only spaCy pipeline on first use"""
+    global _nlp
+
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDED_COMPONENTS)
+    return _nlp
 
 
 # Common skills list for extraction
@@ -53,55 +76,93 @@ COMMON_SKILLS = [
     "security", "oauth", "jwt", "ssl", "https"
 ]
 
+# Skills displayed in upper case
+UPPERCASE_SKILLS = {
+    'aws', 'gcp', 'sql', 'html', 'css', 'php', 'api', 'llm', 'nlp', 'cnn', 'rnn',
+    'lstm', 'jwt', 'ssl', 'https', 'tdd', 'oop', 'k8s'
+}
+
+# Skill vocabulary: COMMON_SKILLS, or one skill per line from SKILLS_VOCAB_PATH
+SKILL_VOCABULARY = load_skill_vocabulary(SKILLS_VOCAB_PATH) if SKILLS_VOCAB_PATH else COMMON_SKILLS
+
+# Built once at import; finds every skill in a single pass over the text
+_skill_matcher = SkillMatcher(SKILL_VOCABULARY)
+
+
+# Contact patterns
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Multiple patterns to catch different phone formats, tried in order
+PHONE_PATTERNS = [
+    re.compile(r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # +1 (123) 456-7890
+    re.compile(r'\+?\d{1,3}[-.\s]?\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}'),  # International
+    re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # (123) 456-7890
+    re.compile(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}'),  # 123-456-7890
+    re.compile(r'\d{10,11}'),  # 1234567890
+    re.compile(r'0\d{2}[-.\s]?\d{4}[-.\s]?\d{4}'),  # 017-1234-5678 (BD format)
+]
+# Maximal runs of the characters phone patterns are made of, with at least one digit.
+# Every phone match lies inside one run and needs at least 9 digits, so shorter runs are skipped
+PHONE_RUN_PATTERN = re.compile(r'[-+().\s]*\d[-+().\s\d]*')
+PHONE_MIN_DIGITS = 9
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Name extraction
+# Common non-name headers/sections to skip, combined into one alternation
+NAME_SKIP_PATTERN = re.compile('|'.join(f'(?:{p})' for p in [
+    r'^(resume|cv|curriculum\s*vitae|profile|about|summary|objective|contact|experience|education|skills|projects|work|professional)s?$',
+    r'^(email|phone|address|linkedin|github|portfolio|website)s?:?$',
+    r'^(mr|ms|mrs|dr|prof)\.?\s*$',
+    r'^\d+',  # Starts with digit
+    r'^[+\(\d]',  # Phone number patterns
+    r'@',  # Email
+    r'^http',  # URLs
+    r'^www\.',  # URLs
+]), re.IGNORECASE)
+# Only letters, spaces, dots, hyphens, apostrophes
+NAME_LINE_PATTERN = re.compile(r"^[A-Za-z][A-Za-z\s.\-']+$")
+DIGIT_PATTERN = re.compile(r'\d')
+SYMBOLS_ONLY_PATTERN = re.compile(r'^[\W]+$')
+SECTION_HEADER_WORDS = ('experience', 'education', 'skill', 'project', 'work', 'summary', 'objective', 'contact')
+
 
-def extract_email(text: str) -> Optional[str]:
+def extract_email(text: Union[str, ResumeDocument]) -> Optional[str]:
     """Extract email address from text using regex"""
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    matches = re.findall(email_pattern, text)
-    return matches[0] if matches else None
+    doc = as_document(text)
+    # Emails cannot span lines, so only lines with an "@" are searched
+    for i in doc.lines_with(LINE_AT):
+        match = EMAIL_PATTERN.search(doc.lines[i])
+        if match:
+            return match.group()
+    return None
 
 
-def extract_phone(text: str) -> Optional[str]:
+def extract_phone(text: Union[str, ResumeDocument]) -> Optional[str]:
     """Extract phone number from text using regex"""
-    # Multiple patterns to catch different phone formats
-    patterns = [
-        r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # +1 (123) 456-7890
-        r'\+?\d{1,3}[-.\s]?\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}',  # International
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890
-        r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',  # 123-456-7890
-        r'\d{10,11}',  # 1234567890
-        r'0\d{2}[-.\s]?\d{4}[-.\s]?\d{4}',  # 017-1234-5678 (BD format)
+    doc = as_document(text)
+    # Same result as searching the whole text with each pattern in turn, but
+    # the patterns only run over the few digit runs long enough to hold a number
+    runs = [
+        match.group() for match in PHONE_RUN_PATTERN.finditer(doc.text)
+        if sum(ch.isdigit() for ch in match.group()) >= PHONE_MIN_DIGITS
     ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            # Clean up the phone number
-            phone = matches[0].strip()
-            # Remove extra whitespace
-            phone = re.sub(r'\s+', ' ', phone)
-            return phone
+    for pattern in PHONE_PATTERNS:
+        for run in runs:
+            match = pattern.search(run)
+            if match:
+                # Clean up the phone number and remove extra whitespace
+                return WHITESPACE_PATTERN.sub(' ', match.group().strip())
     
     return None
 
 
-def extract_name(text: str) -> Optional[str]:
-    """Extract name from text - prioritizing first lines where names typically appear"""
-    lines = text.split('\n')
-    
-    # Common non-name headers/sections to skip
-    skip_patterns = [
-        r'^(resume|cv|curriculum\s*vitae|profile|about|summary|objective|contact|experience|education|skills|projects|work|professional)s?$',
-        r'^(email|phone|address|linkedin|github|portfolio|website)s?:?$',
-        r'^(mr|ms|mrs|dr|prof)\.?\s*$',
-        r'^\d+',  # Starts with digit
-        r'^[+\(\d]',  # Phone number patterns
-        r'@',  # Email
-        r'^http',  # URLs
-        r'^www\.',  # URLs
-    ]
-    
-    # First pass: Check first 5 non-empty lines for a name-like pattern
+def _format_name(words: List[str]) -> str:
+    """Capitalize lowercase name words, leaving mixed/upper case words as written"""
+    return ' '.join(word.capitalize() if word.islower() else word for word in words)
+
+
+def _name_from_lines(lines: List[str]) -> Optional[str]:
+    """First pass: Check first 5 non-empty lines for a name-like pattern"""
     checked = 0
     for line in lines:
         if checked >= 5:
@@ -112,15 +173,9 @@ def extract_name(text: str) -> Optional[str]:
             continue
             
         checked += 1
-        line_lower = line.lower()
         
         # Skip if matches a skip pattern
-        should_skip = False
-        for pattern in skip_patterns:
-            if re.search(pattern, line_lower, re.IGNORECASE):
-                should_skip = True
-                break
-        if should_skip:
+        if NAME_SKIP_PATTERN.search(line):
             continue
         
         # Check if line looks like a name:
@@ -129,61 +184,89 @@ def extract_name(text: str) -> Optional[str]:
         # - No digits
         # - Not too long (names usually under 50 chars)
         words = line.split()
-        if 2 <= len(words) <= 5 and len(line) < 50:
-            # Allow: letters, spaces, dots, hyphens, apostrophes
-            if re.match(r"^[A-Za-z][A-Za-z\s.\-']+$", line):
-                # Additional check: not all uppercase (likely a header)
-                if not line.isupper() or len(words) <= 3:
-                    # Capitalize properly
-                    return ' '.join(word.capitalize() if word.islower() else word for word in words)
-    
-    # Second pass: Use spaCy NER on first portion
-    first_portion = text[:1500] if len(text) > 1500 else text
-    doc = nlp(first_portion)
-    
+        if 2 <= len(words) <= 5 and len(line) < 50 and NAME_LINE_PATTERN.match(line):
+            # Additional check: not all uppercase (likely a header)
+            if not line.isupper() or len(words) <= 3:
+                return _format_name(words)
+    return None
+
+
+def _ner_portion(text: str) -> str:
+    """The part of a resume that is sent through NER"""
+    return text[:1500] if len(text) > 1500 else text
+
+
+def _name_from_entities(doc) -> Optional[str]:
+    """Second pass: First plausible PERSON entity of a spaCy doc"""
     for ent in doc.ents:
         if ent.label_ == "PERSON":
             name = ent.text.strip()
             # Validate: at least 2 chars, no digits, not all symbols
-            if len(name) >= 2 and not re.search(r'\d', name) and not re.match(r'^[\W]+$', name):
+            if len(name) >= 2 and not DIGIT_PATTERN.search(name) and not SYMBOLS_ONLY_PATTERN.match(name):
                 # Check it's not a common non-name word
-                name_lower = name.lower()
-                if not any(re.search(p, name_lower) for p in skip_patterns):
+                if not NAME_SKIP_PATTERN.search(name):
                     return name
-    
-    # Third pass: Relaxed check on first 10 lines
+    return None
+
+
+def _name_from_lines_relaxed(lines: List[str]) -> Optional[str]:
+    """Third pass: Relaxed check on first 10 lines"""
     for line in lines[:10]:
         line = line.strip()
         if not line:
             continue
         words = line.split()
         # Accept 2-4 word lines that look like names
-        if 2 <= len(words) <= 4 and len(line) < 40:
-            if re.match(r"^[A-Za-z][A-Za-z\s.\-']+$", line):
-                # Skip if likely a section header
-                line_lower = line.lower()
-                if not any(kw in line_lower for kw in ['experience', 'education', 'skill', 'project', 'work', 'summary', 'objective', 'contact']):
-                    return ' '.join(word.capitalize() if word.islower() else word for word in words)
-    
+        if 2 <= len(words) <= 4 and len(line) < 40 and NAME_LINE_PATTERN.match(line):
+            # Skip if likely a section header
+            line_lower = line.lower()
+            if not any(kw in line_lower for kw in SECTION_HEADER_WORDS):
+                return _format_name(words)
     return None
 
 
-def extract_skills(text: str) -> List[str]:
-    """Extract skills from text by matching against common skills list"""
-    text_lower = text.lower()
-    found_skills = []
+def extract_name(text: Union[str, ResumeDocument]) -> Optional[str]:
+    """Extract name from text - prioritizing first lines where names typically appear"""
+    doc = as_document(text)
+    lines = doc.lines
+    
+    name = _name_from_lines(lines)
     
-    for skill in COMMON_SKILLS:
-        # Use word boundaries to match whole words
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            # Capitalize properly
-            if skill.isupper() or skill in ['aws', 'gcp', 'sql', 'html', 'css', 'php', 'api', 'llm', 'nlp', 'cnn', 'rnn', 'lstm', 'jwt', 'ssl', 'https', 'tdd', 'oop', 'k8s']:
-                found_skills.append(skill.upper())
-            elif '.' in skill or '-' in skill:
-                found_skills.append(skill)
-            else:
-                found_skills.append(skill.title())
+    # Second pass: Use spaCy NER on first portion
+    if name is None and SPACY_NER_ENABLED:
+        with timed("parse.ner"):
+            name = _name_from_entities(get_nlp()(_ner_portion(doc.text)))
+    
+    if name is None:
+        name = _name_from_lines_relaxed(lines)
+    
+    return name
+
+
+def extract_skill_matches(text: Union[str, ResumeDocument]) -> Dict[str, dict]:
+    """
+    Find vocabulary skills in text with match counts and positions
+
+    Returns:
+        Dict mapping skill to {"count": int, "positions": [start offsets in the text]},
+        in vocabulary order
+    """
+    return _skill_matcher.count_all(text.text if isinstance(text, ResumeDocument) else text)
+
+
+def format_skill(skill: str) -> str:
+    """Capitalize a vocabulary skill for display"""
+    if skill.isupper() or skill in UPPERCASE_SKILLS:
+        return skill.upper()
+    elif '.' in skill or '-' in skill:
+        return skill
+    else:
+        return skill.title()
+
+
+def extract_skills(text: Union[str, ResumeDocument]) -> List[str]:
+    """Extract skills from text by matching against common skills list"""
+    found_skills = [format_skill(skill) for skill in extract_skill_matches(text)]
     
     # Remove duplicates while preserving order
     seen = set()
@@ -197,31 +280,82 @@ def extract_skills(text: str) -> List[str]:
     return unique_skills[:30]  # Limit to top 30 skills
 
 
-def extract_education(text: str) -> List[str]:
-    """Extract education information from text"""
-    education_keywords = [
-        r"\bbachelor'?s?\b", r"\bmaster'?s?\b", r"\bph\.?d\.?\b", r"\bdoctorate\b", r"\bdiploma\b",
-        r"\bb\.?s\.?c?\.?\b", r"\bm\.?s\.?c?\.?\b", r"\bb\.?a\.?\b", r"\bm\.?a\.?\b", r"\bb\.?e\.?\b",
-        r"\bm\.?e\.?\b", r"\bb\.?tech\b", r"\bm\.?tech\b", r"\bmba\b", r"\bbba\b",
-        r"\bassociate'?s?\s+degree\b", r"\bcertificate\b", r"\bcertification\b",
-        r"\bssc\b", r"\bhsc\b", r"\ba\s*[-]?levels?\b", r"\bo\s*[-]?levels?\b"
-    ]
-    
-    degree_pattern = '|'.join(education_keywords)
-    
-    # Also look for university/college mentions
-    # Support both "University of X" and "X University"
-    institution_pattern = r'(?:university|college|institute|school)\s+(?:of\s+)?[A-Za-z\s]+|[A-Za-z\s]+\s+(?:university|college|institute|school)'
-    
-    lines = text.split('\n')
+# Education extraction
+EDUCATION_KEYWORDS = [
+    r"\bbachelor'?s?\b", r"\bmaster'?s?\b", r"\bph\.?d\.?\b", r"\bdoctorate\b", r"\bdiploma\b",
+    r"\bb\.?s\.?c?\.?\b", r"\bm\.?s\.?c?\.?\b", r"\bb\.?a\.?\b", r"\bm\.?a\.?\b", r"\bb\.?e\.?\b",
+    r"\bm\.?e\.?\b", r"\bb\.?tech\b", r"\bm\.?tech\b", r"\bmba\b", r"\bbba\b",
+    r"\bassociate'?s?\s+degree\b", r"\bcertificate\b", r"\bcertification\b",
+    r"\bssc\b", r"\bhsc\b", r"\ba\s*[-]?levels?\b", r"\bo\s*[-]?levels?\b"
+]
+DEGREE_PATTERN = re.compile('|'.join(EDUCATION_KEYWORDS), re.IGNORECASE)
+
+# Also look for university/college mentions
+# Support both "University of X" and "X University"
+# Only used as a yes/no test, so this is the minimal form of
+# r'(?:university|...)\s+(?:of\s+)?[A-Za-z\s]+|[A-Za-z\s]+\s+(?:university|...)'
+# which matches the same lines without the catastrophic backtracking of [A-Za-z\s]+\s+
+INSTITUTION_PATTERN = re.compile(
+    r'(?:university|college|institute|school)\s[A-Za-z\s]|[A-Za-z\s]\s+(?:university|college|institute|school)',
+    re.IGNORECASE
+)
+
+# Regex for checking if a line is primarily a date/year
+# Matches: "2020", "Jan 2020", "2020-2024", "December 2024", "Present", etc.
+DATE_LINE_PATTERN = re.compile(
+    r'\b((?:19|20)\d{2}|present|current|now|ongoing|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\b',
+    re.IGNORECASE
+)
+
+# Job titles / project roles that disqualify a line unless it names a strong degree
+ROLE_LINE_PATTERN = re.compile(
+    r'\b(manager|professor|assistant|lead|senior|junior|intern|member|coordinator|volunteer|developer|engineer'
+    r'|project|research|work|experience)\b',
+    re.IGNORECASE
+)
+STRONG_DEGREE_PATTERN = re.compile(r"\b(bachelor|master|ph\.?d|doctorate|b\.?sc|m\.?sc|mba|ssc|hsc|levels?)\b", re.IGNORECASE)
+
+# A line whose text is repeated twice, e.g. "BRAC University BRAC University"
+REPEATED_LINE_PATTERN = re.compile(r'^(.+?)\s+\1$', re.IGNORECASE)
+
+
+def _collapse_repeated_line(line: str) -> str:
+    """Collapse a line that repeats the same text twice"""
+    dup_match = REPEATED_LINE_PATTERN.match(line)
+    if dup_match and len(dup_match.group(1)) > 5:
+        return dup_match.group(1).strip()
+    return line
+
+
+def _is_education_context_line(line: str) -> bool:
+    """Whether an adjacent line looks like a date or institution worth merging"""
+    is_date = len(line) < 30 and DATE_LINE_PATTERN.search(line)
+    is_inst = not is_date and len(line) < 100 and INSTITUTION_PATTERN.search(line)
+    # Avoid merging project lines
+    return bool(is_date or is_inst) and "project" not in line.lower()
+
+
+def extract_education(text: Union[str, ResumeDocument]) -> List[str]:
+    """
+    Extract education information from text
+
+    When the resume has education or certifications sections, only their lines
+    are read, so state codes ("Boston, MA") and job titles ("Scrum Master")
+    elsewhere are not taken for degrees. Otherwise the whole text is read.
+    """
+    doc = as_document(text)
+    lines = doc.lines
     education_entries = []
     skip_indices = set()
-    
-    # Regex for checking if a line is primarily a date/year
-    # Matches: "2020", "Jan 2020", "2020-2024", "December 2024", "Present", etc.
-    date_line_pattern = r'\b((?:19|20)\d{2}|present|current|now|ongoing|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\b'
-    
-    for i, line in enumerate(lines):
+
+    # Only lines with a degree keyword can produce an entry; finding them in
+    # one pass over the text skips the per-line checks for every other line
+    candidates = doc.lines_matching(DEGREE_PATTERN)
+    section = set(doc.section_lines("education", "certifications"))
+    if section:
+        candidates = [i for i in candidates if i in section]
+    for i in candidates:
+        line = lines[i]
         if i in skip_indices:
             continue
             
@@ -234,7 +368,7 @@ def extract_education(text: str) -> List[str]:
             continue
             
         # Skip lines that look like headers or skill lists
-        if len(line.split()) == 1 and re.match(degree_pattern, line, re.IGNORECASE):
+        if len(line.split()) == 1 and DEGREE_PATTERN.match(line):
              continue
 
         if ':' in line and not ('GPA' in line or 'Grade' in line):
@@ -243,45 +377,29 @@ def extract_education(text: str) -> List[str]:
             
         # Skip lines that look like Job Titles or Project Roles
         # "Team Leader", "Project", "Intern", "Coordinator" etc. should be filtered unless they have a strong degree
-        if re.search(r'\b(manager|professor|assistant|lead|senior|junior|intern|member|coordinator|volunteer|developer|engineer)\b', line, re.IGNORECASE) or \
-           re.search(r'\b(project|research|work|experience)\b', line, re.IGNORECASE):
-             strong_degrees = r"\b(bachelor|master|ph\.?d|doctorate|b\.?sc|m\.?sc|mba|ssc|hsc|levels?)\b"
-             if not re.search(strong_degrees, line, re.IGNORECASE):
-                 # If it doesn't have a strong degree, it's likely experience/project
-                 continue
+        if ROLE_LINE_PATTERN.search(line) and not STRONG_DEGREE_PATTERN.search(line):
+            # If it doesn't have a strong degree, it's likely experience/project
+            continue
 
         # Check for deduplication
-        dup_match = re.match(r'^(.+?)\s+\1$', line, re.IGNORECASE)
-        if dup_match and len(dup_match.group(1)) > 5:
-            line = dup_match.group(1).strip()
+        line = _collapse_repeated_line(line)
 
         # Check if line contains education keywords
-        if re.search(degree_pattern, line, re.IGNORECASE):
+        if DEGREE_PATTERN.search(line):
             # Try to capture context (Date/University) from adjacent lines if they look like dates OR institutions
             
             # Check PREVIOUS line for Date/Institution
             if i > 0:
                 prev_line = lines[i-1].strip()
-                # If prev line is date or institution
-                is_date = len(prev_line) < 30 and re.search(date_line_pattern, prev_line, re.IGNORECASE)
-                is_inst = len(prev_line) < 100 and re.search(institution_pattern, prev_line, re.IGNORECASE)
-                
-                if (is_date or is_inst) and "project" not in prev_line.lower(): # Avoid merging project lines
+                if _is_education_context_line(prev_line):
                      line = prev_line + " " + line
             
             # Check NEXT line for Date/Institution
             if i < len(lines) - 1 and (i+1) not in skip_indices:
                 next_line = lines[i+1].strip()
-                is_date = len(next_line) < 30 and re.search(date_line_pattern, next_line, re.IGNORECASE)
-                is_inst = len(next_line) < 100 and re.search(institution_pattern, next_line, re.IGNORECASE)
-                
-                # Double check deduplication on next line too
-                dup_match_next = re.match(r'^(.+?)\s+\1$', next_line, re.IGNORECASE)
-                if dup_match_next and len(dup_match_next.group(1)) > 5:
-                    next_line = dup_match_next.group(1).strip()
-                
-                if (is_date or is_inst) and "project" not in next_line.lower():
-                     line = line + ", " + next_line
+                if _is_education_context_line(next_line):
+                     # Double check deduplication on next line too
+                     line = line + ", " + _collapse_repeated_line(next_line)
                      skip_indices.add(i+1)
 
             # Clean up the line
@@ -289,8 +407,6 @@ def extract_education(text: str) -> List[str]:
                 education_entries.append(line)
                 continue
     
-    # Remove duplicates and fuzzy subsets
-    
     # Remove duplicates and fuzzy subsets
     # Logic: If 'North South University' is in the list, but we also have 'B.Sc ... North South University',
     # remove the shorter one.
@@ -330,21 +446,57 @@ def extract_education(text: str) -> List[str]:
     return final_education[:5]  # Limit to 5 entries
 
 
-def parse_date(date_str: str) -> Optional[datetime]:
-    """Parse a date string into a datetime object"""
-    date_str = date_str.strip().lower()
-    
-    # Handle "present", "current", "now"
-    if date_str in ['present', 'current', 'now', 'ongoing', 'till date', 'to date']:
-        return datetime.now()
-    
+# Date parsing
+PRESENT_WORDS = {'present', 'current', 'now', 'ongoing', 'till date', 'to date'}
+YEAR_PATTERN = re.compile(r'\b(19|20)\d{2}\b')
+
+# Month names dateutil understands ("jan", "sept", "september", ...) -> month number
+MONTH_NUMBERS = {
+    name.lower(): number
+    for number, names in enumerate(date_parser.parserinfo.MONTHS, 1)
+    for name in names
+}
+# Shapes captured by DATE_RANGE_PATTERNS: "jan 2020", "sept. 2020", "2020", "03/2020"
+MONTH_YEAR_PATTERN = re.compile(r'([a-z]+)\.?\s*((?:19|20)\d{2})')
+NUMERIC_MONTH_YEAR_PATTERN = re.compile(r'(0?[1-9]|1[0-2])\s*/\s*((?:19|20)\d{2})')
+YEAR_ONLY_PATTERN = re.compile(r'(?:19|20)\d{2}')
+
+
+def get_reference_date() -> datetime:
+    """Today at midnight - what "present" means, and what fills in missing date fields"""
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _fill_date(year: int, month: int, reference_date: datetime) -> datetime:
+    """A date in year/month with the reference day, clipped to the month's length like dateutil does"""
+    return datetime(year, month, min(reference_date.day, calendar.monthrange(year, month)[1]))
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str, reference_date: datetime) -> Optional[datetime]:
+    # Fast paths: the shapes the range regexes capture, resolved by table lookup
+    if date_str in PRESENT_WORDS:
+        return reference_date
+
+    match = MONTH_YEAR_PATTERN.fullmatch(date_str)
+    if match and match.group(1) in MONTH_NUMBERS:
+        return _fill_date(int(match.group(2)), MONTH_NUMBERS[match.group(1)], reference_date)
+
+    match = NUMERIC_MONTH_YEAR_PATTERN.fullmatch(date_str)
+    if match:
+        return _fill_date(int(match.group(2)), int(match.group(1)), reference_date)
+
+    if YEAR_ONLY_PATTERN.fullmatch(date_str):
+        return _fill_date(int(date_str), reference_date.month, reference_date)
+
+    # Anything else (e.g. "junior 2020") goes through fuzzy dateutil parsing
     try:
-        return date_parser.parse(date_str, fuzzy=True)
+        return date_parser.parse(date_str, fuzzy=True, default=reference_date)
     except:
         pass
     
     # Try year only
-    year_match = re.search(r'\b(19|20)\d{2}\b', date_str)
+    year_match = YEAR_PATTERN.search(date_str)
     if year_match:
         try:
             return datetime(int(year_match.group()), 6, 1)  # Assume middle of year
@@ -354,104 +506,246 @@ def parse_date(date_str: str) -> Optional[datetime]:
     return None
 
 
-def extract_experience_details(text: str) -> Tuple[float, List[dict]]:
+def parse_date(date_str: str, reference_date: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Parse a date string into a datetime object
+
+    Results match fuzzy dateutil parsing with the reference date as default:
+    fields missing from the string (the day, or the month for a bare year)
+    come from the reference date, and "present" is the reference date itself.
+    Parses are memoized, since the same few strings repeat across resumes.
+
+    Args:
+        date_str: Date text such as "jan 2020", "2020", "03/2020" or "present"
+        reference_date: Date resolving "present" and missing fields (default: today)
+
+    Returns:
+        Parsed datetime, or None if the string has no date
+    """
+    if reference_date is None:
+        reference_date = get_reference_date()
+    return _parse_date_cached(date_str.strip().lower(), reference_date)
+
+
+def month_index(date: datetime) -> int:
+    """Months since year 0, so that month intervals can be compared and subtracted"""
+    return date.year * 12 + date.month - 1
+
+
+def format_month(index: int) -> str:
+    """Month index as a "YYYY-MM" string"""
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def parse_month(value: str) -> int:
+    """Month index of a "YYYY-MM" string"""
+    year, month = value.split('-')
+    return int(year) * 12 + int(month) - 1
+
+
+def merge_month_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Union of half-open [start, end) month intervals
+
+    Overlapping and touching intervals are merged, so every month is covered once.
+
+    Args:
+        intervals: (start month index, end month index) pairs in any order
+
+    Returns:
+        Disjoint intervals sorted by start
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def count_months(intervals: Iterable[Tuple[int, int]]) -> int:
+    """Number of distinct months covered by month intervals"""
+    return sum(end - start for start, end in merge_month_intervals(intervals))
+
+
+def breakdown_interval(item: dict) -> Tuple[int, int]:
+    """[start, end) month interval of an experience breakdown item"""
+    return parse_month(item["start_month"]), parse_month(item["end_month"])
+
+
+# Experience extraction
+# Patterns for date ranges
+DATE_RANGE_PATTERNS = [
+    # "Jan 2020 - Present", "January 2020 to December 2023"
+    re.compile(r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*\d{4})\s*[-–—to]+\s*((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*\d{4}|present|current|now|ongoing)', re.IGNORECASE),
+    # "2020 - 2023", "2020-Present"
+    re.compile(r'(\b(?:19|20)\d{2}\b)\s*[-–—to]+\s*((?:19|20)\d{2}|present|current|now|ongoing)', re.IGNORECASE),
+    # "03/2020 - 12/2023"
+    re.compile(r'(\d{1,2}/\d{4})\s*[-–—to]+\s*(\d{1,2}/\d{4}|present|current|now|ongoing)', re.IGNORECASE),
+]
+# Common job titles to look for
+# We will search context around dates for these
+JOB_KEYWORDS = [
+    "developer", "engineer", "scientist", "analyst", "manager", "lead", "architect",
+    "consultant", "administrator", "designer", "intern", "assistant", "executive",
+    "officer", "representative", "specialist", "coordinator", "director", "head",
+    "vp", "president", "founder", "co-founder", "support", "service", "agent"
+]
+JOB_TITLE_PATTERN = re.compile(r'\b(?:' + '|'.join(re.escape(kw) for kw in JOB_KEYWORDS) + r')\b', re.IGNORECASE)
+
+# Longest line next to an education entry still read as its study period ("Sep 2011 - Jun 2015")
+MAX_STUDY_PERIOD_LINE = 40
+# Spelled-out degrees that mark a study entry anywhere in a resume. The two-letter
+# forms of DEGREE_PATTERN are also US state codes ("Boston, MA", "Portland, ME")
+# and "Master" alone is a job title ("Scrum Master"), so those only count inside
+# an education section
+STUDY_DEGREE_PATTERN = re.compile(
+    r"\b(?:bachelor'?s?|masters?\s+(?:of|in)|master'?s\b|ph\.?\s?d|doctorate|b\.?sc|m\.?sc|mba|ssc|hsc|[ao]\s*-?\s*levels?)\b",
+    re.IGNORECASE
+)
+
+
+def _is_education_entry(doc: ResumeDocument, line_idx: int) -> bool:
+    """Whether a line is an education entry: a spelled-out degree, or a degree or school inside an education section"""
+    line = doc.lines[line_idx]
+    if STUDY_DEGREE_PATTERN.search(line):
+        return True
+    if doc.section_of(line_idx) != "education":
+        return False
+    is_job = ROLE_LINE_PATTERN.search(line) or JOB_TITLE_PATTERN.search(line)
+    return not is_job and bool(DEGREE_PATTERN.search(line) or INSTITUTION_PATTERN.search(line))
+
+
+def education_entry_lines(doc: ResumeDocument) -> set:
+    """
+    Lines of education entries, whose date ranges are study periods rather than work
+
+    Outside an education section only a spelled-out degree marks an entry, so
+    locations ("Boston, MA") and schools named as employers stay experience.
+    Inside one, a line naming a degree or an institution without a job title
+    is an entry too ("Research Assistant, State University" is a job). A
+    short line right before or after an entry line is its study period unless
+    it has a job title of its own. Only lines around dated lines are examined.
+    """
+    entries = set()
+    for i in doc.lines_with(LINE_YEAR):
+        for j in (i - 1, i, i + 1):
+            if 0 <= j < len(doc.lines) and j not in entries and _is_education_entry(doc, j):
+                entries.add(j)
+    periods = {
+        j for i in entries for j in (i - 1, i + 1)
+        if 0 <= j < len(doc.lines)
+        and len(doc.lines[j].strip()) <= MAX_STUDY_PERIOD_LINE
+        and not JOB_TITLE_PATTERN.search(doc.lines[j])
+    }
+    return entries | periods
+
+
+# "5 years of experience"
+EXPERIENCE_YEARS_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'),
+    re.compile(r'(?:experience|exp)[:\s]*(\d+)\+?\s*(?:years?|yrs?)'),
+    re.compile(r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:in|of|as)'),
+]
+
+
+def find_title_in_context(line_idx: int, lines: List[str]) -> str:
+    """Find a job title on the date line or up to 2 lines before/after it"""
+    # Many resumes have Date \n Title or Title \n Date
+    start = max(0, line_idx - 2)
+    end = min(len(lines), line_idx + 3) # +3 to include line_idx+2
+    
+    for line in lines[start:end]:
+        line = line.strip()
+        # Does it contain a known role keyword? Use the whole line as the title if it's not too long
+        if line and len(line) < 80 and JOB_TITLE_PATTERN.search(line):
+            return line
+    return "Unknown Role"
+
+
+def extract_experience_details(
+    text: Union[str, ResumeDocument],
+    reference_date: Optional[datetime] = None
+) -> Tuple[float, List[dict]]:
     """
     extract total years and a breakdown of experience by role
     Returns: (total_years, breakdown_list)
-    breakdown_list = [{"title": str, "years": float, "is_current": bool}]
+    breakdown_list = [{"title": str, "years": float, "start": str, "end": str,
+                       "start_month": "YYYY-MM", "end_month": "YYYY-MM"}]
+    reference_date resolves "present" (default: today)
+
+    Ranges are counted at month granularity and the total is the union of
+    all ranges, so overlapping jobs and repeated ranges count once. Ranges
+    on education entry lines (see education_entry_lines) are ignored.
     """
-    # Patterns for date ranges
-    date_range_patterns = [
-        # "Jan 2020 - Present", "January 2020 to December 2023"
-        r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*\d{4})\s*[-–—to]+\s*((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*\d{4}|present|current|now|ongoing)',
-        # "2020 - 2023", "2020-Present"
-        r'(\b(?:19|20)\d{2}\b)\s*[-–—to]+\s*((?:19|20)\d{2}|present|current|now|ongoing)',
-        # "03/2020 - 12/2023"
-        r'(\d{1,2}/\d{4})\s*[-–—to]+\s*(\d{1,2}/\d{4}|present|current|now|ongoing)',
-    ]
-    
-    total_months = 0
+    intervals = []
     breakdown = []
-    
-    # Common job titles to look for
-    # We will search context around dates for these
-    job_keywords = [
-        "developer", "engineer", "scientist", "analyst", "manager", "lead", "architect", 
-        "consultant", "administrator", "designer", "intern", "assistant", "executive", 
-        "officer", "representative", "specialist", "coordinator", "director", "head",
-        "vp", "president", "founder", "co-founder", "support", "service", "agent"
-    ]
-    
-    lines = text.split('\n')
-    text_lower = text.lower()
-    
-    # Helper to find title in context
-    def find_title_in_context(line_idx, lines_list):
-        # Check current line, 2 lines before, AND 2 lines after
-        # Many resumes have Date \n Title or Title \n Date
-        start = max(0, line_idx - 2)
-        end = min(len(lines_list), line_idx + 3) # +3 to include line_idx+2
-        context = lines_list[start:end]
-        
-        best_title = "Unknown Role"
-        for l in context:
-            l = l.strip()
-            if not l: continue
-            
-            # Simple check: does it contain a known role keyword?
-            for kw in job_keywords:
-                 if re.search(r'\b' + re.escape(kw) + r'\b', l, re.IGNORECASE):
-                      # Avoid "Project Manager" if we only matched "Manager"? No, keep generic.
-                      # Ideally we want the full title.
-                      # Let's clean the line and use it if it's not too long
-                      if len(l) < 80: # Increased limit to capture longer titles
-                          return l
-        return best_title
+    seen_ranges = set()
+    if reference_date is None:
+        reference_date = get_reference_date()
+    
+    doc = as_document(text)
+    lines = doc.lines
+    # Study periods ("B.Sc., State University, 2016 - 2020") are not work experience
+    education_lines = education_entry_lines(doc)
 
     # We need to match date ranges in the original text structure (lines)
     # But regex finds them in the whole string.
     # Let's iterate lines and find date ranges line by line to keep context.
+    # Every date range needs a 4-digit year, so only those lines are scanned.
     
-    for i, line in enumerate(lines):
-        line_lower = line.lower()
-        for pattern in date_range_patterns:
-            matches = re.findall(pattern, line_lower, re.IGNORECASE)
-            for match in matches:
-                start_str, end_str = match
-                start_date = parse_date(start_str)
-                end_date = parse_date(end_str)
+    for i in doc.lines_with(LINE_YEAR):
+        if i in education_lines:
+            continue
+        line_lower = doc.lower_lines[i]
+        title = None
+        # Spans already matched on this line; a looser pattern re-matching part of
+        # "jan 2019 - present" as "2019 - present" is the same range
+        matched_spans = []
+        for pattern in DATE_RANGE_PATTERNS:
+            for match in pattern.finditer(line_lower):
+                span_start, span_end = match.span()
+                if any(span_start < end and start < span_end for start, end in matched_spans):
+                    continue
+                matched_spans.append((span_start, span_end))
+                start_str, end_str = match.group(1), match.group(2)
+                start_date = parse_date(start_str, reference_date)
+                end_date = parse_date(end_str, reference_date)
                 
+                # Calculate months
                 if start_date and end_date:
-                    # Calculate months
-                    if end_date > start_date:
-                        diff = relativedelta(end_date, start_date)
-                        months = diff.years * 12 + diff.months
-                        if months > 0:
-                            # Contextualize
+                    start_month = month_index(start_date)
+                    end_month = month_index(end_date)
+                    if end_month > start_month:
+                        # Contextualize (once per line)
+                        if title is None:
                             title = find_title_in_context(i, lines)
-                            
-                            breakdown.append({
-                                "title": title,
-                                "years": round(months / 12.0, 1),
-                                "start": start_str,
-                                "end": end_str
-                            })
-                            total_months += months
-
-    # Deduplicate breakdown: If same title and almost same years, probably duplicate find
-    # Or if overlap. For now simple summary.
-    
+
+                        intervals.append((start_month, end_month))
+                        # The same role and range repeated (e.g. in a summary) is listed once
+                        if (title, start_month, end_month) in seen_ranges:
+                            continue
+                        seen_ranges.add((title, start_month, end_month))
+                        breakdown.append({
+                            "title": title,
+                            "years": round((end_month - start_month) / 12.0, 1),
+                            "start": start_str,
+                            "end": end_str,
+                            "start_month": format_month(start_month),
+                            "end_month": format_month(end_month)
+                        })
+
+    # Months covered by any role, each month counted once
+    total_months = count_months(intervals)
+
     # If no date ranges found, fallback to total years logic (without breakdown)
     if total_months == 0:
-        # "5 years of experience"
-        exp_patterns = [
-            r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
-            r'(?:experience|exp)[:\s]*(\d+)\+?\s*(?:years?|yrs?)',
-             r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:in|of|as)',
-        ]
+        text_lower = doc.lower_text
         total_yrs = 0.0
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, text_lower)
+        for pattern in EXPERIENCE_YEARS_PATTERNS:
+            matches = pattern.findall(text_lower)
             if matches:
                 try:
                     total_yrs = max(float(m) for m in matches)
@@ -479,6 +773,28 @@ def get_experience_level(years: float) -> str:
         return "Senior"
 
 
+def _parse_fields(doc: ResumeDocument) -> dict:
+    """Everything parse_resume extracts except the name"""
+    with timed("parse.experience"):
+        exp_years, exp_breakdown = extract_experience_details(doc)
+    with timed("parse.contact"):
+        email = extract_email(doc)
+        phone = extract_phone(doc)
+    with timed("parse.skills"):
+        skills = extract_skills(doc)
+    with timed("parse.education"):
+        education = extract_education(doc)
+
+    return {
+        "email": email,
+        "phone": phone,
+        "skills": skills,
+        "education": education,
+        "experience_years": exp_years,
+        "experience_breakdown": exp_breakdown
+    }
+
+
 def parse_resume(text: str) -> dict:
     """
     Parse resume text and extract all relevant information
@@ -489,14 +805,47 @@ def parse_resume(text: str) -> dict:
     Returns:
         Dictionary with extracted information
     """
-    exp_years, exp_breakdown = extract_experience_details(text)
-    
-    return {
-        "name": extract_name(text),
-        "email": extract_email(text),
-        "phone": extract_phone(text),
-        "skills": extract_skills(text),
-        "education": extract_education(text),
-        "experience_years": exp_years,
-        "experience_breakdown": exp_breakdown
-    }
+    with timed("parse.document"):
+        doc = ResumeDocument(text)
+    with timed("parse.name"):
+        name = extract_name(doc)
+    return {"name": name, **_parse_fields(doc)}
+
+
+def parse_resumes(texts: Iterable[str], batch_size: int = 64, n_process: int = 1) -> List[dict]:
+    """
+    Parse many resumes, batching the NER name fallback through nlp.pipe
+
+    The regex name passes run first; only resumes that still have no name
+    are sent through spaCy, in batches and optionally across processes.
+    Results are identical to calling parse_resume on each text.
+
+    Args:
+        texts: Resume text contents
+        batch_size: Documents per nlp.pipe batch
+        n_process: Processes used by nlp.pipe (-1 for all CPUs)
+
+    Returns:
+        List of parse_resume dictionaries in input order
+    """
+    texts = list(texts)
+    with timed("parse.document"):
+        docs = [ResumeDocument(text) for text in texts]
+    names = [_name_from_lines(doc.lines) for doc in docs]
+    needs_ner = [i for i, name in enumerate(names) if name is None]
+
+    if needs_ner and SPACY_NER_ENABLED:
+        with timed("parse.ner"):
+            ner_docs = get_nlp().pipe(
+                (_ner_portion(texts[i]) for i in needs_ner),
+                batch_size=batch_size,
+                n_process=n_process
+            )
+            for i, ner_doc in zip(needs_ner, ner_docs):
+                names[i] = _name_from_entities(ner_doc)
+
+    for i in needs_ner:
+        if names[i] is None:
+            names[i] = _name_from_lines_relaxed(docs[i].lines)
+
+    return [{"name": name, **_parse_fields(doc)} for name, doc in zip(names, docs)]
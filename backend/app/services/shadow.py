@@ -0,0 +1,117 @@
+"""
+Shadow Scoring Service
+Scores a sampled fraction of classified resumes with a candidate model on a background thread and tracks agreement
+"""
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from app.config import SHADOW_SAMPLE_RATE, SHADOW_MAX_PENDING
+from app.services.metrics import SHADOW_PREDICTIONS, timed
+
+
+class ShadowScorer:
+    """
+    Compares a shadow model's labels with the primary model's, off the request path
+
+    Sampled texts are handed to a single background thread; when more than
+    max_pending batches are waiting, new samples are dropped instead of
+    queued, so a slow candidate never holds up the primary response.
+    """
+
+    def __init__(self, sample_rate: float, max_pending: int):
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.max_pending = max(1, max_pending)
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        # (primary version, shadow version) -> counters
+        self._stats: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def submit(self, texts: List[str], labels: List[str], confidences: List[float], primary_version: str, shadow):
+        """
+        Sample texts of a primary prediction and queue them for the shadow model
+
+        Args:
+            texts: Classified resume texts
+            labels: Primary model labels, aligned with texts
+            confidences: Primary model confidences, aligned with texts
+            primary_version: Version of the primary model
+            shadow: LoadedModel to compare against
+        """
+        if self.sample_rate <= 0:
+            return
+        sampled = [i for i in range(len(texts)) if random.random() < self.sample_rate]
+        if not sampled:
+            return
+
+        key = (primary_version, shadow.version)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._count(key, "dropped", len(sampled))
+                return
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+        self._executor.submit(
+            self._score, key, shadow.model,
+            [texts[i] for i in sampled], [labels[i] for i in sampled], [confidences[i] for i in sampled]
+        )
+
+    def _score(self, key: Tuple[str, str], model, texts: List[str], labels: List[str], confidences: List[float]):
+        try:
+            with timed("shadow.predict"):
+                probabilities = model.predict_proba(texts)
+            best = probabilities.argmax(axis=1)
+            agreed = 0
+            confidence_delta = 0.0
+            for row, (col, label, confidence) in enumerate(zip(best, labels, confidences)):
+                agreed += str(model.classes_[col]) == label
+                confidence_delta += abs(float(probabilities[row, col]) - confidence)
+            with self._lock:
+                self._count(key, "agree", agreed)
+                self._count(key, "disagree", len(texts) - agreed)
+                self._count(key, "confidence_delta_sum", confidence_delta)
+        except Exception as e:
+            print(f"Warning: shadow scoring with model {key[1]} failed: {e}")
+            with self._lock:
+                self._count(key, "error", len(texts))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _count(self, key: Tuple[str, str], outcome: str, amount: float):
+        """Add to a counter; the caller holds the lock"""
+        stats = self._stats.setdefault(key, {
+            "agree": 0, "disagree": 0, "dropped": 0, "error": 0, "confidence_delta_sum": 0.0
+        })
+        stats[outcome] += amount
+        if outcome != "confidence_delta_sum" and amount:
+            SHADOW_PREDICTIONS.inc(amount, primary_version=key[0], shadow_version=key[1], outcome=outcome)
+
+    def stats(self) -> List[dict]:
+        """Agreement per (primary, shadow) version pair"""
+        with self._lock:
+            snapshot = sorted((key, dict(stats)) for key, stats in self._stats.items())
+        results = []
+        for (primary_version, shadow_version), stats in snapshot:
+            compared = stats["agree"] + stats["disagree"]
+            results.append({
+                "primary_version": primary_version,
+                "shadow_version": shadow_version,
+                "compared": compared,
+                "agreed": stats["agree"],
+                "agreement_rate": round(stats["agree"] / compared, 4) if compared else None,
+                "mean_confidence_delta": round(stats["confidence_delta_sum"] / compared, 4) if compared else None,
+                "dropped": stats["dropped"],
+                "errors": stats["error"],
+            })
+        return results
+
+
+_scorer = ShadowScorer(SHADOW_SAMPLE_RATE, SHADOW_MAX_PENDING)
+
+
+def get_shadow_scorer() -> ShadowScorer:
+    """Return the process-wide shadow scorer"""
+    return _scorer
@@ -0,0 +1,140 @@
+"""
+Skill Matcher Service
+Aho-Corasick automaton that finds every skill of a vocabulary in one pass over the text
+"""
+from typing import Dict, Iterable, List
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same notion of a word character as the regex \\w class"""
+    return ch.isalnum() or ch == '_'
+
+
+def load_skill_vocabulary(path: str) -> List[str]:
+    """
+    Load a skill vocabulary file
+
+    One skill per line; blank lines and lines starting with '#' are ignored.
+
+    Args:
+        path: Path to the vocabulary file
+
+    Returns:
+        Skills in file order, without duplicates
+    """
+    skills = []
+    seen = set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            skill = line.strip()
+            if not skill or skill.startswith('#'):
+                continue
+            if skill.lower() not in seen:
+                seen.add(skill.lower())
+                skills.append(skill)
+    return skills
+
+
+class SkillMatcher:
+    """
+    Multi-pattern matcher built once for a skill vocabulary
+
+    Matches are case-insensitive and must sit on word boundaries with the
+    same semantics as r'\\b' + re.escape(skill) + r'\\b'. Scanning costs one
+    pass over the text regardless of vocabulary size.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills = list(skills)
+
+        # Trie transitions, failure links and the pattern ids ending at each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._lengths: List[int] = []
+
+        for skill_id, skill in enumerate(self.skills):
+            pattern = skill.lower()
+            self._lengths.append(len(pattern))
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(skill_id)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        # Breadth-first, so every state's failure target is finished before its children
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Patterns ending at the failure target also end here
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text: str) -> Dict[int, List[int]]:
+        """
+        Find every whole-word occurrence of every skill
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Dict mapping skill index (into self.skills) to sorted start offsets
+        """
+        text = text.lower()
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        lengths = self._lengths
+        text_length = len(text)
+
+        matches: Dict[int, List[int]] = {}
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+
+            end = i + 1
+            end_is_word = _is_word_char(ch)
+            after_is_word = end < text_length and _is_word_char(text[end])
+            if end_is_word == after_is_word:
+                continue  # No word boundary after the match
+
+            for skill_id in output[state]:
+                start = end - lengths[skill_id]
+                before_is_word = start > 0 and _is_word_char(text[start - 1])
+                if before_is_word != _is_word_char(text[start]):
+                    matches.setdefault(skill_id, []).append(start)
+        return matches
+
+    def count_all(self, text: str) -> Dict[str, dict]:
+        """
+        Find skills with their match counts and positions
+
+        Returns:
+            Dict mapping skill to {"count": int, "positions": [start offsets]},
+            in vocabulary order
+        """
+        matches = self.find_all(text)
+        return {
+            self.skills[skill_id]: {"count": len(positions), "positions": positions}
+            for skill_id, positions in sorted(matches.items())
+        }
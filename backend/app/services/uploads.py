@@ -0,0 +1,312 @@
+"""
+Upload Spooling Service
+Reads uploaded files in chunks, hashing them on the way and spilling large ones to disk,
+and caps upload and request body sizes for the routers
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+import zipfile
+from typing import Dict, Optional, Union
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from app.config import UPLOAD_SPOOL_THRESHOLD, UPLOAD_MAX_BYTES, PDF_MAX_BYTES, TEXT_MAX_CHARS
+from app.services.metrics import observe, timed, INPUTS, INPUT_BYTES, STAGE_ERRORS
+
+
+# Bytes read from the upload per chunk
+CHUNK_SIZE = 64 * 1024
+# Leading bytes inspected to tell a file's type; PDF readers accept up to 1 KB before the header
+SNIFF_BYTES = 1024
+PDF_SIGNATURE = b"%PDF-"
+ZIP_SIGNATURES = (b"PK\x03\x04", b"PK\x05\x06")
+
+# Extensions accepted by /analyze, and by /analyze/batch (directly or inside a zip archive)
+SUPPORTED_FILE_TYPES = ('.pdf', '.docx')
+BATCH_FILE_TYPES = ('.pdf', '.docx', '.txt')
+
+
+MEGABYTE = 1024 * 1024
+
+
+def _format_limit(limit: int) -> str:
+    """A byte limit exactly as configured: in MB when a whole number of tenths, otherwise in bytes"""
+    if limit * 10 % MEGABYTE:
+        return f"{limit} bytes"
+    return f"{limit / MEGABYTE:.1f}".rstrip("0").rstrip(".") + " MB"
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload (or the content unpacked from it) exceeds its byte limit"""
+
+    def __init__(self, limit: int, subject: str = "File"):
+        super().__init__(f"{subject} is larger than the {_format_limit(limit)} limit")
+        self.limit = limit
+
+
+class UploadTypeError(ValueError):
+    """Raised when an upload's content does not match its file type"""
+
+    def __init__(self, file_type: str):
+        super().__init__(f"File content is not a valid {file_type.upper()} file")
+        self.file_type = file_type
+
+
+def sniff_file_type(head: bytes) -> Optional[str]:
+    """
+    File type told by the first bytes of a file
+
+    Returns:
+        "pdf", "zip" (DOCX files are zip archives), "txt" for content without NUL bytes, or None
+    """
+    head = head[:SNIFF_BYTES]
+    # Zip first: an archive whose first member is a stored PDF has a PDF header near its start
+    if head.startswith(ZIP_SIGNATURES):
+        return "zip"
+    if PDF_SIGNATURE in head:
+        return "pdf"
+    if head and b"\x00" not in head:
+        return "txt"
+    return None
+
+
+def check_file_type(file_type: str, head: bytes):
+    """Raise UploadTypeError unless the first bytes of a file match file_type ("pdf", "docx", "zip" or "txt")"""
+    expected = "zip" if file_type == "docx" else file_type
+    if sniff_file_type(head) != expected:
+        raise UploadTypeError(file_type)
+
+
+def check_docx(source: Union[bytes, str]):
+    """Raise UploadTypeError unless a zip archive (bytes or path) holds a Word document"""
+    try:
+        with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source) as archive:
+            archive.getinfo("word/document.xml")
+    except (zipfile.BadZipFile, KeyError):
+        raise UploadTypeError("docx")
+
+
+class SpooledUpload:
+    """Uploaded content held in memory (small files) or in a temp file (large files)"""
+
+    def __init__(self, content: Optional[bytes], path: Optional[str], digest: str, size: int):
+        self.content = content
+        self.path = path
+        self.digest = digest
+        self.size = size
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """Raw bytes, or the temp file path for spooled uploads"""
+        return self.path if self.path is not None else self.content
+
+    def cleanup(self):
+        """Delete the temp file, if any"""
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+async def spool_upload(
+    upload: UploadFile,
+    max_bytes: int = 0,
+    memory_limit: int = UPLOAD_SPOOL_THRESHOLD,
+    file_type: Optional[str] = None
+) -> SpooledUpload:
+    """
+    Read an upload in chunks without ever holding more than memory_limit bytes
+
+    Args:
+        upload: The uploaded file
+        max_bytes: Reject uploads larger than this with UploadTooLargeError (0 for no limit)
+        memory_limit: Uploads larger than this are written to a temp file
+        file_type: Reject uploads whose first bytes do not match this type with UploadTypeError,
+            before reading the rest ("pdf", "docx", "zip" or "txt"; None skips the check)
+
+    Returns:
+        SpooledUpload with the content (or temp file path), SHA-256 digest and size
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    spool_file = None
+    size = 0
+    head = b"" if file_type else None
+
+    try:
+        while True:
+            chunk = await upload.read(CHUNK_SIZE)
+            if head is not None and (not chunk or len(head) + len(chunk) >= SNIFF_BYTES):
+                check_file_type(file_type, head + chunk)
+                head = None
+            elif head is not None:
+                head += chunk
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise UploadTooLargeError(max_bytes)
+            digest.update(chunk)
+
+            if spool_file is None and len(buffer) + len(chunk) > memory_limit:
+                spool_file = tempfile.NamedTemporaryFile(prefix="resume-upload-", delete=False)
+                await run_in_threadpool(spool_file.write, bytes(buffer))
+                buffer = None
+            if spool_file is not None:
+                await run_in_threadpool(spool_file.write, chunk)
+            else:
+                buffer.extend(chunk)
+    except BaseException:
+        if spool_file is not None:
+            spool_file.close()
+            os.remove(spool_file.name)
+        raise
+
+    if spool_file is not None:
+        spool_file.close()
+        return SpooledUpload(None, spool_file.name, digest.hexdigest(), size)
+    return SpooledUpload(bytes(buffer), None, digest.hexdigest(), size)
+
+
+def count_input(input_type: str, size: int):
+    """Count a received resume by type and size"""
+    observe(INPUTS.name, 1, input_type=input_type)
+    observe(INPUT_BYTES.name, size, input_type=input_type)
+
+
+def input_type_of(filename: Optional[str]) -> str:
+    """Input type label for a lowercased file name (None for text input)"""
+    if filename is None:
+        return "text"
+    return filename.rsplit('.', 1)[-1] if '.' in filename else "unknown"
+
+
+def upload_limit(file_type: str) -> int:
+    """Byte limit of an uploaded file type (0 for no limit)"""
+    if file_type == "zip":
+        return 0
+    limits = [limit for limit in (UPLOAD_MAX_BYTES, PDF_MAX_BYTES if file_type == "pdf" else 0) if limit]
+    return min(limits, default=0)
+
+
+async def receive_upload(upload: UploadFile, filename: str) -> SpooledUpload:
+    """
+    Spool an uploaded file, rejecting it with 413 once it exceeds its size limit
+    and with 415 when its content does not match its extension
+
+    The file type is checked on the first bytes, before the rest of the upload is read.
+    """
+    file_type = input_type_of(filename)
+    sniffed_type = file_type if file_type in ("pdf", "docx", "zip", "txt") else None
+    try:
+        with timed("read"):
+            spooled = await spool_upload(upload, max_bytes=upload_limit(file_type), file_type=sniffed_type)
+    except UploadTooLargeError as e:
+        STAGE_ERRORS.inc(stage="read", reason="too_large")
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadTypeError as e:
+        raise content_type_error(e)
+    if file_type == "docx":
+        try:
+            await run_in_threadpool(check_docx, spooled.source)
+        except UploadTypeError as e:
+            spooled.cleanup()
+            raise content_type_error(e)
+    count_input(file_type, spooled.size)
+    return spooled
+
+
+def content_type_error(error: UploadTypeError) -> HTTPException:
+    """415 for a file whose content does not match its extension"""
+    STAGE_ERRORS.inc(stage="read", reason="bad_type")
+    return HTTPException(status_code=415, detail=f"{error}. The file type is checked on its content, not its name.")
+
+
+def check_text_length(text: str, field: str = "Resume text"):
+    """Reject form text longer than TEXT_MAX_CHARS with 413"""
+    if TEXT_MAX_CHARS and len(text) > TEXT_MAX_CHARS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{field} is longer than the {TEXT_MAX_CHARS} character limit."
+        )
+
+
+class RequestSizeLimitMiddleware:
+    """
+    ASGI middleware rejecting request bodies over a byte limit with 413
+
+    The limit is checked against Content-Length before the body is read, and
+    against the bytes received while it streams in (chunked uploads have no
+    Content-Length). An oversized request is cut off after at most the limit
+    instead of being parsed and spooled in full: the app sees a disconnect and
+    whatever it answers is dropped in favor of the 413.
+    """
+
+    def __init__(self, app, max_bytes: int, path_limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            app: The wrapped ASGI app
+            max_bytes: Largest request body accepted (0 for no limit)
+            path_limits: Limits replacing max_bytes for exact request paths
+        """
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        limit = self.path_limits.get(scope["path"], self.max_bytes) if scope["type"] == "http" else 0
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            await _send_too_large(send, limit)
+            return
+
+        received = 0
+        started = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    rejected = True
+                    if not started:
+                        await _send_too_large(send, limit)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if rejected:
+                return
+            started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+
+
+async def _send_too_large(send, limit: int):
+    """Send a 413 response shaped like FastAPI's HTTPException responses"""
+    body = json.dumps({"detail": f"Request body is larger than the {_format_limit(limit)} limit"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            # The rest of the body is never read, so the connection cannot be reused
+            (b"connection", b"close"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
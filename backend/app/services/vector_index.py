@@ -0,0 +1,217 @@
+"""
+Vector Index Service
+Unit vectors in a memory-mapped float32 file with their ids and metadata in SQLite, searched by blocked cosine similarity
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+VECTORS_FILE = "vectors.f32"
+ITEMS_DB = "items.sqlite"
+
+# Rows scored per matrix product; bounds the temporary score buffer and keeps each block cache-friendly
+BLOCK_ROWS = 262144
+# The vector file grows by doubling, starting at this many rows
+MIN_CAPACITY = 1024
+
+
+class VectorIndex:
+    """
+    Append-only store of L2-normalized vectors, searched by exact cosine similarity
+
+    Vectors live in a raw float32 file mapped with np.memmap, so the OS page
+    cache holds them and every process opening the index shares the pages.
+    Ids, metadata and the row count live in SQLite: a row is visible to
+    searches only once its transaction commits, and SQLite's write lock
+    serializes writers, including ones in other processes.
+    """
+
+    def __init__(self, directory: str, dim: int):
+        self.directory = directory
+        self.dim = dim
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, VECTORS_FILE)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, ITEMS_DB), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "row INTEGER PRIMARY KEY, item_id TEXT NOT NULL UNIQUE, info TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.execute("INSERT OR IGNORE INTO settings VALUES ('dim', ?)", (str(dim),))
+        stored_dim = int(self._db.execute("SELECT value FROM settings WHERE name = 'dim'").fetchone()[0])
+        if stored_dim != dim:
+            raise ValueError(f"Index at {directory} holds {stored_dim}-dimensional vectors, not {dim}")
+
+        if not os.path.exists(self._vectors_path):
+            with open(self._vectors_path, 'wb') as f:
+                f.truncate(MIN_CAPACITY * dim * 4)
+        self._vectors = None
+        self._remap()
+
+    def _remap(self):
+        """Map the whole vector file (it only ever grows)"""
+        capacity = os.path.getsize(self._vectors_path) // (self.dim * 4)
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def _snapshot(self) -> Tuple[int, np.ndarray]:
+        """Committed row count and the mapped vectors (remapped if another writer grew the file)"""
+        with self._lock:
+            count = self._count()
+            if count > len(self._vectors):
+                self._remap()
+            return count, self._vectors
+
+    def _count(self) -> int:
+        """Rows in use; the caller holds the lock"""
+        row = self._db.execute("SELECT MAX(row) FROM items").fetchone()[0]
+        return 0 if row is None else row + 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def add(self, items: Sequence[Tuple[str, np.ndarray, dict]], replace: bool = False) -> int:
+        """
+        Add vectors under unique ids
+
+        Args:
+            items: (item id, unit vector, JSON-serializable metadata) tuples
+            replace: Overwrite the vector and metadata of ids already present
+                (otherwise they are left as they are)
+
+        Returns:
+            Number of items added or replaced
+        """
+        if not items:
+            return 0
+        now = time.time()
+        changed = 0
+        with self._lock:
+            # Taking the write lock up front makes the row allocation below safe across processes
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                next_row = self._count()
+                writes = []
+                for item_id, vector, info in items:
+                    existing = self._db.execute("SELECT row FROM items WHERE item_id = ?", (item_id,)).fetchone()
+                    if existing is not None and not replace:
+                        continue
+                    row = existing[0] if existing is not None else next_row
+                    if existing is None:
+                        next_row += 1
+                    writes.append((row, item_id, vector, info))
+
+                if writes:
+                    self._ensure_capacity(next_row)
+                    for row, _, vector, _ in writes:
+                        self._vectors[row] = vector
+                    # Vectors reach the file before their rows become visible
+                    self._vectors.flush()
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO items (row, item_id, info, updated_at) VALUES (?, ?, ?, ?)",
+                        [(row, item_id, json.dumps(info), now) for row, item_id, _, info in writes]
+                    )
+                self._db.execute("COMMIT")
+                changed = len(writes)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return changed
+
+    def _ensure_capacity(self, rows: int):
+        """Grow the vector file to hold rows vectors; the caller holds the lock"""
+        capacity = os.path.getsize(self._vectors_path) // (self.dim * 4)
+        if rows > capacity:
+            while capacity < rows:
+                capacity = max(capacity * 2, MIN_CAPACITY)
+            with open(self._vectors_path, 'r+b') as f:
+                f.truncate(capacity * self.dim * 4)
+        if rows > len(self._vectors):
+            self._remap()
+
+    def get_vector(self, item_id: str) -> Optional[np.ndarray]:
+        """Stored vector of an id, or None if it is not in the index"""
+        with self._lock:
+            found = self._db.execute("SELECT row FROM items WHERE item_id = ?", (item_id,)).fetchone()
+        if found is None:
+            return None
+        _, vectors = self._snapshot()
+        return np.array(vectors[found[0]])
+
+    def search(self, queries: np.ndarray, top_n: int) -> List[List[Tuple[int, float]]]:
+        """
+        Exact top-n cosine similarity search for a batch of unit vectors
+
+        The index is scanned once for the whole batch in blocks of
+        BLOCK_ROWS rows; each block's scores come from one matrix product
+        and only its top_n candidates per query are kept.
+
+        Args:
+            queries: (queries, dim) float32 unit vectors
+            top_n: Results per query
+
+        Returns:
+            (row, score) pairs per query, best first
+        """
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32)
+        count, vectors = self._snapshot()
+        if count == 0 or top_n <= 0:
+            return [[] for _ in queries]
+
+        candidate_rows = [[] for _ in queries]
+        candidate_scores = [[] for _ in queries]
+        buffer = np.empty((min(BLOCK_ROWS, count), len(queries)), dtype=np.float32)
+        for start in range(0, count, BLOCK_ROWS):
+            block = vectors[start:min(start + BLOCK_ROWS, count)]
+            scores = np.matmul(block, queries.T, out=buffer[:len(block)])
+            for q in range(len(queries)):
+                column = scores[:, q]
+                if len(column) > top_n:
+                    best = np.argpartition(column, len(column) - top_n)[-top_n:]
+                else:
+                    best = np.arange(len(column))
+                candidate_rows[q].append(best + start)
+                candidate_scores[q].append(column[best])
+
+        results = []
+        for rows, scores in zip(candidate_rows, candidate_scores):
+            rows, scores = np.concatenate(rows), np.concatenate(scores)
+            order = np.argsort(-scores, kind='stable')[:top_n]
+            results.append([(int(rows[i]), float(scores[i])) for i in order])
+        return results
+
+    def items(self, rows: Sequence[int]) -> Dict[int, Tuple[str, dict]]:
+        """(item id, metadata) of rows"""
+        found = {}
+        rows = list(rows)
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(rows), 500):
+            chunk = rows[start:start + 500]
+            with self._lock:
+                fetched = self._db.execute(
+                    f"SELECT row, item_id, info FROM items WHERE row IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+            for row, item_id, info in fetched:
+                found[row] = (item_id, json.loads(info))
+        return found
+
+    def stats(self) -> dict:
+        """Item count, dimensions and allocated rows"""
+        return {
+            "items": len(self),
+            "dim": self.dim,
+            "capacity": os.path.getsize(self._vectors_path) // (self.dim * 4),
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+            self._vectors = None
@@ -0,0 +1,146 @@
+"""
+Model Warm-up Service
+Loads and exercises the classifier and NLP models at startup, off the event loop, and tracks readiness
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+from fastapi.concurrency import run_in_threadpool
+from app.config import (
+    MODEL_TRAIN_IF_MISSING, SPACY_NER_ENABLED, MATCH_INDEX_DIR, RESULT_CACHE_ENABLED, RESULT_CACHE_DB_PATH,
+    WARMUP_RETRY_DELAY, WARMUP_RETRY_MAX_DELAY
+)
+from app.services.metrics import timed
+
+
+# Run through every warm-up step: compiles the parser patterns, fills its caches and touches the model pages
+WARMUP_RESUME = """Jane Doe
+jane.doe@example.com | +1 (555) 010-0000
+
+Experience
+Senior Software Engineer, Acme Corp
+Jan 2019 - Present
+Built Python and React services on AWS with Docker and Kubernetes.
+
+Education
+Bachelor of Science in Computer Science, State University
+2011 - 2015"""
+
+
+class Readiness:
+    """Warm-up state reported by the readiness endpoint"""
+
+    def __init__(self):
+        self.status = "starting"  # starting, ready or failed (retried until ready)
+        self.error: Optional[str] = None
+        # Failed warm-up attempts so far
+        self.failures = 0
+        # Seconds spent in each warm-up step
+        self.steps: Dict[str, float] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+
+_readiness = Readiness()
+
+
+def get_readiness() -> Readiness:
+    """Return the process-wide warm-up state"""
+    return _readiness
+
+
+def warm_up_parser():
+    """Load spaCy (when NER is enabled) and parse a sample resume"""
+    from app.services.resume_parser import get_nlp, parse_resume
+    if SPACY_NER_ENABLED:
+        get_nlp()(WARMUP_RESUME)
+    parse_resume(WARMUP_RESUME)
+
+
+def warm_up_classifier():
+    """Load the classifier (training it only if MODEL_TRAIN_IF_MISSING) and run one prediction"""
+    from app.ml.classifier import load_classifier, predict_categories
+    load_classifier(train_if_missing=MODEL_TRAIN_IF_MISSING)
+    predict_categories([WARMUP_RESUME], top_k=1)
+
+
+def warm_up_match_index():
+    """Open the match index (fitting its projection on first start) and embed a sample resume"""
+    from app.ml.matcher import get_match_index
+    get_match_index(build_if_missing=True).projection.embed([WARMUP_RESUME])
+
+
+def warm_up_result_cache():
+    """Open the result cache, connecting to (and purging) its SQLite tier off the event loop"""
+    from app.services.cache import get_result_cache
+    get_result_cache()
+
+
+def warm_up_worker():
+    """Process pool initializer: warm the parser in each worker before it takes tasks"""
+    try:
+        warm_up_parser()
+    except Exception as e:
+        # A failing initializer would break the whole pool; the task itself reports the error
+        print(f"Warning: parser warm-up failed in worker: {e}")
+
+
+async def _run_steps(executor, readiness: Readiness):
+    """Run the warm-up steps not yet completed, recording each one's duration"""
+    steps = [("classifier", warm_up_classifier), ("parser", warm_up_parser)]
+    if RESULT_CACHE_ENABLED and RESULT_CACHE_DB_PATH:
+        steps.insert(0, ("result_cache", warm_up_result_cache))
+    if MATCH_INDEX_DIR:
+        steps.append(("match_index", warm_up_match_index))
+    for name, fn in steps:
+        if name in readiness.steps:
+            continue
+        start = time.perf_counter()
+        with timed(f"warmup.{name}"):
+            await run_in_threadpool(fn)
+        readiness.steps[name] = round(time.perf_counter() - start, 3)
+    if executor.process_workers and "workers" not in readiness.steps:
+        # Starts the pool; each worker runs warm_up_worker before its first task
+        start = time.perf_counter()
+        with timed("warmup.workers"):
+            await executor.run("warmup", warm_up_parser, cpu_bound=True)
+        readiness.steps["workers"] = round(time.perf_counter() - start, 3)
+
+
+async def warm_up(executor) -> Readiness:
+    """
+    Warm every model the request path needs, then mark the app ready
+
+    Runs as a background task of the lifespan handler, so the server
+    answers liveness checks while models load. A failed attempt (a model
+    that cannot be loaded yet, an empty registry) is retried with
+    exponential backoff, skipping the steps that already succeeded, so the
+    app becomes ready without a restart once the cause goes away.
+
+    Args:
+        executor: The stage executor; its process pool (if any) is started
+            and its workers warmed too
+
+    Returns:
+        The final readiness state
+    """
+    readiness = get_readiness()
+    delay = WARMUP_RETRY_DELAY
+    while True:
+        try:
+            await _run_steps(executor, readiness)
+            break
+        except Exception as e:
+            readiness.status = "failed"
+            readiness.error = f"{type(e).__name__}: {e}"
+            readiness.failures += 1
+            print(f"Warm-up failed (attempt {readiness.failures}), retrying in {delay:g}s: {readiness.error}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, WARMUP_RETRY_MAX_DELAY)
+
+    readiness.status = "ready"
+    readiness.error = None
+    print(f"Warm-up complete in {sum(readiness.steps.values()):.2f}s: {readiness.steps}")
+    return readiness
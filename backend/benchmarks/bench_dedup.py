@@ -0,0 +1,83 @@
+"""
+Near-Duplicate Index Benchmark
+Lookup latency of the MinHash/LSH index as the number of stored resumes grows
+
+Usage (from backend/):
+    python -m benchmarks.bench_dedup [--items 10000 100000 1000000] [--queries 200]
+
+Each size is filled with random signatures (unrelated resumes) plus the
+signatures of synthetic resumes, in a temporary SQLite file. Queries are
+unseen resumes (no candidates) and lightly edited copies of stored ones.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+from app.services.dedup import NearDuplicateIndex, minhash, band_keys, NUM_PERM
+from benchmarks.bench_suite import time_calls
+from benchmarks.corpus import generate_corpus
+
+
+# Signatures inserted per transaction while filling the index
+FILL_BATCH = 50000
+
+
+def fill_index(index: NearDuplicateIndex, signatures: np.ndarray, start: int):
+    """Insert signatures directly, skipping the per-resume lookup of check_and_add"""
+    db = index._db
+    db.execute("BEGIN")
+    db.executemany(
+        "INSERT INTO docs (row, resume_id, result_digest, signature, added_at) VALUES (?, ?, NULL, ?, 0)",
+        [(start + i + 1, f"resume-{start + i}", signature.tobytes()) for i, signature in enumerate(signatures)]
+    )
+    db.executemany(
+        "INSERT OR IGNORE INTO buckets (key, row) VALUES (?, ?)",
+        [(key, start + i + 1) for i, signature in enumerate(signatures) for key in band_keys(signature)]
+    )
+    db.execute("COMMIT")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near-duplicate index lookup latency")
+    parser.add_argument("--items", type=int, nargs="+", default=[10000, 100000, 1000000], help="Stored resumes")
+    parser.add_argument("--queries", type=int, default=200, help="Queries of each kind")
+    args = parser.parse_args()
+
+    # Unseen queries are stored by check_and_add, so each size gets its own
+    corpus = [text for _, text in generate_corpus(args.queries * (len(args.items) + 1))]
+    stored = corpus[:args.queries]
+    edited = [text + " References available on request." for text in stored]
+
+    print(f"{'stored':>10}{'lookup':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    print(f"{'':>10}{'minhash':>12}" + "".join(
+        f"{value:>10.2f}" for value in map(time_calls(minhash, stored).get, ("p50_ms", "p95_ms", "p99_ms"))
+    ))
+    rng = np.random.default_rng(42)
+    directory = tempfile.mkdtemp(prefix="dedup-bench-")
+    try:
+        index = NearDuplicateIndex(os.path.join(directory, "dedup.sqlite"))
+        filled = 0
+        fill_index(index, np.stack([minhash(text) for text in stored]), filled)
+        filled += len(stored)
+        for size, items in enumerate(sorted(args.items), 1):
+            start = time.perf_counter()
+            while filled < items:
+                count = min(FILL_BATCH, items - filled)
+                fill_index(index, rng.integers(0, 1 << 32, size=(count, NUM_PERM), dtype=np.uint32), filled)
+                filled += count
+            print(f"Filled to {filled} resumes in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+            unseen = corpus[size * args.queries:(size + 1) * args.queries]
+            for name, inputs in (("unseen", unseen), ("edited", edited)):
+                timing = time_calls(lambda text: index.check_and_add(f"{name}-{items}-{hash(text)}", text), inputs)
+                print(f"{items:>10}{name:>12}{timing['p50_ms']:>10.2f}{timing['p95_ms']:>10.2f}{timing['p99_ms']:>10.2f}")
+            filled = index.stats()["stored"]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Match Index Benchmark
+Query latency of the resume/job vector index at a given corpus size
+
+Usage (from backend/):
+    python -m benchmarks.bench_match [--items 1000000] [--resumes 2000] [--queries 50] [--top-n 10]
+
+The index is filled with the embeddings of synthetic resumes, repeated with
+small random perturbations up to --items vectors, in a temporary directory.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+from app.ml.matcher import build_projection
+from app.services.vector_index import VectorIndex
+from benchmarks.bench_suite import time_calls
+from benchmarks.corpus import generate_corpus
+
+
+# Vectors inserted per transaction while filling the index
+FILL_BATCH = 50000
+
+
+def fill_index(index: VectorIndex, seeds: np.ndarray, items: int, seed: int = 42):
+    """Add items unit vectors near the seed vectors"""
+    rng = np.random.default_rng(seed)
+    for start in range(0, items, FILL_BATCH):
+        count = min(FILL_BATCH, items - start)
+        vectors = seeds[rng.integers(len(seeds), size=count)] + rng.normal(0, 0.05, (count, seeds.shape[1])).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index.add([(f"resume-{start + i}", vector, {}) for i, vector in enumerate(vectors)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match index query latency")
+    parser.add_argument("--items", type=int, default=1000000, help="Vectors in the index")
+    parser.add_argument("--resumes", type=int, default=2000, help="Synthetic resumes embedded as seed vectors")
+    parser.add_argument("--queries", type=int, default=50, help="Query texts")
+    parser.add_argument("--top-n", type=int, default=10, help="Results per query")
+    parser.add_argument("--dim", type=int, default=128, help="Projection dimensions")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="match-bench-")
+    try:
+        projection = build_projection(args.dim)
+        corpus = generate_corpus(args.resumes + args.queries)
+        texts = [text for _, text in corpus]
+        seeds = projection.embed(texts[:args.resumes])
+        queries = texts[args.resumes:]
+
+        index = VectorIndex(os.path.join(directory, "resumes"), projection.dim)
+        start = time.perf_counter()
+        fill_index(index, seeds, args.items)
+        print(f"Indexed {len(index)} vectors of {projection.dim} dimensions in {time.perf_counter() - start:.1f}s "
+              f"({index.stats()['capacity'] * projection.dim * 4 / 2**20:.0f} MB mapped)", file=sys.stderr)
+
+        query_vectors = projection.embed(queries)
+        results = {
+            "embed": time_calls(lambda text: projection.embed([text]), queries),
+            "search": time_calls(lambda vector: index.search(vector, args.top_n), list(query_vectors)),
+            "search (batch of 8, per query)": time_calls(
+                lambda batch: index.search(batch, args.top_n),
+                [query_vectors[i:i + 8] for i in range(0, len(query_vectors) - 7, 8)]
+            ),
+        }
+        results["search (batch of 8, per query)"] = {
+            key: round(value / 8, 4) if key.endswith("_ms") else value
+            for key, value in results["search (batch of 8, per query)"].items()
+        }
+        print(f"{'stage':<32}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name, timing in results.items():
+            print(f"{name:<32}{timing['p50_ms']:>10.2f}{timing['p95_ms']:>10.2f}{timing['p99_ms']:>10.2f}")
+        index.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
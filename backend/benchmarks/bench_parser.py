@@ -0,0 +1,78 @@
+"""
+Parser Micro-benchmark
+Times each resume_parser extractor per resume on the training dataset
+
+Usage (from backend/):
+    python -m benchmarks.bench_parser [--resumes 300] [--repeat 3]
+"""
+import argparse
+import csv
+import os
+import random
+import time
+from app.services import resume_parser
+from app.services.resume_document import ResumeDocument
+
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'app', 'ml', 'dataset', 'resume_dataset.csv')
+
+EXTRACTORS = [
+    "extract_name",
+    "extract_email",
+    "extract_phone",
+    "extract_skills",
+    "extract_education",
+    "extract_experience_details",
+]
+
+
+def load_resumes(count: int, seed: int = 42) -> list:
+    """Build multi-line resumes by stitching dataset rows together, one sentence per line"""
+    with open(DATASET_PATH, newline='', encoding='utf-8') as f:
+        rows = [row['resume_text'] for row in csv.DictReader(f)]
+
+    rng = random.Random(seed)
+    resumes = []
+    for i in range(count):
+        body = '\n'.join(sentence for row in rng.sample(rows, 8) for sentence in row.split('. '))
+        header = f"Candidate {i}\ncandidate{i}@example.com | +1 (555) 010-{i % 10000:04d}\n"
+        experience = f"Software Engineer\nJan {2010 + i % 8} - Present\nData Analyst\n2008 - {2010 + i % 8}\n"
+        resumes.append(header + experience + body)
+    return resumes
+
+
+def time_extractor(fn, resumes: list, repeat: int) -> float:
+    """Best-of-repeat mean time per resume in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in resumes:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(resumes) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-resume timings of the resume parser extractors")
+    parser.add_argument("--resumes", type=int, default=300, help="Number of synthetic resumes")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best is reported)")
+    args = parser.parse_args()
+
+    resumes = load_resumes(args.resumes)
+    print(f"{len(resumes)} resumes, mean length {sum(map(len, resumes)) // len(resumes)} chars")
+    print(f"{'stage':<28}{'ms/resume':>12}")
+
+    # Extractors share one preprocessed document per resume, as in parse_resume
+    total = time_extractor(ResumeDocument, resumes, args.repeat)
+    print(f"{'ResumeDocument':<28}{total:>12.3f}")
+    documents = [ResumeDocument(text) for text in resumes]
+    for name in EXTRACTORS:
+        per_resume = time_extractor(getattr(resume_parser, name), documents, args.repeat)
+        total += per_resume
+        print(f"{name:<28}{per_resume:>12.3f}")
+    print(f"{'parse_resume':<28}{time_extractor(resume_parser.parse_resume, resumes, args.repeat):>12.3f}")
+    print(f"{'(sum of extractors)':<28}{total:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+PDF Backend Benchmark
+Compares the registered PDF text backends on a corpus of PDFs
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf_backends [--pdf-dir DIR] [--pdfs 50] [--pages 2] [--repeat 3]
+
+Without --pdf-dir, text PDFs are generated from the training dataset.
+"""
+import argparse
+import glob
+import os
+import time
+from typing import List
+from app.services.pdf_extractor import PDF_TEXT_BACKENDS, is_garbled_text, _read_pdf_text
+from benchmarks.bench_parser import load_resumes
+from benchmarks.corpus import build_text_pdf
+
+
+def synthetic_pdfs(count: int, pages: int) -> List[bytes]:
+    """Text PDFs built from stitched dataset resumes, about 60 lines per page"""
+    pdfs = []
+    for resume in load_resumes(count):
+        lines = [line[:100] for line in resume.split('\n') if line.strip()]
+        pdfs.append(build_text_pdf([lines[p * 60:(p + 1) * 60] or ["(blank)"] for p in range(pages)]))
+    return pdfs
+
+
+def time_backend(backend: str, pdfs: List[bytes], repeat: int):
+    """Best-of-repeat mean ms per PDF, plus mean characters and empty/garbled count"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        texts = [_read_pdf_text(pdf, backend, None, None) for pdf in pdfs]
+        best = min(best, time.perf_counter() - start)
+    chars = sum(map(len, texts)) // len(texts)
+    garbled = sum(is_garbled_text(text) for text in texts)
+    return best / len(pdfs) * 1000, chars, garbled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-PDF text extraction timings of each PDF backend")
+    parser.add_argument("--pdf-dir", help="Directory of sample PDFs (default: generated PDFs)")
+    parser.add_argument("--pdfs", type=int, default=50, help="Number of generated PDFs")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per generated PDF")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best is reported)")
+    parser.add_argument("--backends", default=','.join(PDF_TEXT_BACKENDS), help="Comma-separated backends")
+    args = parser.parse_args()
+
+    if args.pdf_dir:
+        pdfs = []
+        for path in sorted(glob.glob(os.path.join(args.pdf_dir, '*.pdf'))):
+            with open(path, 'rb') as f:
+                pdfs.append(f.read())
+    else:
+        pdfs = synthetic_pdfs(args.pdfs, args.pages)
+    if not pdfs:
+        parser.error("no PDFs to benchmark")
+
+    print(f"{len(pdfs)} PDFs, mean size {sum(map(len, pdfs)) // len(pdfs)} bytes")
+    print(f"{'backend':<14}{'ms/pdf':>10}{'chars/pdf':>12}{'empty/garbled':>15}")
+    for backend in args.backends.split(','):
+        try:
+            per_pdf, chars, garbled = time_backend(backend, pdfs, args.repeat)
+        except ImportError as e:
+            print(f"{backend:<14}{'not installed':>10} ({e})")
+            continue
+        print(f"{backend:<14}{per_pdf:>10.2f}{chars:>12}{garbled:>15}")
+
+
+if __name__ == "__main__":
+    main()
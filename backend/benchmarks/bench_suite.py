@@ -0,0 +1,219 @@
+"""
+Benchmark Suite
+Per-call latency percentiles and throughput of every pipeline stage and of the HTTP API,
+compared against a stored baseline
+
+Usage (from backend/):
+    python -m benchmarks.bench_suite [--resumes 100] [--jobs 3] [--bullets 4] [--output results.json]
+    python -m benchmarks.bench_suite --save-baseline     # record benchmarks/baseline.json
+    python -m benchmarks.bench_suite --check             # exit 1 on a regression
+
+Timings depend on the machine, so compare against a baseline recorded on the same one.
+"""
+import os
+
+# Repeated inputs must reach the pipeline instead of the result cache
+os.environ["RESULT_CACHE_ENABLED"] = "false"
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from app.services import resume_parser
+from app.services.pdf_extractor import extract_text_from_pdf, extract_text_from_docx
+from app.ml.classifier import classify_resume
+from benchmarks.corpus import generate_corpus, to_docx, to_pdf
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+PARSER_STAGES = [
+    "extract_name",
+    "extract_email",
+    "extract_phone",
+    "extract_skills",
+    "extract_education",
+    "extract_experience_details",
+    "parse_resume",
+]
+
+# A stage regresses when a percentile is this much slower than the baseline...
+DEFAULT_TOLERANCE = 0.25
+# ...and slower by at least this many milliseconds (ignores noise on microsecond stages)
+NOISE_FLOOR_MS = 0.05
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Linearly interpolated percentile of an ascending list"""
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def time_calls(fn: Callable, inputs: list, repeat: int = 1) -> Dict[str, float]:
+    """
+    Time fn on every input, one call at a time, after one warm-up call
+
+    Returns:
+        Call count, throughput (calls/s) and mean/p50/p95/p99 latency in milliseconds
+    """
+    fn(inputs[0])
+    latencies = []
+    for _ in range(repeat):
+        for value in inputs:
+            start = time.perf_counter()
+            fn(value)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "throughput_per_s": round(len(latencies) / total, 2) if total else 0.0,
+        "mean_ms": round(total / len(latencies) * 1000, 4),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+    }
+
+
+def run_suite(resumes: int, jobs: int, bullets: int, repeat: int, seed: int = 42, stages: Optional[List[str]] = None) -> dict:
+    """
+    Generate a corpus and time every stage on it
+
+    Args:
+        resumes: Number of synthetic resumes
+        jobs: Roles per resume
+        bullets: Bullet lines per role
+        repeat: Passes over the corpus per stage
+        seed: Corpus seed
+        stages: Only run stages whose name starts with one of these prefixes
+
+    Returns:
+        Results document with run metadata and per-stage statistics
+    """
+    texts = [text for _, text in generate_corpus(resumes, jobs, bullets, seed)]
+    pdfs = [to_pdf(text) for text in texts]
+    docxs = [to_docx(text) for text in texts]
+
+    benchmarks = [
+        ("extract_text_from_pdf", extract_text_from_pdf, pdfs),
+        ("extract_text_from_docx", extract_text_from_docx, docxs),
+    ]
+    benchmarks += [(name, getattr(resume_parser, name), texts) for name in PARSER_STAGES]
+    benchmarks.append(("classify_resume", classify_resume, texts))
+    benchmarks += _api_benchmarks(texts, pdfs, docxs)
+
+    results = {}
+    for name, fn, inputs in benchmarks:
+        if stages and not name.startswith(tuple(stages)):
+            continue
+        results[name] = time_calls(fn, inputs, repeat)
+        print(f"{name:<32}{results[name]['p50_ms']:>10.3f}{results[name]['p95_ms']:>10.3f}"
+              f"{results[name]['p99_ms']:>10.3f}{results[name]['throughput_per_s']:>12.1f}", file=sys.stderr)
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "corpus": {"resumes": resumes, "jobs": jobs, "bullets": bullets, "seed": seed, "repeat": repeat},
+            "mean_text_chars": sum(map(len, texts)) // len(texts),
+        },
+        "stages": results,
+    }
+
+
+def _api_benchmarks(texts: List[str], pdfs: List[bytes], docxs: List[bytes]) -> list:
+    """End-to-end POST /analyze calls through an in-process test client"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+
+    def post(**kwargs):
+        response = client.post("/analyze", **kwargs)
+        if response.status_code != 200:
+            raise RuntimeError(f"/analyze returned {response.status_code}: {response.text}")
+
+    return [
+        ("api.analyze_text", lambda text: post(data={"text": text}), texts),
+        ("api.analyze_pdf", lambda pdf: post(files={"file": ("resume.pdf", pdf, "application/pdf")}), pdfs),
+        ("api.analyze_docx", lambda docx: post(files={"file": ("resume.docx", docx, "application/octet-stream")}), docxs),
+    ]
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Print each stage against the baseline and list the regressions
+
+    Returns:
+        Names of stages whose p50 or p95 regressed beyond the tolerance
+    """
+    regressions = []
+    print(f"\n{'stage':<32}{'p50 ms':>10}{'base':>10}{'p95 ms':>10}{'base':>10}  status")
+    for name, stats in results["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            print(f"{name:<32}{stats['p50_ms']:>10.3f}{'-':>10}{stats['p95_ms']:>10.3f}{'-':>10}  new")
+            continue
+        slower = [
+            key for key in ("p50_ms", "p95_ms")
+            if stats[key] > base[key] * (1 + tolerance) and stats[key] - base[key] > NOISE_FLOOR_MS
+        ]
+        status = "REGRESSED" if slower else "ok"
+        if slower:
+            regressions.append(name)
+        print(f"{name:<32}{stats['p50_ms']:>10.3f}{base['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{base['p95_ms']:>10.3f}  {status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stage and end-to-end latency benchmarks with baseline comparison")
+    parser.add_argument("--resumes", type=int, default=100, help="Number of synthetic resumes")
+    parser.add_argument("--jobs", type=int, default=3, help="Roles per resume")
+    parser.add_argument("--bullets", type=int, default=4, help="Bullet lines per role")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the corpus per stage")
+    parser.add_argument("--stages", help="Comma-separated stage name prefixes to run (default: all)")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if any stage regressed")
+    args = parser.parse_args()
+
+    print(f"{'stage':<32}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'calls/s':>12}", file=sys.stderr)
+    results = run_suite(
+        args.resumes, args.jobs, args.bullets, args.repeat,
+        stages=args.stages.split(',') if args.stages else None
+    )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["meta"]["corpus"] != results["meta"]["corpus"]:
+        print(f"Warning: baseline corpus {baseline['meta']['corpus']} differs from this run's")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) regressed: {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Synthetic Resume Corpus
+Generates structured resumes from the training dataset phrasing, as text, DOCX and PDF
+
+Usage (from backend/):
+    python -m benchmarks.corpus --out /tmp/resumes [--resumes 100] [--jobs 3] [--bullets 4] [--formats txt,docx,pdf]
+"""
+import argparse
+import csv
+import io
+import os
+import random
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'app', 'ml', 'dataset', 'resume_dataset.csv')
+
+FIRST_NAMES = ["Alice", "Bruno", "Chen", "Daniela", "Emeka", "Fatima", "Gustavo", "Hana", "Ivan", "Jasmine", "Kofi", "Lucia"]
+LAST_NAMES = ["Anderson", "Becker", "Castillo", "Dubois", "Eriksen", "Fernandes", "Gupta", "Hoffmann", "Ibrahim", "Jensen"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Systems", "Hooli", "Vandelay"]
+UNIVERSITIES = ["State University", "Institute of Technology", "City College", "National University"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Lines per generated PDF page
+PDF_LINES_PER_PAGE = 60
+
+
+def load_phrases(path: str = DATASET_PATH) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Split dataset rows into reusable phrases per category (duplicates removed)
+
+    Returns:
+        {category: {"degree": [...], "skills": [...], "experience": [...]}}
+    """
+    phrases = defaultdict(lambda: defaultdict(set))
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            kinds = phrases[row['category']]
+            for part in row['resume_text'].split('. '):
+                if part.startswith('Skills: '):
+                    kinds['skills'].add(part[len('Skills: '):])
+                elif part.startswith('Experience: '):
+                    kinds['experience'].add(part[len('Experience: '):])
+                elif part.startswith(('Bachelor', 'Master', 'PhD', 'B.', 'M.')):
+                    kinds['degree'].add(part)
+    # Sorted so the same seed always picks the same phrases
+    return {category: {kind: sorted(values) for kind, values in kinds.items()} for category, kinds in phrases.items()}
+
+
+def generate_resume(rng: random.Random, phrases: Dict[str, Dict[str, List[str]]], index: int, jobs: int = 3, bullets: int = 4) -> Tuple[str, str]:
+    """
+    Build one resume with contact, summary, experience, education and skills sections
+
+    Args:
+        rng: Random source
+        phrases: Output of load_phrases
+        index: Resume number, used to make contact details unique
+        jobs: Roles listed under Experience (each with a date range)
+        bullets: Bullet lines per role
+
+    Returns:
+        (category, resume text)
+    """
+    category = rng.choice(sorted(phrases))
+    kinds = phrases[category]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}{index}@example.com | +1 (555) {100 + index % 900:03d}-{index % 10000:04d}",
+        "",
+        "Summary",
+        f"{category} with {jobs * 2} years of experience. {rng.choice(kinds['experience'])}.",
+        "",
+        "Experience",
+    ]
+    # Roles go back in time from the current one; some start before the previous one ended
+    end_year = 2024
+    for job in range(jobs):
+        start_year = end_year - rng.randint(1, 4)
+        end = "Present" if job == 0 else f"{rng.choice(MONTHS)} {end_year}"
+        title = category if job < 2 else f"Junior {category}"
+        lines.append(f"{title}, {rng.choice(COMPANIES)}")
+        lines.append(f"{rng.choice(MONTHS)} {start_year} - {end}")
+        pool = kinds['experience']
+        picked = rng.sample(pool, min(bullets, len(pool))) + [rng.choice(pool) for _ in range(bullets - len(pool))]
+        lines.extend(f"- {bullet}" for bullet in picked)
+        lines.append("")
+        end_year = start_year + (1 if rng.random() < 0.2 else 0)
+
+    graduation = end_year - rng.randint(0, 2)
+    lines += [
+        "Education",
+        f"{rng.choice(kinds['degree'])}, {rng.choice(UNIVERSITIES)}",
+        f"{graduation - 4} - {graduation}",
+        "",
+        "Skills",
+        ", ".join(rng.sample(kinds['skills'], min(2, len(kinds['skills'])))),
+    ]
+    return category, "\n".join(lines)
+
+
+def generate_corpus(count: int, jobs: int = 3, bullets: int = 4, seed: int = 42) -> List[Tuple[str, str]]:
+    """Generate count (category, text) resumes; the same arguments give the same corpus"""
+    rng = random.Random(seed)
+    phrases = load_phrases()
+    return [generate_resume(rng, phrases, i, jobs, bullets) for i in range(count)]
+
+
+def _pdf_string(text: str) -> str:
+    """Escape text for a PDF string literal (Latin-1 only, as the standard fonts expect)"""
+    text = text.encode('latin-1', errors='replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_text_pdf(pages: List[List[str]]) -> bytes:
+    """Write a minimal PDF with one Helvetica text line per entry on each page"""
+    page_count = len(pages)
+    font_id = 3 + 2 * page_count
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            ' '.join(f"{3 + 2 * i} 0 R" for i in range(page_count)), page_count
+        ),
+    ]
+    for i, lines in enumerate(pages):
+        stream = "BT /F1 10 Tf 12 TL 50 770 Td " + ' '.join(f"({_pdf_string(line)}) '" for line in lines) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b''.join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def to_pdf(text: str) -> bytes:
+    """Render resume text as a text PDF, PDF_LINES_PER_PAGE lines per page"""
+    lines = [line[:100] for line in text.split('\n')]
+    return build_text_pdf([lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)])
+
+
+def to_docx(text: str) -> bytes:
+    """Render resume text as a DOCX with one paragraph per line"""
+    from docx import Document
+    document = Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+RENDERERS = {
+    "txt": lambda text: text.encode('utf-8'),
+    "docx": to_docx,
+    "pdf": to_pdf,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic resume corpus to a directory")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--resumes", type=int, default=100, help="Number of resumes")
+    parser.add_argument("--jobs", type=int, default=3, help="Roles per resume")
+    parser.add_argument("--bullets", type=int, default=4, help="Bullet lines per role")
+    parser.add_argument("--formats", default="txt,docx,pdf", help="Comma-separated formats (txt, docx, pdf)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    formats = args.formats.split(',')
+    os.makedirs(args.out, exist_ok=True)
+    for i, (_, text) in enumerate(generate_corpus(args.resumes, args.jobs, args.bullets, args.seed)):
+        extension = formats[i % len(formats)]
+        with open(os.path.join(args.out, f"resume_{i:05d}.{extension}"), 'wb') as f:
+            f.write(RENDERERS[extension](text))
+    print(f"Wrote {args.resumes} resumes to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Experience Extraction Regression Tests
+Date ranges of education entries are study periods; every other range is work, whatever the section headers
+
+Run from backend/:
+    python -m pytest tests
+"""
+from datetime import datetime
+import pytest
+from app.services.resume_document import ResumeDocument
+from app.services.resume_parser import extract_education, extract_experience_details
+
+
+REFERENCE_DATE = datetime(2024, 1, 1)
+
+EDUCATION_BLOCK = """Education
+B.Sc. in Computer Science, State University
+2010 - 2014
+
+"""
+
+JOBS = """Software Engineer, Acme Corp
+Jan 2016 - Dec 2019
+Senior Developer, Globex
+Jan 2020 - Dec 2022
+"""
+
+
+@pytest.mark.parametrize("header", [
+    "Career History",
+    "Relevant Work Experience",
+    "Work",
+    "Internships",
+    "Professional Background",
+    "Positions Held",
+    "Experience & Projects",
+    "CAREER HISTORY",
+    "Volunteering",
+])
+def test_jobs_after_education_are_counted_under_any_header(header):
+    years, breakdown = extract_experience_details(f"{EDUCATION_BLOCK}{header}\n{JOBS}", REFERENCE_DATE)
+
+    assert years == 6.8
+    assert [role["title"] for role in breakdown] == ["Software Engineer, Acme Corp", "Senior Developer, Globex"]
+
+
+def test_one_line_education_entry_without_job_header():
+    text = "Jane Doe\nB.Sc. Computer Science, State University, 2010 - 2014\n" + JOBS
+
+    years, breakdown = extract_experience_details(text, REFERENCE_DATE)
+
+    assert years == 6.8
+    assert len(breakdown) == 2
+
+
+def test_study_period_before_institution_is_not_experience():
+    text = "Education\n2010 - 2014\nState University\nBachelor of Arts\n\nExperience\nAnalyst, Acme\n2015 - 2017\n"
+
+    years, breakdown = extract_experience_details(text, REFERENCE_DATE)
+
+    assert years == 2.0
+    assert [role["title"] for role in breakdown] == ["Analyst, Acme"]
+
+
+def test_education_only_resume_has_no_experience():
+    assert extract_experience_details(EDUCATION_BLOCK, REFERENCE_DATE) == (0.0, [])
+
+
+def test_job_at_a_university_is_experience():
+    text = EDUCATION_BLOCK + "Research Assistant, State University\nSep 2014 - Aug 2016\n"
+
+    years, breakdown = extract_experience_details(text, REFERENCE_DATE)
+
+    assert years == 1.9
+    assert [role["title"] for role in breakdown] == ["Research Assistant, State University"]
+
+
+def test_header_like_lines_close_sections():
+    doc = ResumeDocument(EDUCATION_BLOCK + "Career History\n" + JOBS + "\nHONORS AND AWARDS\nDean's list\n")
+
+    assert [name for name, _, _ in doc.sections] == ["education", "experience", "other"]
+    assert doc.section_of(doc.lines.index("Jan 2016 - Dec 2019")) == "experience"
+    # Title-case school names inside an entry do not end the section
+    assert doc.section_of(doc.lines.index("2010 - 2014")) == "education"
+
+
+@pytest.mark.parametrize("text, years", [
+    ("Experience\nSoftware Engineer\nAcme Inc, Boston, MA\nJan 2016 - Dec 2019", 3.9),
+    ("Boston, MA | Jan 2016 - Dec 2019", 3.9),
+    ("Portland, ME\n2016 - 2019", 3.0),
+    ("Math Teacher\nLincoln High School\n2016 - 2019", 3.0),
+    ("Teacher, Lincoln High School, 2016 - 2019", 3.0),
+    ("Scrum Master, Acme\n2016 - 2019", 3.0),
+])
+def test_locations_and_schools_outside_education_are_experience(text, years):
+    total, breakdown = extract_experience_details(text, REFERENCE_DATE)
+
+    assert total == years
+    assert len(breakdown) == 1
+
+
+def test_two_letter_degrees_inside_education_are_study_periods():
+    text = "Education\nMA in History, Boston University\n2010 - 2012\n\nExperience\n" + JOBS
+
+    years, breakdown = extract_experience_details(text, REFERENCE_DATE)
+
+    assert years == 6.8
+    assert len(breakdown) == 2
+
+
+def test_education_is_read_from_its_section():
+    text = "Experience\nScrum Master, Acme, Boston, MA\nJan 2016 - Dec 2019\n\n" + EDUCATION_BLOCK
+
+    assert extract_education(text) == ["B.Sc. in Computer Science, State University, 2010 - 2014"]